@@ -146,6 +146,18 @@ app.conf.beat_schedule = {
         'schedule': 300.0,  # 每5分钟 (300秒)
     },
 
+    # 每10秒批量消费一次用户行为事件（更新动态标签权重）
+    'consume-behaviour-events-every-10-secs': {
+        'task': 'project.tasks.consume_behaviour_events',
+        'schedule': 10.0,
+    },
+
+    # 每小时重标定一次需求热度榜
+    'rescale-trending-requirements-hourly': {
+        'task': 'project.tasks.rescale_trending_requirements',
+        'schedule': crontab(minute=15),
+    },
+
 }
 
 app.conf.timezone = settings.TIME_ZONE
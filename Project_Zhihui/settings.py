@@ -218,7 +218,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # orjson 渲染（未安装 orjson 时回退为标准库 json）
+        'common_utils.FastJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -252,6 +253,16 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Redis 连接池配置（每个进程共享，见 common_utils.get_redis_client）
+REDIS_POOL_OPTIONS = {
+    'max_connections': int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),  # 每个进程的连接数上限
+    'timeout': 5,  # 连接池耗尽时等待空闲连接的秒数
+    'socket_timeout': 5,
+    'socket_connect_timeout': 5,
+    'health_check_interval': 30,  # 空闲超过30秒的连接在使用前先 PING 检查
+    'retry_on_timeout': True,
+}
+
 # Cache Configuration (使用Redis)
 CACHES = {
     "default": {
@@ -259,6 +270,8 @@ CACHES = {
         "LOCATION": os.getenv("REDIS_CACHES_URL", "redis://127.0.0.1:6379/1"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
+            "CONNECTION_POOL_KWARGS": REDIS_POOL_OPTIONS,
         }
     }
 }
@@ -360,12 +373,23 @@ DEFAULT_AVATAR_URL = "/media/avatars/default/avatar_2.svg"
 MILVUS_HOST = os.getenv('MILVUS_HOST', '10.160.64.18')
 MILVUS_PORT = os.getenv('MILVUS_PORT', '19530')
 MILVUS_COLLECTION = os.getenv('MILVUS_COLLECTION', 'enterprise_vectors')
+# 向量存储后端：milvus（生产）/ memory（NumPy 内存实现，用于测试与压测）
+VECTOR_STORE_BACKEND = os.getenv('VECTOR_STORE_BACKEND', 'milvus')
 
 # Embedding Service Configuration
 EMBEDDING_URL = os.getenv('EMBEDDING_URL', 'http://10.160.64.18:11434/api/embed')
 EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'bge-m3:567m')
 EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', '1024'))
 
+# Document Extraction Configuration (PDF/Word 文本提取进程池)
+DOC_EXTRACTION_MAX_WORKERS = int(os.getenv('DOC_EXTRACTION_MAX_WORKERS', str(min(4, os.cpu_count() or 1))))
+DOC_EXTRACTION_LARGE_PDF_PAGES = int(os.getenv('DOC_EXTRACTION_LARGE_PDF_PAGES', '64'))
+DOC_EXTRACTION_PAGES_PER_TASK = int(os.getenv('DOC_EXTRACTION_PAGES_PER_TASK', '32'))
+# PDF 入库流水线每批向量化/写入的切块数
+PDF_INGESTION_EMBED_BATCH_SIZE = int(os.getenv('PDF_INGESTION_EMBED_BATCH_SIZE', '32'))
+# 入库任务超过该秒数未更新进度视为已中断，不再阻止同一需求的新任务
+PDF_INGESTION_JOB_STALE_SECONDS = int(os.getenv('PDF_INGESTION_JOB_STALE_SECONDS', '1800'))
+
  
 ALIYUN_SMS_SIGN_NAME = os.getenv('ALIYUN_SMS_SIGN_NAME', '速通互联验证码')
 ALIYUN_SMS_TEMPLATE_REGISTER = os.getenv('ALIYUN_SMS_TEMPLATE_REGISTER', '100001')
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON 渲染器压测脚本：在真实接口数据上对比 DRF JSONRenderer 与 FastJSONRenderer（orjson / 标准库回退）
+
+数据来自当前数据库：需求列表页（含关联项目）、资源列表页、数据大屏统计接口的响应数据。
+
+使用方法：
+  python additional_tool_test/benchmark_json_renderer.py
+  python additional_tool_test/benchmark_json_renderer.py --page-size 100 --rounds 200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Project_Zhihui.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+import common_utils
+from common_utils import FastJSONRenderer
+from project.models import Requirement, Resource
+from project.mixins import load_related_projects
+from project.serializers import RequirementSerializer, ResourceSerializer
+from dashboard import views as dashboard_views
+
+DASHBOARD_VIEWS = [
+    'get_tag1_student_stats',
+    'get_project_status_stats',
+    'get_user_registration_stats',
+    'get_project_completion_stats',
+]
+
+
+def build_payloads(page_size):
+    """按接口的实际序列化方式构建响应数据（APIResponse 格式）"""
+    request = APIRequestFactory().get('/')
+    payloads = {}
+
+    requirements = list(
+        Requirement.objects.select_related('organization', 'publish_people__user', 'evaluation_criteria')
+        .prefetch_related('tag1', 'tag2', 'resources', 'files', 'evaluation_criteria__indicators')
+        .order_by('-created_at')[:page_size]
+    )
+    serializer = RequirementSerializer(requirements, many=True, context={
+        'request': request,
+        'favorited_requirements': set(),
+        'related_projects_map': load_related_projects([req.id for req in requirements]),
+    })
+    payloads['需求列表'] = common_utils.APIResponse.success({'requirements': serializer.data}).data
+
+    resources = list(
+        Resource.objects.select_related('create_person__user', 'update_person__user')
+        .prefetch_related('tag1', 'tag2', 'files')
+        .order_by('-created_at')[:page_size]
+    )
+    serializer = ResourceSerializer(resources, many=True, context={'request': request})
+    payloads['资源列表'] = common_utils.APIResponse.success({'resources': serializer.data}).data
+
+    for name in DASHBOARD_VIEWS:
+        response = getattr(dashboard_views, name)(APIRequestFactory().get('/'))
+        if response.status_code == 200:
+            payloads[f'大屏/{name}'] = response.data
+    return payloads
+
+
+def bench(render, data, rounds):
+    render(data)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        render(data)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON 渲染器压测')
+    parser.add_argument('--page-size', type=int, default=50, help='列表页数据条数')
+    parser.add_argument('--rounds', type=int, default=100, help='每种渲染器的渲染次数')
+    args = parser.parse_args()
+
+    if common_utils.orjson is None:
+        print('未安装 orjson，FastJSONRenderer 将使用标准库回退')
+
+    payloads = build_payloads(args.page_size)
+    drf_renderer = JSONRenderer()
+    fast_renderer = FastJSONRenderer()
+    orjson_module = common_utils.orjson
+
+    def render_stdlib_fallback(data):
+        common_utils.orjson = None
+        try:
+            return fast_renderer.render(data)
+        finally:
+            common_utils.orjson = orjson_module
+
+    renderers = [
+        ('DRF JSONRenderer', drf_renderer.render),
+        ('FastJSONRenderer', fast_renderer.render),
+        ('FastJSONRenderer(标准库回退)', render_stdlib_fallback),
+    ]
+
+    for name, data in payloads.items():
+        expected = drf_renderer.render(data)
+        print(f"\n{name}: {len(expected) / 1024:.1f} KB")
+        baseline = None
+        for renderer_name, render in renderers:
+            # 输出须与 DRF JSONRenderer 语义一致
+            if json.loads(render(data)) != json.loads(expected):
+                print(f"  {renderer_name}: 输出与 DRF JSONRenderer 不一致")
+                continue
+            ms = bench(render, data, args.rounds)
+            baseline = baseline or ms
+            print(f"  {renderer_name}: {ms:.3f}ms/次 ({baseline / ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
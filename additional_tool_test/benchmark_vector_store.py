@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+向量存储后端压测脚本：对比写入与检索耗时
+
+使用方法：
+  python additional_tool_test/benchmark_vector_store.py --backend memory
+  python additional_tool_test/benchmark_vector_store.py --backend milvus --rows 20000 --projects 500
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import django
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Project_Zhihui.settings')
+django.setup()
+
+from project.vector_store import create_vector_store, COLLECTION_RAW_DOCS
+
+BENCH_COLLECTION = COLLECTION_RAW_DOCS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='向量存储后端压测')
+    parser.add_argument('--backend', default='memory', choices=['memory', 'milvus'])
+    parser.add_argument('--rows', type=int, default=10000, help='写入切块数')
+    parser.add_argument('--projects', type=int, default=200, help='需求数')
+    parser.add_argument('--dim', type=int, default=1536)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--filter-size', type=int, default=20, help='每次检索过滤的需求数')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.backend == 'milvus':
+        # 防止误写生产数据：Milvus 压测只在显式指定的压测环境中执行
+        if os.getenv('VECTOR_STORE_BENCHMARK_ALLOW_MILVUS') != '1':
+            print('Milvus 压测会写入 project_raw_docs，请设置 VECTOR_STORE_BENCHMARK_ALLOW_MILVUS=1 确认后执行')
+            return
+
+    store = create_vector_store(args.backend)
+    if not store.connect():
+        print('向量存储后端不可用')
+        return
+    if not store.has_collection(BENCH_COLLECTION):
+        store.create_collection(BENCH_COLLECTION, dim=args.dim)
+
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    project_ids = rng.integers(1, args.projects + 1, size=args.rows)
+    # 使用不与真实需求冲突的ID段
+    project_ids = project_ids + 10_000_000
+
+    start = time.perf_counter()
+    for offset in range(0, args.rows, args.batch_size):
+        store.insert(BENCH_COLLECTION, [
+            {
+                "project_id": int(project_ids[i]),
+                "vector": vectors[i].tolist(),
+                "content": f"chunk-{i}",
+                "chunk_index": i,
+            }
+            for i in range(offset, min(offset + args.batch_size, args.rows))
+        ])
+    store.flush(BENCH_COLLECTION)
+    insert_seconds = time.perf_counter() - start
+
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    latencies = []
+    for query in queries:
+        keys = rng.choice(np.unique(project_ids), size=min(args.filter_size, args.projects), replace=False)
+        t0 = time.perf_counter()
+        store.search(BENCH_COLLECTION, [query.tolist()], top_k=10, keys=[int(k) for k in keys],
+                     output_fields=["project_id", "chunk_index"])
+        latencies.append(time.perf_counter() - t0)
+
+    store.delete(BENCH_COLLECTION, sorted({int(p) for p in project_ids}))
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"后端: {args.backend}, 切块数: {args.rows}, 维度: {args.dim}")
+    print(f"写入: {insert_seconds:.2f}s ({args.rows / insert_seconds:.0f} 条/秒)")
+    print(f"检索: p50={np.percentile(latencies_ms, 50):.2f}ms, "
+          f"p95={np.percentile(latencies_ms, 95):.2f}ms, max={latencies_ms.max():.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,37 @@
 """统一响应格式工具"""
-from rest_framework.response import Response
-from rest_framework import status
+import base64
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import connections, transaction
+from django.db.models import Count, Q, QuerySet
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.http import HttpResponse
+from django.utils.functional import cached_property
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退为标准库 json
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 
 class APIResponse:
@@ -217,11 +247,563 @@ def build_media_urls_list(file_paths, request=None):
     return urls
 
 
+# ==================== Redis 连接 ====================
+# 进程内共享的 Redis 客户端，调用方不应自行创建 redis.Redis 或关闭返回的客户端：
+# - get_redis_client：业务库（REDIS_HOST/REDIS_PORT/REDIS_DB，返回 str），共享一个连接池
+# - get_async_redis_client：同一业务库的异步客户端，每个事件循环一个连接池
+# - get_cache_redis_client：Django 缓存库的原始连接，复用 django-redis 的连接池（返回 bytes）
+# 连接池参数见 settings.REDIS_POOL_OPTIONS；redis-py 连接池在 fork 后会自动重建
+
+_redis_client_lock = threading.Lock()
+_redis_client = None
+_async_redis_clients = weakref.WeakKeyDictionary()  # 事件循环 -> 异步客户端
+
+
+def _redis_connection_kwargs():
+    kwargs = {
+        'host': getattr(settings, 'REDIS_HOST', 'localhost'),
+        'port': getattr(settings, 'REDIS_PORT', 6379),
+        'db': getattr(settings, 'REDIS_DB', 0),
+        'decode_responses': True,
+    }
+    kwargs.update(getattr(settings, 'REDIS_POOL_OPTIONS', {}))
+    return kwargs
+
+
+def get_redis_client():
+    """获取业务库的共享 Redis 客户端"""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis(
+                    connection_pool=redis.BlockingConnectionPool(**_redis_connection_kwargs())
+                )
+    return _redis_client
+
+
+def get_async_redis_client():
+    """获取业务库的共享异步 Redis 客户端（须在事件循环中调用）"""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        # 异步连接绑定事件循环，不能跨循环共享
+        client = _async_redis_clients[loop] = redis.asyncio.Redis(
+            connection_pool=redis.asyncio.BlockingConnectionPool(**_redis_connection_kwargs())
+        )
+    return client
+
+
+def get_cache_redis_client(alias='default'):
+    """获取 Django 缓存库的原始 Redis 连接，缓存后端不是 django-redis 时返回 None"""
+    from django.core.cache import caches
+
+    backend = caches[alias]
+    if hasattr(backend, 'client') and hasattr(backend.client, 'get_client'):
+        return backend.client.get_client()
+    return None
+
+
+# ==================== JSON 渲染 ====================
+
+# orjson 原生处理 datetime/date/time/UUID；UTC 时间以 Z 结尾，与 DRF JSONEncoder 一致
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+
+def _json_default(obj):
+    """orjson 不支持的类型（Decimal、惰性翻译字符串、QuerySet 等）按 DRF JSONEncoder 规则转换"""
+    return JSONEncoder().default(obj)
+
+
+def json_dumps(data) -> bytes:
+    """
+    将数据编码为 UTF-8 JSON（非 ASCII 字符不转义）
+
+    优先使用 orjson；未安装或遇到 orjson 无法编码的数据（如超过 64 位的整数）时回退为标准库 json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    基于 orjson 的 DRF JSON 渲染器
+
+    输出与 JSONRenderer（紧凑格式、UNICODE_JSON）一致；请求指定 indent 时交由 JSONRenderer 处理
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = json_dumps(data)
+        # 与 JSONRenderer 一致：转义 U+2028 / U+2029，保证输出可直接嵌入 JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJsonResponse(HttpResponse):
+    """JsonResponse 的替代：使用 json_dumps 编码，不限制顶层数据类型"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=json_dumps(data), **kwargs)
+
+
+# ==================== 数据版本号 ====================
+
+MODEL_VERSION_KEY = 'model_version:{}'
+
+
+def get_table_versions(tables) -> Dict[str, int]:
+    """
+    批量读取数据表版本号（一次 get_many），从未写入过的表版本为 0
+
+    Args:
+        tables: 数据表名列表
+
+    Returns:
+        {表名: 版本号}
+    """
+    tables = sorted(set(tables))
+    try:
+        values = cache.get_many([MODEL_VERSION_KEY.format(table) for table in tables])
+    except Exception as e:
+        logger.warning(f"读取数据版本号失败: {e}")
+        values = {}
+    return {table: values.get(MODEL_VERSION_KEY.format(table), 0) for table in tables}
+
+
+def bump_table_version(table: str):
+    """数据表版本号加一（O(1)），依赖版本号的缓存随之失效"""
+    key = MODEL_VERSION_KEY.format(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # 键不存在，从 1 开始计数（不过期）
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except Exception as e:
+        logger.warning(f"更新数据版本号失败 ({table}): {e}")
+
+
+_local_model_cache = {}
+
+
+def _is_local_model(model) -> bool:
+    """仅跟踪本项目应用中的模型（排除 Django 自带、Celery Beat 等第三方应用的表）"""
+    label = model._meta.label
+    if label not in _local_model_cache:
+        from django.apps import apps
+        app_path = apps.get_app_config(model._meta.app_label).path
+        _local_model_cache[label] = str(app_path).startswith(str(settings.BASE_DIR))
+    return _local_model_cache[label]
+
+
+def bump_model_versions(*models):
+    """
+    递增模型对应数据表的版本号（事务中调用时于提交后生效）
+
+    QuerySet.update() / bulk_create() / bulk_update() 不触发模型信号，写入分页列表或
+    cache_response 依赖的数据表时需显式调用，使依赖版本号的缓存失效；无缓存依赖的表不必调用。
+    """
+    tables = {model._meta.db_table for model in models if model is not None and _is_local_model(model)}
+    if not tables:
+        return
+
+    def run():
+        for table in tables:
+            bump_table_version(table)
+    transaction.on_commit(run)
+
+
+def _on_model_saved_or_deleted(sender, **kwargs):
+    bump_model_versions(sender)
+
+
+def _on_m2m_changed(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_model_versions(sender, type(instance), model)
+
+
+def connect_model_version_signals():
+    """
+    监听本项目全部模型的 post_save / post_delete / m2m_changed，事务提交后递增对应数据表的版本号。
+    在 AppConfig.ready() 中调用一次；QuerySet.update() / bulk_create() / bulk_update() 不触发信号，
+    写入方需调用 bump_model_versions，依赖版本号的缓存另设过期时间兜底。
+    """
+    post_save.connect(_on_model_saved_or_deleted, dispatch_uid='common_utils_model_version_save')
+    post_delete.connect(_on_model_saved_or_deleted, dispatch_uid='common_utils_model_version_delete')
+    m2m_changed.connect(_on_m2m_changed, dispatch_uid='common_utils_model_version_m2m')
+
+
+def get_queryset_tables(queryset) -> list:
+    """查询集筛选条件涉及的全部数据表（主表、关联表与多对多中间表）"""
+    tables = {alias.table_name for alias in queryset.query.alias_map.values()}
+    tables.add(queryset.model._meta.db_table)
+    return sorted(tables)
+
+
+# ==================== 响应缓存 ====================
+
+RESPONSE_CACHE_KEY = 'response_cache:{}'
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _permission_scope(request) -> str:
+    """响应内容按权限范围区分：匿名 / 用户类型（管理员单独区分）"""
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return 'anon'
+    if user.is_staff:
+        return 'staff'
+    return getattr(user, 'user_type', '') or 'user'
+
+
+def _table_names(models_or_tables) -> list:
+    return [m if isinstance(m, str) else m._meta.db_table for m in models_or_tables]
+
+
+def cache_response(tables, timeout: int = None, condition=None, overlay=None):
+    """
+    GET 视图响应缓存装饰器（置于 @api_view / @permission_classes 之下，权限校验仍每次执行）
+
+    缓存键由 路由、规范化查询参数、权限范围、站点域名 与相关数据表的版本号组成；
+    数据表写入后版本号递增（见 connect_model_version_signals），旧缓存不再命中，无需按模式删除。
+    命中时直接返回缓存的响应数据，不执行查询与序列化。
+
+    Args:
+        tables: 响应依赖的模型类或数据表名
+        timeout: 缓存有效期（秒），版本号无法覆盖的写入（QuerySet.update 等）由过期兜底
+        condition: condition(request, *args, **kwargs) -> bool，返回 False 时不使用缓存
+        overlay: overlay(request, data)，为成功响应叠加每用户字段（命中、未命中及不使用缓存时均调用），
+            被装饰的视图只需返回与用户无关的数据
+    """
+    tables = _table_names(tables)
+    timeout = RESPONSE_CACHE_TIMEOUT if timeout is None else timeout
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = None
+            if request.method != 'GET' or (condition and not condition(request, *args, **kwargs)):
+                return _finish(request, view_func(request, *args, **kwargs), key)
+
+            try:
+                query = sorted((k, v) for k, values in request.GET.lists() for v in values if v != '')
+                versions = sorted(get_table_versions(tables).items())
+                raw_key = repr((request.path, query, _permission_scope(request), request.get_host(), versions))
+                key = RESPONSE_CACHE_KEY.format(hashlib.sha1(raw_key.encode('utf-8')).hexdigest())
+                cached = cache.get(key)
+            except Exception as e:
+                logger.warning(f"读取响应缓存失败: {e}")
+                cached = None
+
+            if cached is not None:
+                # cache.get 每次反序列化出新对象，可直接叠加每用户字段
+                if overlay:
+                    overlay(request, cached)
+                return Response(cached, status=status.HTTP_200_OK)
+
+            return _finish(request, view_func(request, *args, **kwargs), key)
+
+        def _finish(request, response, key):
+            data = getattr(response, 'data', None)
+            if response.status_code != 200 or not isinstance(data, dict) or data.get('status') != 'success':
+                return response
+            if key:
+                try:
+                    # 缓存前转为普通类型（ReturnList/OrderedDict、datetime 等），保证可序列化
+                    cache.set(key, json.loads(json_dumps(data)), timeout=timeout)
+                except Exception as e:
+                    logger.warning(f"写入响应缓存失败: {e}")
+            if overlay:
+                overlay(request, data)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# ==================== 防击穿缓存 ====================
+# 软/硬过期 + 单飞锁 + 后台刷新（stale-while-revalidate）：
+# - 值键按硬过期时间保存，新鲜标记键按软过期时间保存；标记过期（或被 mark_cache_stale 删除）后值仍可读
+# - 过期值由抢到锁（cache.add，即 Redis SET NX EX）的一个请求提交后台刷新，其余请求直接返回过期值
+# - 冷启动（无值）时只有抢到锁的请求执行计算，其余请求短暂等待其结果，超时后自行计算
+# 缓存不可用时直接计算，不影响接口
+
+CACHE_LOCK_TIMEOUT = getattr(settings, 'REFRESHABLE_CACHE_LOCK_TIMEOUT', 30)  # 计算耗时上限，超时后锁自动释放
+CACHE_WAIT_TIMEOUT = getattr(settings, 'REFRESHABLE_CACHE_WAIT_TIMEOUT', 2.0)  # 冷启动时等待其他请求计算结果的秒数
+_CACHE_WAIT_INTERVAL = 0.05
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_refresh_executor():
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'REFRESHABLE_CACHE_WORKERS', 2),
+                    thread_name_prefix='cache-refresh',
+                )
+    return _refresh_executor
+
+
+def set_refreshable_cache(key, value, soft_timeout: int, stale_timeout: int = None):
+    """
+    写入可刷新缓存
+
+    Args:
+        soft_timeout: 新鲜期（秒），过期后读取会触发刷新
+        stale_timeout: 新鲜期之后仍可返回过期值的秒数，默认与新鲜期相同
+    """
+    stale_timeout = soft_timeout if stale_timeout is None else stale_timeout
+    # 先写值再写新鲜标记，读到标记时值一定存在
+    cache.set(key, {'value': value, 'created_at': time.time()}, soft_timeout + stale_timeout)
+    cache.set(f'{key}:fresh', 1, soft_timeout)
+
+
+def mark_cache_stale(*keys):
+    """将缓存标记为过期：下一次读取返回当前值并触发刷新（不会造成冷启动击穿）"""
+    cache.delete_many([f'{key}:fresh' for key in keys])
+
+
+def _refresh_cache(key, compute, soft_timeout, stale_timeout):
+    value = compute()
+    set_refreshable_cache(key, value, soft_timeout, stale_timeout)
+    return value
+
+
+def _refresh_cache_in_background(key, compute, soft_timeout, stale_timeout):
+    from django.db import close_old_connections
+
+    try:
+        _refresh_cache(key, compute, soft_timeout, stale_timeout)
+    except Exception as e:
+        logger.warning(f"后台刷新缓存失败 ({key}): {e}")
+    finally:
+        cache.delete(f'{key}:lock')
+        close_old_connections()
+
+
+def get_or_refresh_cache(key, compute, soft_timeout: int, stale_timeout: int = None, background: bool = True):
+    """
+    读取可刷新缓存，未命中或已过期时由单个请求重新计算
+
+    Args:
+        key: 缓存键
+        compute: 无参可调用对象，返回要缓存的值（需可被缓存后端序列化）
+        soft_timeout: 新鲜期（秒）
+        stale_timeout: 新鲜期之后仍可返回过期值的秒数，默认与新鲜期相同
+        background: 过期值是否在后台线程刷新；为 False 时由抢到锁的请求同步刷新
+
+    Returns:
+        tuple: (值, 缓存信息)；本次实时计算时缓存信息为 None，
+               否则为 {'created_at': 写入时间戳, 'is_stale': 是否为过期值}
+    """
+    lock_key = f'{key}:lock'
+    try:
+        cached = cache.get_many([key, f'{key}:fresh'])
+    except Exception as e:
+        logger.warning(f"读取缓存失败 ({key}): {e}")
+        return compute(), None
+
+    entry = cached.get(key)
+    if entry is not None:
+        is_stale = f'{key}:fresh' not in cached
+        if is_stale and cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT):
+            if background:
+                _get_refresh_executor().submit(_refresh_cache_in_background, key, compute, soft_timeout, stale_timeout)
+            else:
+                try:
+                    return _refresh_cache(key, compute, soft_timeout, stale_timeout), None
+                finally:
+                    cache.delete(lock_key)
+        return entry['value'], {'created_at': entry['created_at'], 'is_stale': is_stale}
+
+    # 冷启动：单飞计算
+    if cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT):
+        try:
+            return _refresh_cache(key, compute, soft_timeout, stale_timeout), None
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + CACHE_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(_CACHE_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value'], {'created_at': entry['created_at'], 'is_stale': False}
+    return compute(), None
+
+
+# ==================== 统计聚合 ====================
+# 声明式统计：调用方声明具名的桶（状态分组、时间区间、存在性条件等），
+# 同一模型的全部桶编译为一条条件聚合查询（COUNT(CASE WHEN ... END)），结果再由调用方组装为接口格式。
+# 时间桶使用区间条件而非 TruncWeek/TruncMonth：区间按本地时区在 Python 中计算，
+# 数据库无需加载时区表，也支持“截止今天的滚动七天”这类非自然周的区间。
+
+
+def count_buckets(queryset, buckets) -> Dict[str, int]:
+    """
+    一条查询统计多个桶的记录数
+
+    Args:
+        queryset: 统计范围
+        buckets: {桶名: 条件}，条件为 Q 对象或布尔表达式（如 Exists），None 表示统计范围内的全部记录
+
+    Returns:
+        dict: {桶名: 记录数}
+    """
+    # 桶名可能与模型字段重名（如按状态命名），查询中使用内部别名
+    aliases = {f'bucket_{i}': name for i, name in enumerate(buckets)}
+    result = queryset.aggregate(**{
+        alias: Count('pk', filter=buckets[name]) if buckets[name] is not None else Count('pk')
+        for alias, name in aliases.items()
+    })
+    return {name: result[alias] for alias, name in aliases.items()}
+
+
+def count_grouped(queryset, field) -> Dict:
+    """按字段取值分组计数（一条 GROUP BY 查询），用于取值不固定的字段"""
+    return dict(queryset.order_by().values_list(field).annotate(n=Count('pk')))
+
+
+def value_buckets(field, groups) -> dict:
+    """
+    按字段取值划分的桶
+
+    Args:
+        groups: {桶名: 取值或取值列表}
+
+    Returns:
+        dict: {桶名: Q}
+    """
+    return {
+        name: Q(**{f'{field}__in': values}) if isinstance(values, (list, tuple, set)) else Q(**{field: values})
+        for name, values in groups.items()
+    }
+
+
+def range_buckets(field, ranges) -> dict:
+    """
+    按区间划分的桶（时间或数值）
+
+    Args:
+        ranges: {桶名: (起点, 终点)}，左闭右开，None 表示该侧不限
+
+    Returns:
+        dict: {桶名: Q}，两侧均不限的桶为 None
+    """
+    buckets = {}
+    for name, (start, end) in ranges.items():
+        lookups = {}
+        if start is not None:
+            lookups[f'{field}__gte'] = start
+        if end is not None:
+            lookups[f'{field}__lt'] = end
+        buckets[name] = Q(**lookups) if lookups else None
+    return buckets
+
+
 # ==================== 通用分页工具 ====================
 
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import QuerySet
-from typing import Dict, Any, Optional, Union
+
+class CachedCountPaginator(Paginator):
+    """
+    总数缓存分页器
+
+    总数按“去除排序后的 SQL 与参数 + 涉及数据表的版本号”缓存，翻页时不再重复执行相同的 COUNT；
+    任一相关表写入后版本号变化，缓存自然失效。
+    配置 PAGINATOR_COUNT_ESTIMATE_THRESHOLD 后（仅 MySQL），EXPLAIN 估算行数超过阈值时直接使用估算值。
+    """
+
+    COUNT_CACHE_KEY = 'paginator_count:{}'
+    COUNT_CACHE_TIMEOUT = getattr(settings, 'PAGINATOR_COUNT_CACHE_TIMEOUT', 300)
+    ESTIMATE_THRESHOLD = getattr(settings, 'PAGINATOR_COUNT_ESTIMATE_THRESHOLD', None)
+
+    count_estimated = False
+
+    def _count_cache_key(self, queryset: QuerySet) -> str:
+        queryset = queryset.order_by()
+        sql, params = queryset.query.sql_with_params()
+        versions = get_table_versions(get_queryset_tables(queryset))
+        digest = hashlib.sha1(repr((sql, params, sorted(versions.items()))).encode('utf-8')).hexdigest()
+        return self.COUNT_CACHE_KEY.format(digest)
+
+    @staticmethod
+    def _estimate_count(queryset: QuerySet) -> Optional[int]:
+        """MySQL EXPLAIN 估算行数，其他数据库返回 None"""
+        connection = connections[queryset.db]
+        if connection.vendor != 'mysql':
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}', params)
+            columns = [col[0] for col in cursor.description]
+            row = cursor.fetchone()
+        if not row or 'rows' not in columns:
+            return None
+        rows = row[columns.index('rows')] or 0
+        filtered = row[columns.index('filtered')] if 'filtered' in columns else 100
+        return int(rows * float(filtered or 100) / 100)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        try:
+            key = self._count_cache_key(queryset)
+        except Exception:
+            # 如 .none() 等无法生成 SQL 的查询集
+            return super().count
+
+        cached = cache.get(key)
+        if cached is not None:
+            count, self.count_estimated = cached
+            return count
+
+        count = None
+        if self.ESTIMATE_THRESHOLD is not None:
+            try:
+                estimate = self._estimate_count(queryset)
+            except Exception as e:
+                logger.warning(f"估算查询总数失败: {e}")
+                estimate = None
+            if estimate is not None and estimate > self.ESTIMATE_THRESHOLD:
+                count, self.count_estimated = estimate, True
+        if count is None:
+            count = queryset.count()
+
+        cache.set(key, (count, self.count_estimated), timeout=self.COUNT_CACHE_TIMEOUT)
+        return count
+
+    def refresh_count(self):
+        """丢弃缓存的总数并重新统计（缓存的总数与实际数据不一致时调用）"""
+        if isinstance(self.object_list, QuerySet):
+            try:
+                cache.delete(self._count_cache_key(self.object_list))
+            except Exception as e:
+                logger.warning(f"删除分页总数缓存失败: {e}")
+        self.__dict__.pop('count', None)
+        self.__dict__.pop('num_pages', None)
+        self.count_estimated = False
 
 
 class CustomPaginator:
@@ -242,7 +824,7 @@ class CustomPaginator:
         self.queryset = queryset
         self.page = max(1, page)  # 确保页码至少为1
         self.page_size = self._validate_page_size(page_size)
-        self.paginator = Paginator(queryset, self.page_size)
+        self.paginator = CachedCountPaginator(queryset, self.page_size)
         self.page_obj = None
         self._paginate()
     
@@ -266,14 +848,20 @@ class CustomPaginator:
             # 如果页码超出范围，返回最后一页
             self.page_obj = self.paginator.page(self.paginator.num_pages)
             self.page = self.paginator.num_pages
+
+        # 缓存的总数可能滞后于绕过版本号的写入：总数非零却取到空页时重新统计并重新分页
+        if self.paginator.count and not self.paginator.count_estimated and not len(self.page_obj):
+            self.paginator.refresh_count()
+            self.page = min(self.page, self.paginator.num_pages)
+            self.page_obj = self.paginator.page(self.page)
     
     def get_page_data(self) -> QuerySet:
         """获取当前页的数据"""
-        return self.page_obj.object_list if self.page_obj else self.queryset.none()
+        return self.page_obj.object_list if self.page_obj is not None else self.queryset.none()
     
     def get_pagination_info(self, request=None) -> Dict[str, Any]:
         """获取分页信息"""
-        if not self.page_obj:
+        if self.page_obj is None:
             return {
                 'current_page': 1,
                 'total_pages': 0,
@@ -299,7 +887,7 @@ class CustomPaginator:
                 query_params['page'] = self.page_obj.next_page_number()
                 next_url = f"{base_url}?{query_params.urlencode()}"
         
-        return {
+        pagination_info = {
             'current_page': self.page_obj.number,
             'total_pages': self.paginator.num_pages,
             'total_count': self.paginator.count,
@@ -307,6 +895,9 @@ class CustomPaginator:
             'previous_url': previous_url,
             'next_url': next_url
         }
+        if self.paginator.count_estimated:
+            pagination_info['total_count_estimated'] = True
+        return pagination_info
     
     def get_paginated_response_data(self, results: list, request=None) -> Dict[str, Any]:
         """
@@ -327,17 +918,156 @@ class CustomPaginator:
         }
 
 
-def paginate_queryset(request, queryset: QuerySet, default_page_size: int = None) -> Dict[str, Any]:
+class CursorPaginator:
     """
-    便捷函数：从请求中提取分页参数并返回分页响应数据
-    
+    游标（keyset）分页器
+
+    游标编码上一页最后一条记录的 (排序字段值, id)，下一页以 WHERE (key, id) < (...) 定位（升序为 >），
+    深页与第一页耗时相同；默认不执行 COUNT 查询。
+    仅支持按单个非空字段（可附加 id）排序的查询集，不满足时抛出 ValueError。
+    """
+
+    DEFAULT_PAGE_SIZE = CustomPaginator.DEFAULT_PAGE_SIZE
+    MAX_PAGE_SIZE = CustomPaginator.MAX_PAGE_SIZE
+
+    def __init__(self, queryset: QuerySet, cursor: Optional[str] = None, page_size: Optional[int] = None,
+                 ordering: Optional[str] = None, include_total: bool = False):
+        """
+        初始化分页器
+
+        Args:
+            queryset: Django QuerySet对象
+            cursor: 上一页返回的 next_cursor，为空时从第一条开始
+            page_size: 每页显示数量
+            ordering: 排序字段（如 '-created_at'），默认取查询集当前排序
+            include_total: 是否统计总数
+        """
+        self.page_size = max(1, min(page_size or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE))
+        self.key_field, self.descending = self._resolve_ordering(queryset, ordering)
+        prefix = '-' if self.descending else ''
+        order_by = [f'{prefix}pk']
+        if self.key_field is not None:
+            order_by.insert(0, f'{prefix}{self.key_field.name}')
+        self.queryset = queryset.order_by(*order_by)
+        self.cursor = cursor or None
+        self.include_total = include_total
+        self.items = []
+        self.next_cursor = None
+        self._paginate()
+
+    @staticmethod
+    def _resolve_ordering(queryset: QuerySet, ordering: Optional[str]):
+        """解析排序字段，返回 (排序字段对象或None(仅按id), 是否降序)"""
+        if ordering:
+            fields = [ordering]
+        else:
+            fields = list(queryset.query.order_by) or list(queryset.query.get_meta().ordering)
+        if not fields or not all(isinstance(f, str) for f in fields):
+            raise ValueError("游标分页需要按字段排序的查询集")
+
+        model_meta = queryset.model._meta
+        name = fields[0]
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        # 除首个字段外只允许附加 id 作为次级排序
+        for extra in fields[1:]:
+            if extra.lstrip('-') not in ('pk', model_meta.pk.name):
+                raise ValueError("游标分页仅支持单个排序字段")
+        if name in ('pk', model_meta.pk.name):
+            return None, descending
+        try:
+            field = model_meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(f"游标分页不支持的排序字段: {name}")
+        if not field.concrete or field.is_relation or field.null:
+            raise ValueError(f"游标分页不支持的排序字段: {name}")
+        return field, descending
+
+    def _encode(self, obj) -> str:
+        data = {'id': obj.pk}
+        if self.key_field is not None:
+            data['k'] = self.key_field.value_to_string(obj)
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+    def _decode(self, cursor: str):
+        """解析游标，无效游标返回 None（从第一条开始）"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            pk = self.queryset.model._meta.pk.to_python(data['id'])
+            key = self.key_field.to_python(data['k']) if self.key_field is not None else None
+            return key, pk
+        except (ValueError, TypeError, KeyError, ValidationError):
+            return None
+
+    def _paginate(self):
+        queryset = self.queryset
+        position = self._decode(self.cursor) if self.cursor else None
+        if position is not None:
+            key, pk = position
+            op = 'lt' if self.descending else 'gt'
+            condition = Q(**{f'pk__{op}': pk})
+            if self.key_field is not None:
+                name = self.key_field.name
+                condition = Q(**{f'{name}__{op}': key}) | (Q(**{name: key}) & condition)
+            queryset = queryset.filter(condition)
+
+        items = list(queryset[:self.page_size + 1])
+        self.has_next = len(items) > self.page_size
+        self.items = items[:self.page_size]
+        if self.has_next:
+            self.next_cursor = self._encode(self.items[-1])
+
+    def get_page_data(self) -> list:
+        """获取当前页的数据"""
+        return self.items
+
+    def get_pagination_info(self, request=None) -> Dict[str, Any]:
+        """获取分页信息（游标模式没有页码，total_count 仅在 include_total 时返回）"""
+        next_url = None
+        if request and self.next_cursor:
+            base_url = request.build_absolute_uri().split('?')[0]
+            query_params = request.GET.copy()
+            query_params.pop('page', None)
+            query_params['cursor'] = self.next_cursor
+            next_url = f"{base_url}?{query_params.urlencode()}"
+
+        total_count = self.queryset.count() if self.include_total else None
+        return {
+            'mode': 'cursor',
+            'current_page': None,
+            'total_pages': (total_count + self.page_size - 1) // self.page_size if total_count is not None else None,
+            'total_count': total_count,
+            'page_size': self.page_size,
+            'has_next': self.has_next,
+            'next_cursor': self.next_cursor,
+            'previous_url': None,
+            'next_url': next_url
+        }
+
+    def get_paginated_response_data(self, results: list, request=None) -> Dict[str, Any]:
+        """获取完整的分页响应数据"""
+        return {
+            'results': results,
+            'pagination': self.get_pagination_info(request)
+        }
+
+
+def build_paginator(request, queryset: QuerySet, default_page_size: int = None, allow_cursor: bool = False):
+    """
+    从请求中提取分页参数并创建分页器
+
+    视图传入 allow_cursor=True 后，请求携带 cursor 参数（第一页可为空值）时使用游标分页，
+    with_count=true 时额外返回总数；查询集排序不支持游标分页时回退为页码分页。
+
     Args:
         request: Django请求对象
         queryset: Django QuerySet对象
         default_page_size: 默认每页大小，如果不提供则使用CustomPaginator.DEFAULT_PAGE_SIZE
-        
+        allow_cursor: 是否允许游标分页
+
     Returns:
-        包含分页数据的字典，需要配合序列化器使用
+        CustomPaginator 或 CursorPaginator
     """
     # 从请求参数中获取页码和每页大小
     try:
@@ -349,8 +1079,32 @@ def paginate_queryset(request, queryset: QuerySet, default_page_size: int = None
         page_size = int(request.GET.get('page_size', default_page_size or CustomPaginator.DEFAULT_PAGE_SIZE))
     except (ValueError, TypeError):
         page_size = default_page_size or CustomPaginator.DEFAULT_PAGE_SIZE
+
+    if allow_cursor and 'cursor' in request.GET:
+        include_total = request.GET.get('with_count', '').lower() in ('1', 'true')
+        try:
+            return CursorPaginator(queryset, request.GET.get('cursor'), page_size, include_total=include_total)
+        except ValueError:
+            pass
+
+    return CustomPaginator(queryset, page, page_size)
+
+
+def paginate_queryset(request, queryset: QuerySet, default_page_size: int = None,
+                      allow_cursor: bool = False) -> Dict[str, Any]:
+    """
+    便捷函数：从请求中提取分页参数并返回分页响应数据
     
-    paginator = CustomPaginator(queryset, page, page_size)
+    Args:
+        request: Django请求对象
+        queryset: Django QuerySet对象
+        default_page_size: 默认每页大小，如果不提供则使用CustomPaginator.DEFAULT_PAGE_SIZE
+        allow_cursor: 是否允许游标分页（见 build_paginator）
+        
+    Returns:
+        包含分页数据的字典，需要配合序列化器使用
+    """
+    paginator = build_paginator(request, queryset, default_page_size, allow_cursor)
     
     return {
         'paginator': paginator,
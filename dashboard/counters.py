@@ -0,0 +1,330 @@
+# dashboard/counters.py
+"""
+数据大屏计数器
+
+大屏统计改为读取 Redis 中增量维护的计数器，不再每次全表聚合：
+- 写入路径：信号在事务提交后按变更增量更新计数器（状态变更为 旧状态 -1 / 新状态 +1）
+- 读取路径：每个统计一次 pipeline 读取，耗时与数据量无关
+- 对账：定时任务从数据库重建计数器，修正漏记（QuerySet.update、bulk_create 等不触发信号的写入）
+
+计数器按分区维护，分区重建完成后才标记为可用；未就绪的分区不接收增量，视图回退为数据库查询。
+"""
+import time
+import logging
+from datetime import timezone as dt_timezone
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from common_utils import get_redis_client, count_grouped
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY = 'dashboard:counters:{}'
+READY_KEY = COUNTER_KEY.format('ready')      # HASH: 分区 -> 最近一次重建时间戳
+TOTALS_KEY = COUNTER_KEY.format('totals')    # HASH: 全局总数
+REBUILD_LOCK_KEY = 'dashboard:counters:rebuild_lock:{}'
+REBUILD_LOCK_SECONDS = 300
+
+# 分区
+TAG_STUDENTS = 'tag_students'
+PROJECT_STATUS = 'project_status'
+ORG_STATUS = 'org_status'
+USER_REGISTRATION = 'user_registration'
+SECTIONS = (TAG_STUDENTS, PROJECT_STATUS, ORG_STATUS, USER_REGISTRATION)
+
+# 学生标签：kind -> (ZSET 标签ID -> 学生数, HASH 学生ID -> 该类标签数)
+TAG_KEYS = {
+    'tag1': (COUNTER_KEY.format('tag1_students'), COUNTER_KEY.format('tag1_student_tags')),
+    'tag2': (COUNTER_KEY.format('tag2_students'), COUNTER_KEY.format('tag2_student_tags')),
+}
+_ZSET_KEYS = {keys[0] for keys in TAG_KEYS.values()}
+STATUS_KEYS = {
+    PROJECT_STATUS: COUNTER_KEY.format('project_status'),  # HASH: 项目状态 -> 项目数
+    ORG_STATUS: COUNTER_KEY.format('org_status'),          # HASH: 组织状态 -> 组织数
+}
+USER_MONTHLY_KEY = COUNTER_KEY.format('user_monthly')      # HASH: 注册月份(UTC, YYYY-MM) -> 注册人数
+
+# 分区包含的键与 TOTALS_KEY 字段（重建时整体替换）
+SECTION_KEYS = {
+    TAG_STUDENTS: [key for keys in TAG_KEYS.values() for key in keys],
+    PROJECT_STATUS: [STATUS_KEYS[PROJECT_STATUS]],
+    ORG_STATUS: [STATUS_KEYS[ORG_STATUS]],
+    USER_REGISTRATION: [USER_MONTHLY_KEY],
+}
+SECTION_TOTALS = {
+    TAG_STUDENTS: ['students', 'students_with_both_tags'],
+    USER_REGISTRATION: ['users'],
+}
+
+# KEYS: 就绪HASH, 计数HASH1, 计数HASH2, ...
+# ARGV: 分区, 字段1, 增量1, 字段2, 增量2, ...（字段与 KEYS[2..] 一一对应）
+_HINCR_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+for i = 2, #KEYS do
+    redis.call('HINCRBY', KEYS[i], ARGV[2 * i - 2], ARGV[2 * i - 1])
+end
+return 1
+"""
+
+# 学生标签关联增删
+# KEYS: 就绪HASH, 标签学生数ZSET, 学生标签数HASH, 另一类标签的学生标签数HASH, 总数HASH
+# ARGV: 分区, 标签ID, 学生ID, 增量(+1/-1)
+_TAG_MATCH_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+local delta = tonumber(ARGV[4])
+if tonumber(redis.call('ZINCRBY', KEYS[2], delta, ARGV[2])) <= 0 then
+    redis.call('ZREM', KEYS[2], ARGV[2])
+end
+local n = redis.call('HINCRBY', KEYS[3], ARGV[3], delta)
+if n <= 0 then
+    redis.call('HDEL', KEYS[3], ARGV[3])
+end
+-- 学生首次拥有 / 不再拥有该类标签时，维护同时拥有两类标签的学生数
+if ((delta > 0 and n == 1) or (delta < 0 and n == 0)) and redis.call('HEXISTS', KEYS[4], ARGV[3]) == 1 then
+    redis.call('HINCRBY', KEYS[5], 'students_with_both_tags', delta)
+end
+return 1
+"""
+
+
+def user_month(date_joined):
+    """注册月份（UTC，与注册统计的月份边界一致）"""
+    return date_joined.astimezone(dt_timezone.utc).strftime('%Y-%m')
+
+
+class DashboardCounters:
+    """数据大屏计数器（Redis）"""
+
+    def __init__(self):
+        self._scripts = {}
+
+    def _client(self):
+        return get_redis_client()
+
+    def _script(self, client, name, source):
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = client.register_script(source)
+        return script
+
+    # ---------- 增量 ----------
+
+    def _hincr(self, section, increments):
+        """increments: [(key, field, 增量), ...]；分区未就绪时忽略"""
+        increments = [(key, field, delta) for key, field, delta in increments if delta]
+        if not increments:
+            return False
+        client = self._client()
+        args = [section]
+        for _, field, delta in increments:
+            args.extend([field, delta])
+        script = self._script(client, 'hincr', _HINCR_SCRIPT)
+        return bool(script(keys=[READY_KEY] + [key for key, _, _ in increments], args=args))
+
+    def apply_status_change(self, section, old_status, new_status):
+        """项目/组织状态变更：old_status 为 None 表示新建，new_status 为 None 表示删除"""
+        if old_status == new_status:
+            return False
+        key = STATUS_KEYS[section]
+        increments = []
+        if old_status is not None:
+            increments.append((key, old_status, -1))
+        if new_status is not None:
+            increments.append((key, new_status, 1))
+        return self._hincr(section, increments)
+
+    def apply_tag_match(self, kind, student_id, tag_id, delta):
+        """学生标签关联新增(delta=1)/删除(delta=-1)"""
+        other = 'tag2' if kind == 'tag1' else 'tag1'
+        client = self._client()
+        script = self._script(client, 'tag_match', _TAG_MATCH_SCRIPT)
+        return bool(script(
+            keys=[READY_KEY, TAG_KEYS[kind][0], TAG_KEYS[kind][1], TAG_KEYS[other][1], TOTALS_KEY],
+            args=[TAG_STUDENTS, tag_id, student_id, delta],
+        ))
+
+    def apply_student(self, delta):
+        return self._hincr(TAG_STUDENTS, [(TOTALS_KEY, 'students', delta)])
+
+    def apply_user(self, date_joined, delta):
+        return self._hincr(USER_REGISTRATION, [
+            (USER_MONTHLY_KEY, user_month(date_joined), delta),
+            (TOTALS_KEY, 'users', delta),
+        ])
+
+    # ---------- 读取（分区未就绪时返回 None） ----------
+
+    def get_status_counts(self, section):
+        """
+        Returns:
+            dict | None: {状态: 数量}，只包含数量大于 0 的状态
+        """
+        pipe = self._client().pipeline(transaction=False)
+        pipe.hexists(READY_KEY, section)
+        pipe.hgetall(STATUS_KEYS[section])
+        ready, counts = pipe.execute()
+        if not ready:
+            return None
+        return {status: int(n) for status, n in counts.items() if int(n) > 0}
+
+    def get_tag_students(self, kind, limit=5):
+        """
+        Returns:
+            tuple | None: ([(标签ID, 学生数), ...] 按学生数降序, 拥有该类标签的学生数)
+        """
+        tag_key, student_key = TAG_KEYS[kind]
+        pipe = self._client().pipeline(transaction=False)
+        pipe.hexists(READY_KEY, TAG_STUDENTS)
+        pipe.zrevrange(tag_key, 0, limit - 1, withscores=True)
+        pipe.hlen(student_key)
+        ready, top, total = pipe.execute()
+        if not ready:
+            return None
+        return [(int(tag_id), int(score)) for tag_id, score in top], int(total)
+
+    def get_student_tag_summary(self):
+        """
+        Returns:
+            dict | None: {'students', 'students_with_tag1', 'students_with_tag2', 'students_with_both_tags'}
+        """
+        pipe = self._client().pipeline(transaction=False)
+        pipe.hexists(READY_KEY, TAG_STUDENTS)
+        pipe.hlen(TAG_KEYS['tag1'][1])
+        pipe.hlen(TAG_KEYS['tag2'][1])
+        pipe.hmget(TOTALS_KEY, ['students', 'students_with_both_tags'])
+        ready, with_tag1, with_tag2, (students, both) = pipe.execute()
+        if not ready:
+            return None
+        return {
+            'students': int(students or 0),
+            'students_with_tag1': int(with_tag1),
+            'students_with_tag2': int(with_tag2),
+            'students_with_both_tags': int(both or 0),
+        }
+
+    def get_user_registration(self, months):
+        """
+        Returns:
+            tuple | None: ({月份: 注册人数}, 总注册人数)
+        """
+        pipe = self._client().pipeline(transaction=False)
+        pipe.hexists(READY_KEY, USER_REGISTRATION)
+        pipe.hmget(USER_MONTHLY_KEY, months)
+        pipe.hget(TOTALS_KEY, 'users')
+        ready, values, total = pipe.execute()
+        if not ready:
+            return None
+        return {month: int(v or 0) for month, v in zip(months, values)}, int(total or 0)
+
+    # ---------- 重建与对账 ----------
+
+    @staticmethod
+    def _load_section(section):
+        """
+        从数据库计算分区的计数器
+
+        Returns:
+            tuple: ({键: {字段: 数量}}, {TOTALS_KEY 字段: 数量})
+        """
+        if section == TAG_STUDENTS:
+            from user.models import Student, Tag1StuMatch, Tag2StuMatch
+
+            values, student_sets = {}, {}
+            for kind, model in (('tag1', Tag1StuMatch), ('tag2', Tag2StuMatch)):
+                tag_key, student_key = TAG_KEYS[kind]
+                values[tag_key] = count_grouped(model.objects.all(), f'{kind}_id')
+                values[student_key] = count_grouped(model.objects.all(), 'student_id')
+                student_sets[kind] = set(values[student_key])
+            totals = {
+                'students': Student.objects.count(),
+                'students_with_both_tags': len(student_sets['tag1'] & student_sets['tag2']),
+            }
+            return values, totals
+
+        if section in STATUS_KEYS:
+            from studentproject.models import StudentProject
+            from organization.models import Organization
+
+            model = StudentProject if section == PROJECT_STATUS else Organization
+            counts = count_grouped(model.objects.all(), 'status')
+            return {STATUS_KEYS[section]: counts}, {}
+
+        if section == USER_REGISTRATION:
+            from user.models import User
+
+            monthly = User.objects.annotate(
+                month=TruncMonth('date_joined', tzinfo=dt_timezone.utc)
+            ).values_list('month').annotate(n=Count('id')).order_by()
+            counts = {month.strftime('%Y-%m'): n for month, n in monthly}
+            return {USER_MONTHLY_KEY: counts}, {'users': sum(counts.values())}
+
+        raise ValueError(f"未知的计数器分区: {section}")
+
+    def rebuild(self, section):
+        """
+        从数据库重建分区并标记为就绪（原子替换）
+
+        重建期间提交的增量可能被覆盖或重复计入，由下一次对账修正。
+
+        Returns:
+            int: 与重建前相比发生变化的计数项数（漂移量）
+        """
+        values, totals = self._load_section(section)
+        client = self._client()
+
+        # 计算漂移量
+        pipe = client.pipeline(transaction=False)
+        for key in SECTION_KEYS[section]:
+            if key in _ZSET_KEYS:
+                pipe.zrange(key, 0, -1, withscores=True)
+            else:
+                pipe.hgetall(key)
+        pipe.hexists(READY_KEY, section)
+        *old_values, was_ready = pipe.execute()
+        drift = 0
+        if was_ready:
+            for key, old in zip(SECTION_KEYS[section], old_values):
+                old = {str(k): int(v) for k, v in (old if isinstance(old, list) else old.items())}
+                new = {str(k): int(v) for k, v in values.get(key, {}).items()}
+                drift += sum(1 for k in old.keys() | new.keys() if old.get(k, 0) != new.get(k, 0))
+            if SECTION_TOTALS.get(section):
+                old_totals = client.hmget(TOTALS_KEY, SECTION_TOTALS[section])
+                drift += sum(1 for field, old in zip(SECTION_TOTALS[section], old_totals)
+                             if int(old or 0) != totals[field])
+
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(*SECTION_KEYS[section])
+        for key, counts in values.items():
+            counts = {k: v for k, v in counts.items() if v > 0}
+            if not counts:
+                continue
+            if key in _ZSET_KEYS:
+                pipe.zadd(key, counts)
+            else:
+                pipe.hset(key, mapping=counts)
+        if totals:
+            pipe.hset(TOTALS_KEY, mapping=totals)
+        pipe.hset(READY_KEY, section, int(time.time()))
+        pipe.execute()
+
+        if drift:
+            logger.warning(f"大屏计数器分区 {section} 对账修正 {drift} 项")
+        return drift
+
+    def request_rebuild(self, section):
+        """分区未就绪时异步重建（同一分区 REBUILD_LOCK_SECONDS 内只提交一次）"""
+        from .tasks import reconcile_dashboard_counters
+
+        try:
+            if self._client().set(REBUILD_LOCK_KEY.format(section), 1, nx=True, ex=REBUILD_LOCK_SECONDS):
+                reconcile_dashboard_counters.delay([section])
+        except Exception as e:
+            logger.warning(f"提交大屏计数器重建任务失败: {e}")
+
+
+# 全局实例
+dashboard_counters = DashboardCounters()
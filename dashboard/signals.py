@@ -1,50 +1,31 @@
-import redis
-import json
-from datetime import date
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.conf import settings
 import logging
 
 # 导入相关模型
 from studentproject.models import StudentProject
 from organization.models import Organization
+from user.models import User, Student, Tag1StuMatch, Tag2StuMatch
+from common_utils import mark_cache_stale
+from .counters import dashboard_counters, PROJECT_STATUS, ORG_STATUS
 
 logger = logging.getLogger(__name__)
 
 
-def get_redis_client():
-    """获取Redis客户端"""
-    return redis.Redis(
-        host=getattr(settings, 'REDIS_HOST', 'localhost'),
-        port=getattr(settings, 'REDIS_PORT', 6379),
-        db=getattr(settings, 'REDIS_DB', 0),
-        decode_responses=True
-    )
-
-
 def clear_dashboard_cache(cache_types):
-    """清除指定类型的dashboard缓存
+    """将指定类型的dashboard缓存标记为过期
+    
+    下一次请求仍返回当前缓存并在后台刷新，避免缓存删除后大量请求同时查询数据库。
     
     Args:
         cache_types (list): 要清除的缓存类型列表，如 ['project_status', 'org_status']
     """
     try:
-        redis_client = get_redis_client()
-        today_str = date.today().strftime('%Y%m%d')
-        
-        cleared_keys = []
-        for cache_type in cache_types:
-            cache_key = f"dashboard:{cache_type}:{today_str}"
-            result = redis_client.delete(cache_key)
-            if result:
-                cleared_keys.append(cache_key)
-                logger.info(f"已清除缓存: {cache_key}")
-        
-        if cleared_keys:
-            logger.info(f"Dashboard缓存清除完成，共清除 {len(cleared_keys)} 个缓存键")
-        
-        return cleared_keys
+        cache_keys = [f"dashboard:{cache_type}" for cache_type in cache_types]
+        mark_cache_stale(*cache_keys)
+        logger.info(f"Dashboard缓存已标记过期: {', '.join(cache_keys)}")
+        return cache_keys
     except Exception as e:
         logger.error(f"清除dashboard缓存失败: {str(e)}")
         return []
@@ -65,7 +46,7 @@ def handle_student_project_change(sender, instance, **kwargs):
             if hasattr(instance.requirement, 'tag1') and instance.requirement.tag1.exists():
                 cache_types_to_clear.append('project_tag1')
         
-        cleared_keys = clear_dashboard_cache(cache_types_to_clear)
+        clear_dashboard_cache(cache_types_to_clear)
         
         # 记录变更信息
         action = "创建" if kwargs.get('created', False) else "更新"
@@ -86,7 +67,7 @@ def handle_organization_change(sender, instance, **kwargs):
         # 1. org_status - 组织状态统计
         cache_types_to_clear = ['org_status']
         
-        cleared_keys = clear_dashboard_cache(cache_types_to_clear)
+        clear_dashboard_cache(cache_types_to_clear)
         
         # 记录变更信息
         action = "创建" if kwargs.get('created', False) else "更新"
@@ -125,4 +106,82 @@ def clear_project_related_cache():
 def clear_organization_related_cache():
     """清除组织相关的所有缓存"""
     org_cache_types = ['org_status']
-    return clear_dashboard_cache(org_cache_types)
\ No newline at end of file
+    return clear_dashboard_cache(org_cache_types)
+
+# ========== 大屏计数器增量维护 ==========
+
+
+def _apply_counter_delta(func, *args):
+    """事务提交后更新计数器，Redis 异常不影响业务写入（漏记由定时对账修正）"""
+    def run():
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"更新大屏计数器失败: {str(e)}")
+    transaction.on_commit(run)
+
+
+_STATUS_SECTIONS = {StudentProject: PROJECT_STATUS, Organization: ORG_STATUS}
+
+
+@receiver(pre_save, sender=StudentProject)
+@receiver(pre_save, sender=Organization)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    """保存前记录数据库中的原状态，用于计算状态变更增量"""
+    if instance.pk is None or (update_fields is not None and 'status' not in update_fields):
+        instance._dashboard_previous_status = instance.status
+        return
+    instance._dashboard_previous_status = sender.objects.filter(pk=instance.pk).values_list(
+        'status', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=StudentProject)
+@receiver(post_save, sender=Organization)
+def count_status_saved(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_dashboard_previous_status', instance.status)
+    if previous != instance.status:
+        _apply_counter_delta(dashboard_counters.apply_status_change, _STATUS_SECTIONS[sender], previous, instance.status)
+
+
+@receiver(post_delete, sender=StudentProject)
+@receiver(post_delete, sender=Organization)
+def count_status_deleted(sender, instance, **kwargs):
+    _apply_counter_delta(dashboard_counters.apply_status_change, _STATUS_SECTIONS[sender], instance.status, None)
+
+
+@receiver(post_save, sender=Tag1StuMatch)
+@receiver(post_save, sender=Tag2StuMatch)
+def count_student_tag_saved(sender, instance, created, **kwargs):
+    if created:
+        kind = 'tag1' if sender is Tag1StuMatch else 'tag2'
+        _apply_counter_delta(dashboard_counters.apply_tag_match, kind, instance.student_id, getattr(instance, f'{kind}_id'), 1)
+
+
+@receiver(post_delete, sender=Tag1StuMatch)
+@receiver(post_delete, sender=Tag2StuMatch)
+def count_student_tag_deleted(sender, instance, **kwargs):
+    kind = 'tag1' if sender is Tag1StuMatch else 'tag2'
+    _apply_counter_delta(dashboard_counters.apply_tag_match, kind, instance.student_id, getattr(instance, f'{kind}_id'), -1)
+
+
+@receiver(post_save, sender=Student)
+def count_student_saved(sender, instance, created, **kwargs):
+    if created:
+        _apply_counter_delta(dashboard_counters.apply_student, 1)
+
+
+@receiver(post_delete, sender=Student)
+def count_student_deleted(sender, instance, **kwargs):
+    _apply_counter_delta(dashboard_counters.apply_student, -1)
+
+
+@receiver(post_save, sender=User)
+def count_user_saved(sender, instance, created, **kwargs):
+    if created:
+        _apply_counter_delta(dashboard_counters.apply_user, instance.date_joined, 1)
+
+
+@receiver(post_delete, sender=User)
+def count_user_deleted(sender, instance, **kwargs):
+    _apply_counter_delta(dashboard_counters.apply_user, instance.date_joined, -1)
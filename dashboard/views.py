@@ -1,81 +1,290 @@
 import redis
 import time
-import json
 from datetime import date, datetime, timedelta
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Exists, OuterRef
 from dateutil.relativedelta import relativedelta
 from django.shortcuts import render
 from django.http import JsonResponse
-from django.conf import settings
-from django.db.models import Count, Q
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authentication import TokenAuthentication
-from common_utils import APIResponse
+from common_utils import (
+    APIResponse, get_redis_client, get_or_refresh_cache, set_refreshable_cache,
+    count_buckets, count_grouped, value_buckets, range_buckets,
+)
 from user.models import Tag1, Tag2, Tag1StuMatch, Tag2StuMatch, User
 from organization.models import Organization
 from studentproject.models import StudentProject
 from project.models import Requirement
+from .counters import dashboard_counters, TAG_STUDENTS, PROJECT_STATUS, ORG_STATUS, USER_REGISTRATION
 
 
-# Redis连接配置
-def get_redis_client():
-    """获取Redis客户端"""
-    return redis.Redis(
-        host=getattr(settings, 'REDIS_HOST', 'localhost'),
-        port=getattr(settings, 'REDIS_PORT', 6379),
-        db=getattr(settings, 'REDIS_DB', 0),
-        decode_responses=True
-    )
+# 统计数据缓存软过期后仍可返回旧值的秒数（期间由单个请求在后台刷新）
+STATS_STALE_SECONDS = 3600
 
 
-def get_cached_stats(stats_type):
-    """从Redis获取缓存的统计数据"""
-    try:
-        redis_client = get_redis_client()
-        cache_key = f"dashboard:{stats_type}:{date.today().strftime('%Y%m%d')}"
-        cached_data = redis_client.get(cache_key)
-        
-        if cached_data:
-            cache_obj = json.loads(cached_data)
-            # 检查是否为新格式（包含cache_info）
-            if isinstance(cache_obj, dict) and 'data' in cache_obj and 'cache_info' in cache_obj:
-                return cache_obj
-            else:
-                # 兼容旧格式，直接返回数据
-                return {'data': cache_obj, 'cache_info': None}
-        return None
-    except Exception:
-        return None
+def get_cached_stats(stats_type, query, expire_seconds=60):
+    """
+    读取统计数据缓存，未命中时执行查询
+
+    缓存 expire_seconds 秒后过期，过期后 STATS_STALE_SECONDS 秒内继续返回旧值并在后台刷新；
+    同一时刻只有一个请求执行查询，缓存过期或跨日时不会有大量请求同时查询数据库。
+
+    Args:
+        stats_type (str): 统计类型
+        query (callable): 查询统计数据的函数
+        expire_seconds (int): 缓存有效期（秒）
+
+    Returns:
+        tuple: (统计数据, 缓存信息)
+    """
+    cache_key = f"dashboard:{stats_type}"
+    data, meta = get_or_refresh_cache(cache_key, query, expire_seconds, STATS_STALE_SECONDS)
+    if meta is None:
+        return data, {
+            'is_cached': False,
+            'data_source': 'database',
+            'query_time': time.time()
+        }
+
+    created_at = datetime.fromtimestamp(meta['created_at'])
+    return data, {
+        'created_at': created_at.isoformat(),
+        'expires_at': (created_at + timedelta(seconds=expire_seconds)).isoformat(),
+        'expire_seconds': expire_seconds,
+        'cache_key': cache_key,
+        'is_cached': True,
+        'is_stale': meta['is_stale'],
+        'data_source': 'cache'
+    }
 
 
 def set_cached_stats(stats_type, data, expire_seconds=60):
-    """将统计数据存入Redis缓存"""
+    """将统计数据存入缓存（用于定时任务预热）"""
     try:
-        import datetime
-        redis_client = get_redis_client()
-        cache_key = f"dashboard:{stats_type}:{date.today().strftime('%Y%m%d')}"
-        
-        # 添加缓存元数据
-        cache_data = {
-            'data': data,
-            'cache_info': {
-                'created_at': datetime.datetime.now().isoformat(),
-                'expires_at': (datetime.datetime.now() + datetime.timedelta(seconds=expire_seconds)).isoformat(),
-                'expire_seconds': expire_seconds,
-                'cache_key': cache_key
-            }
-        }
-        
-        redis_client.setex(cache_key, expire_seconds, json.dumps(cache_data))
+        set_refreshable_cache(f"dashboard:{stats_type}", data, expire_seconds, STATS_STALE_SECONDS)
         return True
     except Exception:
         return False
 
 
+# ==================== 计数器读取 ====================
+# 大屏统计优先读取增量维护的计数器（见 dashboard/counters.py），分区未就绪时回退为数据库查询
+
+# 项目完成度分类
+COMPLETION_GROUPS = {
+    'completed': ['completed', 'finished'],  # 已完成状态
+    'in_progress': ['in_progress', 'ongoing', 'active'],  # 进行中状态
+    'pending': ['pending', 'waiting', 'approved'],  # 待开始状态
+    'cancelled': ['cancelled', 'terminated', 'rejected'],  # 已取消状态
+}
+
+
+def _percentage(count, total):
+    return round((count / total * 100), 2) if total > 0 else 0
+
+
+def _counters_cache_info():
+    return {
+        'is_cached': False,
+        'data_source': 'counters',
+        'query_time': time.time()
+    }
+
+
+def _read_counters(section, reader, *args):
+    """读取计数器；分区未就绪时提交重建任务并返回 None"""
+    try:
+        result = reader(*args)
+    except Exception:
+        return None
+    if result is None:
+        dashboard_counters.request_rebuild(section)
+    return result
+
+
+def _tag_student_stats_from_counters(kind):
+    """学生标签统计（Tag1/Tag2，前5个标签）"""
+    counters = _read_counters(TAG_STUDENTS, dashboard_counters.get_tag_students, kind)
+    if counters is None:
+        return None
+    top, total_students = counters
+
+    tag_model = Tag1 if kind == 'tag1' else Tag2
+    tags = tag_model.objects.in_bulk([tag_id for tag_id, _ in top])
+    stats_data = []
+    top5_total_count = 0
+    for tag_id, student_count in top:
+        tag = tags.get(tag_id)
+        if tag is None:
+            continue
+        stats_data.append({
+            'tag_id': tag_id,
+            'tag_name': tag.value if kind == 'tag1' else tag.post,
+            'student_count': student_count,
+            'percentage': _percentage(student_count, total_students)
+        })
+        top5_total_count += student_count
+
+    other_count = total_students - top5_total_count if total_students > top5_total_count else 0
+    return {
+        'top_tags': stats_data,
+        'other': {
+            'student_count': other_count,
+            'percentage': _percentage(other_count, total_students)
+        },
+        'total_students_with_tags': total_students,
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
+def _project_status_stats_from_counters():
+    counts = _read_counters(PROJECT_STATUS, dashboard_counters.get_status_counts, PROJECT_STATUS)
+    if counts is None:
+        return None
+    counts.pop('draft', None)
+    total_projects = sum(counts.values())
+    status_choices = dict(StudentProject.STATUS_CHOICES)
+    return {
+        'status_stats': [
+            {
+                'status_code': status_code,
+                'status_name': status_choices.get(status_code, status_code),
+                'project_count': count,
+                'percentage': _percentage(count, total_projects)
+            }
+            for status_code, count in sorted(counts.items(), key=lambda item: -item[1])
+        ],
+        'total_projects': total_projects,
+        'excluded_status': 'draft',
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
+def _organization_status_stats_from_counters():
+    counts = _read_counters(ORG_STATUS, dashboard_counters.get_status_counts, ORG_STATUS)
+    if counts is None:
+        return None
+    total_organizations = sum(counts.values())
+    status_choices = dict(Organization.STATUS_CHOICES)
+    predefined_statuses = ['pending', 'under_review', 'verified', 'rejected', 'closed']
+    return {
+        'status_stats': [
+            {
+                'status_code': status_code,
+                'status_name': status_choices.get(status_code, status_code),
+                'organization_count': counts.get(status_code, 0),
+                'percentage': _percentage(counts.get(status_code, 0), total_organizations)
+            }
+            for status_code in predefined_statuses
+        ],
+        'total_organizations': total_organizations,
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
+def _project_completion_stats_from_counters():
+    counts = _read_counters(PROJECT_STATUS, dashboard_counters.get_status_counts, PROJECT_STATUS)
+    if counts is None:
+        return None
+    counts.pop('draft', None)
+    total_projects = sum(counts.values())
+
+    completion_stats = {}
+    grouped_count = 0
+    for group, statuses in COMPLETION_GROUPS.items():
+        count = sum(counts.get(status_code, 0) for status_code in statuses)
+        grouped_count += count
+        completion_stats[group] = {
+            'count': count,
+            'percentage': _percentage(count, total_projects),
+            'statuses': statuses
+        }
+    other_count = total_projects - grouped_count
+    completion_stats['other'] = {
+        'count': other_count,
+        'percentage': _percentage(other_count, total_projects)
+    }
+
+    return {
+        'completion_stats': completion_stats,
+        'summary': {
+            'total_projects': total_projects,
+            'completion_rate': completion_stats['completed']['percentage'],
+            'active_projects': sum(completion_stats[group]['count'] for group in ('completed', 'in_progress', 'pending'))
+        },
+        'excluded_status': 'draft',
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
+def _student_tag_stats_from_counters():
+    summary = _read_counters(TAG_STUDENTS, dashboard_counters.get_student_tag_summary)
+    if summary is None:
+        return None
+    total_students = summary['students']
+    with_tag1 = summary['students_with_tag1']
+    with_tag2 = summary['students_with_tag2']
+    with_both = summary['students_with_both_tags']
+    without_tags = max(total_students - (with_tag1 + with_tag2 - with_both), 0)
+    return {
+        'tag_statistics': {
+            'students_with_tag1': {'count': with_tag1, 'percentage': _percentage(with_tag1, total_students)},
+            'students_with_tag2': {'count': with_tag2, 'percentage': _percentage(with_tag2, total_students)},
+            'students_with_both_tags': {'count': with_both, 'percentage': _percentage(with_both, total_students)},
+            'students_without_tags': {'count': without_tags, 'percentage': _percentage(without_tags, total_students)}
+        },
+        'total_students': total_students,
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
+def _user_registration_stats_from_counters():
+    # 月份边界与数据库查询路径一致（timezone.now() 即 UTC）
+    now = timezone.now()
+    current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_starts = [current_month_start - relativedelta(months=i) for i in range(3, -1, -1)]
+    months = [month_start.strftime('%Y-%m') for month_start in month_starts]
+
+    counters = _read_counters(USER_REGISTRATION, dashboard_counters.get_user_registration, months)
+    if counters is None:
+        return None
+    monthly_counts, total_users = counters
+
+    # 截止到某月末的累计人数 = 总人数 - 之后各月的注册人数
+    monthly_stats = []
+    later_count = sum(monthly_counts.values())
+    for month_start, month in zip(month_starts, months):
+        later_count -= monthly_counts[month]
+        monthly_stats.append({
+            'month': month,
+            'month_display': month_start.strftime('%Y年%m月'),
+            'cumulative_count': total_users - later_count,
+            'month_new_count': monthly_counts[month],
+            'is_current_month': month_start == current_month_start
+        })
+
+    return {
+        'monthly_stats': monthly_stats,
+        'summary': {
+            'total_users': total_users,
+            'new_users_in_4_months': sum(monthly_counts.values()),
+            'stats_period': f"{month_starts[0].strftime('%Y-%m')} 至 {current_month_start.strftime('%Y-%m')}",
+            'current_time': now.strftime('%Y-%m-%d %H:%M:%S')
+        },
+        'stats_date': date.today().strftime('%Y-%m-%d'),
+        'cache_info': _counters_cache_info()
+    }
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -87,13 +296,7 @@ def get_online_count(request):
         JSON: 包含在线人数的响应
     """
     try:
-        # 连接Redis
-        redis_client = redis.Redis(
-            host=getattr(settings, 'REDIS_HOST', 'localhost'),
-            port=getattr(settings, 'REDIS_PORT', 6379),
-            db=getattr(settings, 'REDIS_DB', 0),
-            decode_responses=True
-        )
+        redis_client = get_redis_client()
         
         # 获取在线用户数量
         online_users_key = 'online_users'
@@ -125,6 +328,48 @@ def get_online_count(request):
         )
 
 
+def query_tag1_student_stats():
+    """查询Tag1学生标签统计"""
+    # 统计每个Tag1标签关联的学生数量
+    tag1_stats = Tag1.objects.select_related().annotate(
+        student_count=Count('tag1stumatch__student', distinct=True)
+    ).filter(
+        student_count__gt=0
+    ).order_by('-student_count')[:5]
+
+    # 计算总学生数（有Tag1标签的学生）
+    total_students = Tag1StuMatch.objects.values('student').distinct().count()
+
+    # 构建返回数据
+    stats_data = []
+    top5_total_count = 0
+    for tag in tag1_stats:
+        percentage = round((tag.student_count / total_students * 100), 2) if total_students > 0 else 0
+        stats_data.append({
+            'tag_id': tag.id,
+            'tag_name': tag.value,
+            'student_count': tag.student_count,
+            'percentage': percentage
+        })
+        top5_total_count += tag.student_count
+
+    # 计算其他标签的统计信息
+    other_count = total_students - top5_total_count if total_students > top5_total_count else 0
+    other_percentage = round((other_count / total_students * 100), 2) if total_students > 0 else 0
+
+    result_data = {
+        'top_tags': stats_data,
+        'other': {
+            'student_count': other_count,
+            'percentage': other_percentage
+        },
+        'total_students_with_tags': total_students,
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -136,72 +381,19 @@ def get_tag1_student_stats(request):
         JSON: 包含Tag1标签统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('tag1_students')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _tag_student_stats_from_counters('tag1')
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取Tag1学生标签统计成功（缓存）'
+                data=result_data,
+                message='获取Tag1学生标签统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 统计每个Tag1标签关联的学生数量
-        tag1_stats = Tag1.objects.select_related().annotate(
-            student_count=Count('tag1stumatch__student', distinct=True)
-        ).filter(
-            student_count__gt=0
-        ).order_by('-student_count')[:5]
-        
-        # 计算总学生数（有Tag1标签的学生）
-        total_students = Tag1StuMatch.objects.values('student').distinct().count()
-        
-        # 构建返回数据
-        stats_data = []
-        top5_total_count = 0
-        for tag in tag1_stats:
-            percentage = round((tag.student_count / total_students * 100), 2) if total_students > 0 else 0
-            stats_data.append({
-                'tag_id': tag.id,
-                'tag_name': tag.value,
-                'student_count': tag.student_count,
-                'percentage': percentage
-            })
-            top5_total_count += tag.student_count
-        
-        # 计算其他标签的统计信息
-        other_count = total_students - top5_total_count if total_students > top5_total_count else 0
-        other_percentage = round((other_count / total_students * 100), 2) if total_students > 0 else 0
-        
-        result_data = {
-            'top_tags': stats_data,
-            'other': {
-                'student_count': other_count,
-                'percentage': other_percentage
-            },
-            'total_students_with_tags': total_students,
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('tag1_students', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('tag1_students', query_tag1_student_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取Tag1学生标签统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取Tag1学生标签统计成功（缓存）' if cache_info['is_cached'] else '获取Tag1学生标签统计成功'
         )
         
     except Exception as e:
@@ -210,6 +402,48 @@ def get_tag1_student_stats(request):
         )
 
 
+def query_tag2_student_stats():
+    """查询Tag2学生标签统计"""
+    # 统计每个Tag2标签关联的学生数量
+    tag2_stats = Tag2.objects.select_related().annotate(
+        student_count=Count('tag2stumatch__student', distinct=True)
+    ).filter(
+        student_count__gt=0
+    ).order_by('-student_count')[:5]
+
+    # 计算总学生数（有Tag2标签的学生）
+    total_students = Tag2StuMatch.objects.values('student').distinct().count()
+
+    # 构建返回数据
+    stats_data = []
+    top5_total_count = 0
+    for tag in tag2_stats:
+        percentage = round((tag.student_count / total_students * 100), 2) if total_students > 0 else 0
+        stats_data.append({
+            'tag_id': tag.id,
+            'tag_name': tag.post,
+            'student_count': tag.student_count,
+            'percentage': percentage
+        })
+        top5_total_count += tag.student_count
+
+    # 计算其他标签的统计信息
+    other_count = total_students - top5_total_count if total_students > top5_total_count else 0
+    other_percentage = round((other_count / total_students * 100), 2) if total_students > 0 else 0
+
+    result_data = {
+        'top_tags': stats_data,
+        'other': {
+            'student_count': other_count,
+            'percentage': other_percentage
+        },
+        'total_students_with_tags': total_students,
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -221,72 +455,19 @@ def get_tag2_student_stats(request):
         JSON: 包含Tag2标签统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('tag2_students')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _tag_student_stats_from_counters('tag2')
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取Tag2学生标签统计成功（缓存）'
+                data=result_data,
+                message='获取Tag2学生标签统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 统计每个Tag2标签关联的学生数量
-        tag2_stats = Tag2.objects.select_related().annotate(
-            student_count=Count('tag2stumatch__student', distinct=True)
-        ).filter(
-            student_count__gt=0
-        ).order_by('-student_count')[:5]
-        
-        # 计算总学生数（有Tag2标签的学生）
-        total_students = Tag2StuMatch.objects.values('student').distinct().count()
-        
-        # 构建返回数据
-        stats_data = []
-        top5_total_count = 0
-        for tag in tag2_stats:
-            percentage = round((tag.student_count / total_students * 100), 2) if total_students > 0 else 0
-            stats_data.append({
-                'tag_id': tag.id,
-                'tag_name': tag.post,
-                'student_count': tag.student_count,
-                'percentage': percentage
-            })
-            top5_total_count += tag.student_count
-        
-        # 计算其他标签的统计信息
-        other_count = total_students - top5_total_count if total_students > top5_total_count else 0
-        other_percentage = round((other_count / total_students * 100), 2) if total_students > 0 else 0
-        
-        result_data = {
-            'top_tags': stats_data,
-            'other': {
-                'student_count': other_count,
-                'percentage': other_percentage
-            },
-            'total_students_with_tags': total_students,
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('tag2_students', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('tag2_students', query_tag2_student_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取Tag2学生标签统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取Tag2学生标签统计成功（缓存）' if cache_info['is_cached'] else '获取Tag2学生标签统计成功'
         )
         
     except Exception as e:
@@ -295,6 +476,39 @@ def get_tag2_student_stats(request):
         )
 
 
+def query_project_status_stats():
+    """查询项目状态统计"""
+    # 排除草稿状态，按状态分组统计项目数量（一条查询，总数由各状态求和）
+    status_counts = count_grouped(StudentProject.objects.exclude(status='draft'), 'status')
+
+    # 获取状态选择项的显示名称
+    status_choices = dict(StudentProject.STATUS_CHOICES)
+
+    # 计算总项目数（排除草稿）
+    total_projects = sum(status_counts.values())
+
+    # 构建返回数据
+    stats_data = []
+    for status_code, count in sorted(status_counts.items(), key=lambda item: -item[1]):
+        percentage = round((count / total_projects * 100), 2) if total_projects > 0 else 0
+
+        stats_data.append({
+            'status_code': status_code,
+            'status_name': status_choices.get(status_code, status_code),
+            'project_count': count,
+            'percentage': percentage
+        })
+
+    result_data = {
+        'status_stats': stats_data,
+        'total_projects': total_projects,
+        'excluded_status': 'draft',
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -306,69 +520,19 @@ def get_project_status_stats(request):
         JSON: 包含项目状态统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('project_status')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _project_status_stats_from_counters()
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取项目状态统计成功（缓存）'
+                data=result_data,
+                message='获取项目状态统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 排除草稿状态，统计其他状态的项目数量
-        project_stats = StudentProject.objects.select_related('requirement', 'requirement__organization').exclude(
-            status='draft'
-        ).values('status').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        # 获取状态选择项的显示名称
-        status_choices = dict(StudentProject.STATUS_CHOICES)
-        
-        # 计算总项目数（排除草稿）
-        total_projects = StudentProject.objects.exclude(status='draft').count()
-        
-        # 构建返回数据
-        stats_data = []
-        for stat in project_stats:
-            status_code = stat['status']
-            count = stat['count']
-            percentage = round((count / total_projects * 100), 2) if total_projects > 0 else 0
-            
-            stats_data.append({
-                'status_code': status_code,
-                'status_name': status_choices.get(status_code, status_code),
-                'project_count': count,
-                'percentage': percentage
-            })
-        
-        result_data = {
-            'status_stats': stats_data,
-            'total_projects': total_projects,
-            'excluded_status': 'draft',
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('project_status', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('project_status', query_project_status_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取项目状态统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取项目状态统计成功（缓存）' if cache_info['is_cached'] else '获取项目状态统计成功'
         )
         
     except Exception as e:
@@ -377,6 +541,40 @@ def get_project_status_stats(request):
         )
 
 
+def query_organization_status_stats():
+    """查询组织认证状态统计"""
+    # 获取状态选择项的显示名称
+    status_choices = dict(Organization.STATUS_CHOICES)
+
+    # 总组织数与5个预定义状态的组织数量合并为一条条件聚合查询
+    predefined_statuses = ['pending', 'under_review', 'verified', 'rejected', 'closed']
+    counts = count_buckets(Organization.objects.all(), {
+        'total': None,
+        **value_buckets('status', {status_code: status_code for status_code in predefined_statuses}),
+    })
+    total_organizations = counts['total']
+    status_stats = []
+
+    for status_code in predefined_statuses:
+        count = counts[status_code]
+        percentage = round((count / total_organizations * 100), 2) if total_organizations > 0 else 0
+
+        status_stats.append({
+            'status_code': status_code,
+            'status_name': status_choices.get(status_code, status_code),
+            'organization_count': count,
+            'percentage': percentage
+        })
+
+    result_data = {
+        'status_stats': status_stats,
+        'total_organizations': total_organizations,
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -388,62 +586,19 @@ def get_organization_status_stats(request):
         JSON: 包含组织状态统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('org_status')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _organization_status_stats_from_counters()
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取组织状态统计成功（缓存）'
+                data=result_data,
+                message='获取组织状态统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 获取状态选择项的显示名称
-        status_choices = dict(Organization.STATUS_CHOICES)
-        
-        # 计算总组织数
-        total_organizations = Organization.objects.count()
-        
-        # 统计5个预定义状态的组织数量
-        predefined_statuses = ['pending', 'under_review', 'verified', 'rejected', 'closed']
-        status_stats = []
-        
-        for status_code in predefined_statuses:
-            count = Organization.objects.filter(status=status_code).count()
-            percentage = round((count / total_organizations * 100), 2) if total_organizations > 0 else 0
-            
-            status_stats.append({
-                'status_code': status_code,
-                'status_name': status_choices.get(status_code, status_code),
-                'organization_count': count,
-                'percentage': percentage
-            })
-        
-        result_data = {
-            'status_stats': status_stats,
-            'total_organizations': total_organizations,
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('org_status', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('org_status', query_organization_status_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取组织状态统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取组织状态统计成功（缓存）' if cache_info['is_cached'] else '获取组织状态统计成功'
         )
         
     except Exception as e:
@@ -452,6 +607,50 @@ def get_organization_status_stats(request):
         )
 
 
+def query_project_tag1_stats():
+    """查询项目Tag1标签统计"""
+    # 统计每个Tag1标签关联的项目数量（通过Requirement关联）
+    tag1_stats = Tag1.objects.select_related().prefetch_related('requirement_set__student_projects').annotate(
+        project_count=Count('requirement__student_projects', distinct=True)
+    ).filter(
+        project_count__gt=0
+    ).order_by('-project_count')[:5]
+
+    # 计算总项目数（有Tag1标签的项目）
+    total_projects = StudentProject.objects.select_related('requirement').filter(
+        requirement__tag1__isnull=False
+    ).distinct().count()
+
+    # 构建返回数据
+    stats_data = []
+    top5_total_count = 0
+    for tag in tag1_stats:
+        percentage = round((tag.project_count / total_projects * 100), 2) if total_projects > 0 else 0
+        stats_data.append({
+            'tag_id': tag.id,
+            'tag_name': tag.value,
+            'project_count': tag.project_count,
+            'percentage': percentage
+        })
+        top5_total_count += tag.project_count
+
+    # 计算其他标签的统计信息
+    other_count = total_projects - top5_total_count if total_projects > top5_total_count else 0
+    other_percentage = round((other_count / total_projects * 100), 2) if total_projects > 0 else 0
+
+    result_data = {
+        'top_tags': stats_data,
+        'other': {
+            'project_count': other_count,
+            'percentage': other_percentage
+        },
+        'total_projects_with_tags': total_projects,
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -463,74 +662,11 @@ def get_project_tag1_stats(request):
         JSON: 包含项目Tag1标签统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('project_tag1')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
-            return APIResponse.success(
-                data=response_data,
-                message='获取项目Tag1标签统计成功（缓存）'
-            )
-        
-        # 缓存未命中，执行数据库查询
-        # 统计每个Tag1标签关联的项目数量（通过Requirement关联）
-        tag1_stats = Tag1.objects.select_related().prefetch_related('requirement_set__student_projects').annotate(
-            project_count=Count('requirement__student_projects', distinct=True)
-        ).filter(
-            project_count__gt=0
-        ).order_by('-project_count')[:5]
-        
-        # 计算总项目数（有Tag1标签的项目）
-        total_projects = StudentProject.objects.select_related('requirement').filter(
-            requirement__tag1__isnull=False
-        ).distinct().count()
-        
-        # 构建返回数据
-        stats_data = []
-        top5_total_count = 0
-        for tag in tag1_stats:
-            percentage = round((tag.project_count / total_projects * 100), 2) if total_projects > 0 else 0
-            stats_data.append({
-                'tag_id': tag.id,
-                'tag_name': tag.value,
-                'project_count': tag.project_count,
-                'percentage': percentage
-            })
-            top5_total_count += tag.project_count
-        
-        # 计算其他标签的统计信息
-        other_count = total_projects - top5_total_count if total_projects > top5_total_count else 0
-        other_percentage = round((other_count / total_projects * 100), 2) if total_projects > 0 else 0
-        
-        result_data = {
-            'top_tags': stats_data,
-            'other': {
-                'project_count': other_count,
-                'percentage': other_percentage
-            },
-            'total_projects_with_tags': total_projects,
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('project_tag1', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('project_tag1', query_project_tag1_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取项目Tag1标签统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取项目Tag1标签统计成功（缓存）' if cache_info['is_cached'] else '获取项目Tag1标签统计成功'
         )
         
     except Exception as e:
@@ -539,6 +675,56 @@ def get_project_tag1_stats(request):
         )
 
 
+def query_user_registration_stats():
+    """查询平台总注册人数随时间变化统计"""
+    # 获取当前时间（使用Django时区设置）
+    now = timezone.now()
+    current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    # 前4个月（从3个月前到当前月）的开始时间
+    month_starts = [current_month_start - relativedelta(months=i) for i in range(3, -1, -1)]
+    three_months_ago = month_starts[0]
+
+    # 每月新增（当前月截止到现在）、每月末累计、总注册人数与4个月内新增合并为一条条件聚合查询
+    now_end = now + timedelta(microseconds=1)
+    month_ends = [month_start + relativedelta(months=1) for month_start in month_starts[:-1]] + [now_end]
+    ranges = {}
+    for i, (month_start, month_end) in enumerate(zip(month_starts, month_ends)):
+        ranges[f'new_{i}'] = (month_start, month_end)
+        ranges[f'cumulative_{i}'] = (None, month_end)
+    counts = count_buckets(User.objects.all(), {
+        **range_buckets('date_joined', ranges),
+        'total': None,
+        'new_in_period': Q(date_joined__gte=three_months_ago),
+    })
+
+    monthly_stats = []
+    for i, month_start in enumerate(month_starts):
+        monthly_stats.append({
+            'month': month_start.strftime('%Y-%m'),
+            'month_display': month_start.strftime('%Y年%m月'),
+            'cumulative_count': counts[f'cumulative_{i}'],
+            'month_new_count': counts[f'new_{i}'],
+            'is_current_month': month_start == current_month_start
+        })
+
+    total_users = counts['total']
+    new_users_in_period = counts['new_in_period']
+
+    result_data = {
+        'monthly_stats': monthly_stats,
+        'summary': {
+            'total_users': total_users,
+            'new_users_in_4_months': new_users_in_period,
+            'stats_period': f"{three_months_ago.strftime('%Y-%m')} 至 {current_month_start.strftime('%Y-%m')}",
+            'current_time': now.strftime('%Y-%m-%d %H:%M:%S')
+        },
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -550,100 +736,19 @@ def get_user_registration_stats(request):
         JSON: 包含注册人数统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('user_registration')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _user_registration_stats_from_counters()
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取注册人数统计成功（缓存）'
+                data=result_data,
+                message='获取注册人数统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 获取当前时间（使用Django时区设置）
-        now = timezone.now()
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # 计算前4个月的数据
-        monthly_stats = []
-        
-        for i in range(3, -1, -1):  # 从3个月前到当前月
-            # 计算目标月份的开始时间
-            target_month = current_month_start - relativedelta(months=i)
-            
-            # 计算截止到该月末的累计注册人数
-            if i == 0:  # 当前月，截止到现在
-                end_time = now
-            else:
-                # 其他月份，截止到该月末
-                next_month = target_month + relativedelta(months=1)
-                end_time = next_month - timedelta(seconds=1)
-            
-            # 查询截止到该时间点的累计注册人数
-            cumulative_count = User.objects.filter(
-                date_joined__lte=end_time
-            ).count()
-            
-            # 查询该月新增注册人数
-            if i == 0:  # 当前月
-                month_new_count = User.objects.filter(
-                    date_joined__gte=target_month,
-                    date_joined__lte=now
-                ).count()
-            else:
-                next_month_start = target_month + relativedelta(months=1)
-                month_new_count = User.objects.filter(
-                    date_joined__gte=target_month,
-                    date_joined__lt=next_month_start
-                ).count()
-            
-            monthly_stats.append({
-                'month': target_month.strftime('%Y-%m'),
-                'month_display': target_month.strftime('%Y年%m月'),
-                'cumulative_count': cumulative_count,
-                'month_new_count': month_new_count,
-                'is_current_month': i == 0
-            })
-        
-        # 计算总注册人数
-        total_users = User.objects.count()
-        
-        # 计算4个月内新增用户数
-        three_months_ago = current_month_start - relativedelta(months=3)
-        new_users_in_period = User.objects.filter(
-            date_joined__gte=three_months_ago
-        ).count()
-        
-        result_data = {
-            'monthly_stats': monthly_stats,
-            'summary': {
-                'total_users': total_users,
-                'new_users_in_4_months': new_users_in_period,
-                'stats_period': f"{three_months_ago.strftime('%Y-%m')} 至 {current_month_start.strftime('%Y-%m')}",
-                'current_time': now.strftime('%Y-%m-%d %H:%M:%S')
-            },
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存（缓存1小时）
-        set_cached_stats('user_registration', result_data, expire_seconds=60)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('user_registration', query_user_registration_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取注册人数统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取注册人数统计成功（缓存）' if cache_info['is_cached'] else '获取注册人数统计成功'
         )
         
     except Exception as e:
@@ -652,6 +757,58 @@ def get_user_registration_stats(request):
         )
 
 
+def query_student_tag_stats():
+    """查询学生标签统计"""
+    from user.models import Student
+
+    # 有Tag1/Tag2标签、同时有两类标签、没有任何标签的学生数与总学生数合并为一条条件聚合查询
+    has_tag1 = Exists(Tag1StuMatch.objects.filter(student=OuterRef('pk')))
+    has_tag2 = Exists(Tag2StuMatch.objects.filter(student=OuterRef('pk')))
+    counts = count_buckets(Student.objects.all(), {
+        'with_tag1': Q(has_tag1),
+        'with_tag2': Q(has_tag2),
+        'with_both_tags': Q(has_tag1) & Q(has_tag2),
+        'without_tags': ~Q(has_tag1) & ~Q(has_tag2),
+        'total': None,
+    })
+    students_with_tag1 = counts['with_tag1']
+    students_with_tag2 = counts['with_tag2']
+    students_with_both_tags = counts['with_both_tags']
+    students_without_tags = counts['without_tags']
+    total_students = counts['total']
+
+    # 计算百分比
+    tag1_percentage = round((students_with_tag1 / total_students * 100), 2) if total_students > 0 else 0
+    tag2_percentage = round((students_with_tag2 / total_students * 100), 2) if total_students > 0 else 0
+    both_tags_percentage = round((students_with_both_tags / total_students * 100), 2) if total_students > 0 else 0
+    no_tags_percentage = round((students_without_tags / total_students * 100), 2) if total_students > 0 else 0
+
+    result_data = {
+        'tag_statistics': {
+            'students_with_tag1': {
+                'count': students_with_tag1,
+                'percentage': tag1_percentage
+            },
+            'students_with_tag2': {
+                'count': students_with_tag2,
+                'percentage': tag2_percentage
+            },
+            'students_with_both_tags': {
+                'count': students_with_both_tags,
+                'percentage': both_tags_percentage
+            },
+            'students_without_tags': {
+                'count': students_without_tags,
+                'percentage': no_tags_percentage
+            }
+        },
+        'total_students': total_students,
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -663,91 +820,19 @@ def get_student_tag_stats(request):
         JSON: 包含学生标签统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('student_tag_stats')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _student_tag_stats_from_counters()
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取学生标签统计成功（缓存）'
+                data=result_data,
+                message='获取学生标签统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        from user.models import Student
-        
-        # 统计有Tag1标签的学生数
-        students_with_tag1 = Student.objects.filter(
-            tag1stumatch__isnull=False
-        ).distinct().count()
-        
-        # 统计有Tag2标签的学生数
-        students_with_tag2 = Student.objects.filter(
-            tag2stumatch__isnull=False
-        ).distinct().count()
-        
-        # 统计同时有Tag1和Tag2标签的学生数
-        students_with_both_tags = Student.objects.filter(
-            tag1stumatch__isnull=False,
-            tag2stumatch__isnull=False
-        ).distinct().count()
-        
-        # 统计没有任何标签的学生数
-        students_without_tags = Student.objects.filter(
-            tag1stumatch__isnull=True,
-            tag2stumatch__isnull=True
-        ).count()
-        
-        # 统计总学生数
-        total_students = Student.objects.count()
-        
-        # 计算百分比
-        tag1_percentage = round((students_with_tag1 / total_students * 100), 2) if total_students > 0 else 0
-        tag2_percentage = round((students_with_tag2 / total_students * 100), 2) if total_students > 0 else 0
-        both_tags_percentage = round((students_with_both_tags / total_students * 100), 2) if total_students > 0 else 0
-        no_tags_percentage = round((students_without_tags / total_students * 100), 2) if total_students > 0 else 0
-        
-        result_data = {
-            'tag_statistics': {
-                'students_with_tag1': {
-                    'count': students_with_tag1,
-                    'percentage': tag1_percentage
-                },
-                'students_with_tag2': {
-                    'count': students_with_tag2,
-                    'percentage': tag2_percentage
-                },
-                'students_with_both_tags': {
-                    'count': students_with_both_tags,
-                    'percentage': both_tags_percentage
-                },
-                'students_without_tags': {
-                    'count': students_without_tags,
-                    'percentage': no_tags_percentage
-                }
-            },
-            'total_students': total_students,
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('student_tag_stats', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('student_tag_stats', query_student_tag_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取学生标签统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取学生标签统计成功（缓存）' if cache_info['is_cached'] else '获取学生标签统计成功'
         )
         
     except Exception as e:
@@ -756,6 +841,77 @@ def get_student_tag_stats(request):
         )
 
 
+def query_project_completion_stats():
+    """查询项目完成度统计"""
+    # 完成度分类
+    completed_statuses = COMPLETION_GROUPS['completed']
+    in_progress_statuses = COMPLETION_GROUPS['in_progress']
+    pending_statuses = COMPLETION_GROUPS['pending']
+    cancelled_statuses = COMPLETION_GROUPS['cancelled']
+
+    # 各类状态的项目数与总项目数（排除草稿）合并为一条条件聚合查询
+    counts = count_buckets(StudentProject.objects.exclude(status='draft'), {
+        'total': None,
+        **value_buckets('status', COMPLETION_GROUPS),
+    })
+    completed_count = counts['completed']
+    in_progress_count = counts['in_progress']
+    pending_count = counts['pending']
+    cancelled_count = counts['cancelled']
+
+    # 其他状态的项目数（排除草稿）
+    total_projects = counts['total']
+    other_count = total_projects - completed_count - in_progress_count - pending_count - cancelled_count
+
+    # 计算百分比
+    completed_percentage = round((completed_count / total_projects * 100), 2) if total_projects > 0 else 0
+    in_progress_percentage = round((in_progress_count / total_projects * 100), 2) if total_projects > 0 else 0
+    pending_percentage = round((pending_count / total_projects * 100), 2) if total_projects > 0 else 0
+    cancelled_percentage = round((cancelled_count / total_projects * 100), 2) if total_projects > 0 else 0
+    other_percentage = round((other_count / total_projects * 100), 2) if total_projects > 0 else 0
+
+    # 计算完成率（已完成项目占总项目的比例）
+    completion_rate = completed_percentage
+
+    result_data = {
+        'completion_stats': {
+            'completed': {
+                'count': completed_count,
+                'percentage': completed_percentage,
+                'statuses': completed_statuses
+            },
+            'in_progress': {
+                'count': in_progress_count,
+                'percentage': in_progress_percentage,
+                'statuses': in_progress_statuses
+            },
+            'pending': {
+                'count': pending_count,
+                'percentage': pending_percentage,
+                'statuses': pending_statuses
+            },
+            'cancelled': {
+                'count': cancelled_count,
+                'percentage': cancelled_percentage,
+                'statuses': cancelled_statuses
+            },
+            'other': {
+                'count': other_count,
+                'percentage': other_percentage
+            }
+        },
+        'summary': {
+            'total_projects': total_projects,
+            'completion_rate': completion_rate,
+            'active_projects': completed_count + in_progress_count + pending_count
+        },
+        'excluded_status': 'draft',
+        'stats_date': date.today().strftime('%Y-%m-%d')
+    }
+
+    return result_data
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
@@ -767,116 +923,19 @@ def get_project_completion_stats(request):
         JSON: 包含项目完成度统计数据的响应
     """
     try:
-        # 尝试从缓存获取数据
-        cached_result = get_cached_stats('project_completion')
-        if cached_result:
-            # 构建返回数据，包含缓存信息
-            response_data = cached_result['data'].copy()
-            if cached_result['cache_info']:
-                response_data['cache_info'] = cached_result['cache_info']
-                response_data['cache_info']['is_cached'] = True
-                response_data['cache_info']['data_source'] = 'cache'
-            
+        # 优先读取增量维护的计数器
+        result_data = _project_completion_stats_from_counters()
+        if result_data is not None:
             return APIResponse.success(
-                data=response_data,
-                message='获取项目完成度统计成功（缓存）'
+                data=result_data,
+                message='获取项目完成度统计成功'
             )
-        
-        # 缓存未命中，执行数据库查询
-        # 定义完成度分类
-        completed_statuses = ['completed', 'finished']  # 已完成状态
-        in_progress_statuses = ['in_progress', 'ongoing', 'active']  # 进行中状态
-        pending_statuses = ['pending', 'waiting', 'approved']  # 待开始状态
-        cancelled_statuses = ['cancelled', 'terminated', 'rejected']  # 已取消状态
-        
-        # 统计各类状态的项目数
-        completed_count = StudentProject.objects.filter(
-            status__in=completed_statuses
-        ).count()
-        
-        in_progress_count = StudentProject.objects.filter(
-            status__in=in_progress_statuses
-        ).count()
-        
-        pending_count = StudentProject.objects.filter(
-            status__in=pending_statuses
-        ).count()
-        
-        cancelled_count = StudentProject.objects.filter(
-            status__in=cancelled_statuses
-        ).count()
-        
-        # 统计其他状态的项目数（排除草稿）
-        other_count = StudentProject.objects.exclude(
-            Q(status__in=completed_statuses) |
-            Q(status__in=in_progress_statuses) |
-            Q(status__in=pending_statuses) |
-            Q(status__in=cancelled_statuses) |
-            Q(status='draft')
-        ).count()
-        
-        # 计算总项目数（排除草稿）
-        total_projects = StudentProject.objects.exclude(status='draft').count()
-        
-        # 计算百分比
-        completed_percentage = round((completed_count / total_projects * 100), 2) if total_projects > 0 else 0
-        in_progress_percentage = round((in_progress_count / total_projects * 100), 2) if total_projects > 0 else 0
-        pending_percentage = round((pending_count / total_projects * 100), 2) if total_projects > 0 else 0
-        cancelled_percentage = round((cancelled_count / total_projects * 100), 2) if total_projects > 0 else 0
-        other_percentage = round((other_count / total_projects * 100), 2) if total_projects > 0 else 0
-        
-        # 计算完成率（已完成项目占总项目的比例）
-        completion_rate = completed_percentage
-        
-        result_data = {
-            'completion_stats': {
-                'completed': {
-                    'count': completed_count,
-                    'percentage': completed_percentage,
-                    'statuses': completed_statuses
-                },
-                'in_progress': {
-                    'count': in_progress_count,
-                    'percentage': in_progress_percentage,
-                    'statuses': in_progress_statuses
-                },
-                'pending': {
-                    'count': pending_count,
-                    'percentage': pending_percentage,
-                    'statuses': pending_statuses
-                },
-                'cancelled': {
-                    'count': cancelled_count,
-                    'percentage': cancelled_percentage,
-                    'statuses': cancelled_statuses
-                },
-                'other': {
-                    'count': other_count,
-                    'percentage': other_percentage
-                }
-            },
-            'summary': {
-                'total_projects': total_projects,
-                'completion_rate': completion_rate,
-                'active_projects': completed_count + in_progress_count + pending_count
-            },
-            'excluded_status': 'draft',
-            'stats_date': date.today().strftime('%Y-%m-%d')
-        }
-        
-        # 将结果存入缓存
-        set_cached_stats('project_completion', result_data)
-        
-        # 为实时查询的数据添加缓存信息标识
-        result_data['cache_info'] = {
-            'is_cached': False,
-            'data_source': 'database',
-            'query_time': time.time()
-        }
-        
+
+        # 读取缓存（过期后由单个请求刷新，其余请求返回旧值）
+        result_data, cache_info = get_cached_stats('project_completion', query_project_completion_stats)
         return APIResponse.success(
-            data=result_data,
-            message='获取项目完成度统计成功'
+            data=dict(result_data, cache_info=cache_info),
+            message='获取项目完成度统计成功（缓存）' if cache_info['is_cached'] else '获取项目完成度统计成功'
         )
         
     except Exception as e:
@@ -934,7 +993,7 @@ def get_top_tags_by_frequency(request):
     try:
         # 查询Tag1表，按frequency降序排列，取前15个
         # 注意：frequency字段是CharField，需要转换为数值进行排序
-        from django.db.models import Case, When, IntegerField
+        from django.db.models import IntegerField
         from django.db.models.functions import Cast
         
         top_tags = Tag1.objects.exclude(
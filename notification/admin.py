@@ -15,6 +15,7 @@ from .models import (
     NotificationLog
 )
 from .services import notification_service
+from common_utils import bump_model_versions
 
 User = get_user_model()
 
@@ -210,6 +211,7 @@ class NotificationAdmin(admin.ModelAdmin):
             is_read=True,
             read_at=timezone.now()
         )
+        bump_model_versions(queryset.model)
         self.message_user(request, f'已标记 {updated} 条通知为已读')
     mark_as_read.short_description = '标记为已读'
     
@@ -219,6 +221,7 @@ class NotificationAdmin(admin.ModelAdmin):
             is_read=False,
             read_at=None
         )
+        bump_model_versions(queryset.model)
         self.message_user(request, f'已标记 {updated} 条通知为未读')
     mark_as_unread.short_description = '标记为未读'
     
@@ -1,13 +1,12 @@
 import json
 import logging
-import redis.asyncio as redis
 import time
 import asyncio
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
-from django.conf import settings
+from common_utils import get_async_redis_client
 from .models import Notification
 from .serializers import NotificationSerializer
 
@@ -20,16 +19,9 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # 初始化Redis连接
+        # 使用进程内共享的异步Redis客户端（同一事件循环的连接共用一个连接池）
         try:
-            self.redis_client = redis.Redis(
-                host=getattr(settings, 'REDIS_HOST', 'localhost'),
-                port=getattr(settings, 'REDIS_PORT', 6379),
-                db=getattr(settings, 'REDIS_DB', 0),
-                decode_responses=True,
-                socket_timeout=5,
-                socket_connect_timeout=5
-            )
+            self.redis_client = get_async_redis_client()
         except Exception as e:
             logger.error(f"Redis连接失败: {str(e)}")
             self.redis_client = None
@@ -110,13 +102,6 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await asyncio.wait_for(self.remove_user_from_online_set(), timeout=2.0)
         except Exception as e:
             logger.error(f"移除在线用户失败: {str(e)}")
-            
-        # 关闭Redis连接
-        if self.redis_client:
-            try:
-                await self.redis_client.aclose()
-            except Exception as e:
-                logger.error(f"关闭Redis连接失败: {str(e)}")
         
         logger.info(f"用户 {self.user.id if hasattr(self, 'user') else 'Unknown'} 断开通知WebSocket连接, code: {close_code}")
 
@@ -12,6 +12,7 @@ from studentproject.models import StudentProject
 
 from .services import org_notification_service, NotificationService, notification_service, student_notification_service
 from .models import Notification, NotificationLog
+from common_utils import bump_model_versions
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -114,6 +115,7 @@ def auto_complete_expired_requirements():
             
             # 批量更新状态
             updated_count = expired_requirements.update(status='completed')
+            bump_model_versions(Requirement)
             
             # 记录更新的需求信息
             for req_info in requirement_info:
@@ -32,7 +32,7 @@ from .serializers import (
 )
 from .services import notification_service, org_notification_service
 from .filters import NotificationFilter
-from common_utils import CustomPaginator, APIResponse
+from common_utils import CustomPaginator, APIResponse, build_paginator, bump_model_versions
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -70,19 +70,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
             # 获取过滤后的查询集
             queryset = self.filter_queryset(self.get_queryset())
             
-            # 获取分页参数
-            try:
-                page = int(request.GET.get('page', 1))
-            except (ValueError, TypeError):
-                page = 1
-            
-            try:
-                page_size = int(request.GET.get('page_size', 20))
-            except (ValueError, TypeError):
-                page_size = 20
-            
-            # 使用自定义分页器
-            paginator = CustomPaginator(queryset, page, page_size)
+            # 使用自定义分页器（支持游标分页，深页不再使用 OFFSET）
+            paginator = build_paginator(request, queryset, default_page_size=20, allow_cursor=True)
             page_data = paginator.get_page_data()
             
             # 序列化数据
@@ -149,6 +138,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
                 is_read=True,
                 read_at=timezone.now()
             )
+            bump_model_versions(Notification)
             return APIResponse.success(
                 data={'updated_count': updated_count},
                 message=f"已标记 {updated_count} 条通知为已读"
@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django.db.models import Q
 
-from .models import Organization, OrganizationOperationLog, OrganizationConfig, OrganizationJoinApplication
+from .models import Organization, OrganizationOperationLog, OrganizationConfig, OrganizationJoinApplication, University
 from user.models import OrganizationUser
 from .serializers import (
     OrganizationSerializer, OrganizationMemberSerializer, OrganizationMemberUpdateSerializer,
@@ -23,7 +23,7 @@ from .utils import (
     validate_organization_member_update
 )
 from user.utils import get_organization_user_role
-from common_utils import APIResponse, format_validation_errors, build_media_url, build_media_urls_list
+from common_utils import APIResponse, format_validation_errors, build_media_url, build_media_urls_list, cache_response
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +73,7 @@ def search_organizations(request):
         queryset = queryset.order_by('id')
         
         # 使用分页功能
-        paginated_data = paginate_queryset(request, queryset, default_page_size=20)
+        paginated_data = paginate_queryset(request, queryset, default_page_size=20, allow_cursor=True)
         page_data = paginated_data['page_data']
         pagination_info = paginated_data['pagination_info']
         
@@ -1044,10 +1044,10 @@ def submit_verification_materials_with_images(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @authentication_classes([])
+@cache_response([University])
 def university_list(request):
     """获取高校列表接口（支持搜索和分页）"""
     try:
-        from .models import University
         from common_utils import paginate_queryset
         
         # 获取搜索参数
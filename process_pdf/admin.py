@@ -1,3 +1,12 @@
 from django.contrib import admin
+from .models import PdfIngestionJob
 
-# Register your models here.
+
+@admin.register(PdfIngestionJob)
+class PdfIngestionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'requirement', 'file', 'status', 'progress', 'total_chunks', 'processed_chunks', 'attempts', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['id', 'requirement__title', 'file__name']
+    readonly_fields = ['id', 'created_at', 'updated_at', 'finished_at']
+    exclude = ['chunks']
+    ordering = ['-created_at']
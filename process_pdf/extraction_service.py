@@ -0,0 +1,294 @@
+# process_pdf/extraction_service.py
+import os
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 进程池大小（PyMuPDF 解析为 CPU 密集型且持有 GIL，使用多进程而非多线程）
+EXTRACTION_MAX_WORKERS = getattr(settings, 'DOC_EXTRACTION_MAX_WORKERS', min(4, os.cpu_count() or 1))
+# 超过该页数的 PDF 按页段拆分到多个进程
+LARGE_PDF_PAGE_THRESHOLD = getattr(settings, 'DOC_EXTRACTION_LARGE_PDF_PAGES', 64)
+# 每个进程任务处理的页数
+PAGES_PER_TASK = getattr(settings, 'DOC_EXTRACTION_PAGES_PER_TASK', 32)
+
+
+# ========== 子进程执行的函数（必须为模块级函数以便 pickle） ==========
+def _extract_pdf_page_range(pdf_path, start, end):
+    """
+    提取PDF指定页段的文本
+
+    Args:
+        pdf_path (str): PDF文件路径
+        start (int): 起始页（包含）
+        end (int): 结束页（不包含）
+
+    Returns:
+        list: 每页文本组成的列表
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        end = min(end, doc.page_count)
+        return [doc.load_page(i).get_text() for i in range(start, end)]
+
+
+def _extract_docx(file_path):
+    """提取 .docx/.doc 文本，失败时按纯文本读取"""
+    try:
+        import docx  # python-docx
+        document = docx.Document(file_path)
+        return "\n".join(p.text for p in document.paragraphs)
+    except Exception:
+        # 注意: .doc 旧版二进制格式 python-docx 不支持，兜底按文本读取
+        logger.warning(f"Failed to read {file_path} with python-docx, trying text fallback")
+        return _extract_plain(file_path)
+
+
+def _extract_plain(file_path):
+    """按文本读取 (txt, md 等)"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _extract_file(file_path):
+    """
+    根据扩展名提取单个文件的全部文本（在子进程中执行）
+
+    Args:
+        file_path (str): 文件路径
+
+    Returns:
+        str: 文本内容
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.pdf':
+        import fitz  # PyMuPDF
+        with fitz.open(file_path) as doc:
+            return "\n".join(page.get_text() for page in doc)
+    if ext in ['.docx', '.doc']:
+        return _extract_docx(file_path)
+    return _extract_plain(file_path)
+
+
+def _is_daemonic_process():
+    """当前进程是否为守护进程（Celery prefork 子进程由 billiard 创建，两处标记都需检查）"""
+    if multiprocessing.current_process().daemon:
+        return True
+    try:
+        from billiard.process import current_process
+    except ImportError:
+        return False
+    return bool(current_process().daemon)
+
+
+class _BilliardFuture:
+    """billiard AsyncResult 的 Future 适配"""
+
+    def __init__(self, async_result):
+        self._async_result = async_result
+
+    def result(self, timeout=None):
+        return self._async_result.get(timeout)
+
+    def cancel(self):
+        # 已提交的任务无法撤回，结果直接丢弃
+        return False
+
+
+class _BilliardExecutor:
+    """
+    billiard 进程池的 Executor 适配
+
+    multiprocessing 禁止守护进程创建子进程，ProcessPoolExecutor 无法在 Celery prefork 子进程中使用；
+    billiard（Celery 自带）没有该限制
+    """
+
+    def __init__(self, max_workers):
+        from billiard.pool import Pool
+
+        self._pool = Pool(processes=max_workers)
+
+    def submit(self, fn, *args):
+        return _BilliardFuture(self._pool.apply_async(fn, args))
+
+    def shutdown(self, wait=True):
+        if wait:
+            self._pool.close()
+            self._pool.join()
+        else:
+            self._pool.terminate()
+
+
+class DocumentExtractionService:
+    """
+    文档文本提取服务
+
+    - 多个文件在有界进程池中并行提取，避免单个 Celery worker 被 PyMuPDF 长时间占用
+    - 超大 PDF 按页段拆分到多个进程，并以生成器逐页返回，内存占用受在途任务数约束
+    - 守护进程（如 Celery prefork 子进程）中使用 billiard 进程池，其他进程使用 ProcessPoolExecutor；
+      进程池不可用时降级为当前进程内串行提取
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max(1, int(max_workers or EXTRACTION_MAX_WORKERS))
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    # ---------- 进程池管理 ----------
+    def _create_executor(self):
+        if _is_daemonic_process():
+            return _BilliardExecutor(self.max_workers)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _get_executor(self):
+        """按需创建进程池（进程级单例，fork 出的子进程不复用父进程的进程池）"""
+        if self.max_workers <= 1:
+            return None
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    try:
+                        self._executor = self._create_executor()
+                        self._executor_pid = os.getpid()
+                        logger.info(
+                            f"[Extraction] 进程池已创建，workers={self.max_workers}, "
+                            f"type={type(self._executor).__name__}"
+                        )
+                    except Exception as e:
+                        logger.warning(f"[Extraction] 创建进程池失败，降级为串行提取: {e}")
+                        self._executor = None
+                        return None
+        return self._executor
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_pid = None
+
+    # ---------- PDF 逐页提取 ----------
+    @staticmethod
+    def get_pdf_page_count(pdf_path):
+        import fitz  # PyMuPDF
+
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+
+    def iter_pdf_pages(self, pdf_path):
+        """
+        逐页提取PDF文本（生成器，按页序返回）
+
+        小文件在当前进程内逐页读取；超过 LARGE_PDF_PAGE_THRESHOLD 页的文件
+        按 PAGES_PER_TASK 拆分页段提交到进程池，最多保持 2 * max_workers 个页段在途。
+
+        Args:
+            pdf_path (str): PDF文件路径
+
+        Yields:
+            str: 单页文本
+        """
+        page_count = self.get_pdf_page_count(pdf_path)
+        executor = self._get_executor() if page_count > LARGE_PDF_PAGE_THRESHOLD else None
+
+        if executor is None:
+            for start in range(0, page_count, PAGES_PER_TASK):
+                yield from _extract_pdf_page_range(pdf_path, start, start + PAGES_PER_TASK)
+            return
+
+        ranges = deque((start, start + PAGES_PER_TASK) for start in range(0, page_count, PAGES_PER_TASK))
+        in_flight = deque()
+        window = self.max_workers * 2
+        try:
+            while ranges or in_flight:
+                while ranges and len(in_flight) < window:
+                    start, end = ranges.popleft()
+                    in_flight.append(executor.submit(_extract_pdf_page_range, pdf_path, start, end))
+                yield from in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    # ---------- 文件级提取 ----------
+    def extract_text(self, file_path):
+        """
+        提取单个文件文本
+
+        Args:
+            file_path (str): 文件路径
+
+        Returns:
+            str: 文本内容，文件不存在或提取失败时返回空字符串
+        """
+        if not os.path.exists(file_path):
+            return ""
+        try:
+            if os.path.splitext(file_path)[1].lower() == '.pdf':
+                return "\n".join(self.iter_pdf_pages(file_path))
+            return _extract_file(file_path)
+        except Exception as e:
+            logger.error(f"Error extracting text from {file_path}: {e}")
+            return ""
+
+    def extract_texts(self, file_paths):
+        """
+        并行提取多个文件文本
+
+        Args:
+            file_paths (list): 文件路径列表
+
+        Returns:
+            dict: {file_path: text}，提取失败的文件对应空字符串
+        """
+        results = {}
+        existing = []
+        for path in file_paths:
+            if os.path.exists(path):
+                existing.append(path)
+            else:
+                results[path] = ""
+
+        executor = self._get_executor() if len(existing) > 1 else None
+        if executor is None:
+            for path in existing:
+                results[path] = self.extract_text(path)
+            return results
+
+        futures = {}
+        for path in existing:
+            # 超大 PDF 自身会拆分页段并行，不再整文件提交，避免单进程长时间占用
+            try:
+                is_large_pdf = (
+                    os.path.splitext(path)[1].lower() == '.pdf'
+                    and self.get_pdf_page_count(path) > LARGE_PDF_PAGE_THRESHOLD
+                )
+            except Exception as e:
+                logger.error(f"Error extracting text from {path}: {e}")
+                results[path] = ""
+                continue
+            if is_large_pdf:
+                results[path] = None
+            else:
+                futures[path] = executor.submit(_extract_file, path)
+
+        for path in existing:
+            if path in futures:
+                try:
+                    results[path] = futures[path].result()
+                except Exception as e:
+                    logger.error(f"Error extracting text from {path}: {e}")
+                    results[path] = ""
+            elif results.get(path) is None:
+                results[path] = self.extract_text(path)
+        return results
+
+
+# 全局实例（进程池按需创建，不会在导入时启动子进程）
+extraction_service = DocumentExtractionService()
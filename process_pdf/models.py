@@ -1,3 +1,81 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class PdfIngestionJob(models.Model):
+    """PDF入库任务 - 记录异步处理流水线（提取 → 切块 → 向量化 → 写入Milvus）的进度"""
+
+    STATUS_CHOICES = [
+        ('pending', '排队中'),
+        ('extracting', '提取文本'),
+        ('chunking', '文本切块'),
+        ('embedding', '向量化写入'),
+        ('completed', '已完成'),
+        ('failed', '失败'),
+    ]
+    ACTIVE_STATUSES = ('pending', 'extracting', 'chunking', 'embedding')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False, verbose_name='任务ID')
+    requirement = models.ForeignKey(
+        'project.Requirement',
+        on_delete=models.CASCADE,
+        related_name='pdf_ingestion_jobs',
+        verbose_name='需求'
+    )
+    file = models.ForeignKey(
+        'project.File',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pdf_ingestion_jobs',
+        verbose_name='文件'
+    )
+    file_path = models.CharField(max_length=500, verbose_name='文件绝对路径')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='状态')
+    failed_stage = models.CharField(max_length=20, blank=True, default='', verbose_name='失败阶段')
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name='进度(%)')
+    chunks = models.JSONField(default=list, blank=True, verbose_name='文本切块',
+                              help_text='切块结果，向量化阶段失败后可从断点继续')
+    total_chunks = models.PositiveIntegerField(default=0, verbose_name='切块总数')
+    processed_chunks = models.PositiveIntegerField(default=0, verbose_name='已写入切块数')
+    error = models.TextField(blank=True, default='', verbose_name='错误信息')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='执行次数')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='完成时间')
+
+    class Meta:
+        db_table = 'pdf_ingestion_job'
+        verbose_name = 'PDF入库任务'
+        verbose_name_plural = 'PDF入库任务'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requirement', 'created_at'], name='pdf_job_req_created_idx'),
+            models.Index(fields=['status', 'updated_at'], name='pdf_job_status_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"PDF入库任务:{self.id} - 需求{self.requirement_id} - {self.get_status_display()}"
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+    def to_status_dict(self):
+        """任务状态响应数据（供轮询接口使用）"""
+        return {
+            "job_id": str(self.id),
+            "pid": self.requirement_id,
+            "file_id": self.file_id,
+            "status": self.status,
+            "stage": self.failed_stage if self.status == 'failed' else self.status,
+            "progress": self.progress,
+            "chunks": self.total_chunks,
+            "processed_chunks": self.processed_chunks,
+            "error": self.error or None,
+            "resumable": self.status == 'failed',
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,15 +1,14 @@
-import fitz  # PyMuPDF
 import re
 import requests
 import json
-from pymilvus import connections, Collection, utility
 from django.conf import settings
 from django.core.cache import cache
 import logging
 import hashlib
 import os
 from read_search.embedding_service import EmbeddingService
-from read_search.milvus_manager import milvus_manager
+from project.vector_store import get_vector_store
+from .extraction_service import extraction_service
 
 # 获取logger
 logger = logging.getLogger(__name__)
@@ -38,11 +37,8 @@ def extract_and_clean_pdf_text(pdf_path):
         Exception: PDF文件读取失败时抛出异常
     """
     try:
-        doc = fitz.open(pdf_path)
-        full_text = ""
-        for page in doc:
-            full_text += page.get_text()
-        doc.close()
+        # 超大 PDF 由进程池按页段并行解析，逐页拼接避免重复的字符串拷贝
+        full_text = "".join(extraction_service.iter_pdf_pages(pdf_path))
         
         cleaned_text = re.sub(r'[ \t]+', ' ', full_text)
         logger.info(f"[PDF] 成功提取PDF文本，共 {len(cleaned_text)} 字符")
@@ -68,23 +64,30 @@ def get_embeddings(texts):
         
 # ========== 插入 Milvus ==========
 def insert_into_milvus(chunks, pid):
-    # 使用MilvusManager获取collection
-    collection = milvus_manager.get_collection(load=False)
+    store = get_vector_store()
+    if not store.has_collection(COLLECTION_NAME):
+        logger.error(f"[Milvus] 未找到集合: {COLLECTION_NAME}")
+        raise ValueError(f"Collection '{COLLECTION_NAME}' 不存在，请先创建")
+    collection = store.collection(COLLECTION_NAME)
 
     try:
-        collection.delete(f"Pid == {pid}")
+        collection.delete([pid])
         logger.info(f"[Milvus] 删除旧数据，Pid={pid}")
     except Exception as e:
         logger.error(f"[Milvus ERROR] 删除失败: {e}")
 
     embeddings = EmbeddingService.get_embeddings(chunks, use_cache=True)
-    pids = [pid] * len(chunks)
-    chunk_numbers = list(range(len(chunks)))
-    texts = [json.dumps(chunk, ensure_ascii=False) for chunk in chunks]
-    add_data1s = [{} for _ in chunks]
-    add_data2s = [{} for _ in chunks]
-
-    records = [embeddings, pids, chunk_numbers, texts, add_data1s, add_data2s]
+    records = [
+        {
+            "embedding": embedding,
+            "Pid": pid,
+            "chunk_number": i,
+            "text": json.dumps(chunk, ensure_ascii=False),
+            "add_data1": {},
+            "add_data2": {},
+        }
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+    ]
 
     try:
         collection.insert(records)
@@ -115,7 +118,10 @@ def get_pdf_hash(pdf_path):
 
 def process_pdf(pdf_path, pid, use_cache=True):
     """
-    处理PDF文件，提取文本并存储到Milvus
+    处理PDF文件，提取文本并存储到Milvus (enterprise_vectors)
+    
+    已弃用：上传入口统一使用 process_pdf.tasks 的文档入库流水线，写入 project_raw_docs。
+    保留此函数仅为向后兼容。
     
     Args:
         pdf_path (str): PDF文件路径
@@ -142,7 +148,7 @@ def process_pdf(pdf_path, pid, use_cache=True):
                     return cached_result
         
         # 确保Milvus连接
-        if not milvus_manager.connect():
+        if not get_vector_store().connect():
             raise ConnectionError("无法连接到Milvus")
         
         # 提取文本
@@ -0,0 +1,171 @@
+from datetime import timedelta
+
+from celery import shared_task, chain
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+import logging
+
+from project.services import IncompleteEmbeddingError
+from .models import PdfIngestionJob
+
+logger = logging.getLogger(__name__)
+
+# 每批向量化并写入 Milvus 的切块数
+EMBED_BATCH_SIZE = getattr(settings, 'PDF_INGESTION_EMBED_BATCH_SIZE', 32)
+
+# 超过该秒数未更新的进行中任务视为已中断（如 worker 退出）
+JOB_STALE_SECONDS = getattr(settings, 'PDF_INGESTION_JOB_STALE_SECONDS', 1800)
+
+# 各阶段在总进度中的占比：提取 0-10，切块 10-20，向量化写入 20-100
+_PROGRESS_EXTRACTED = 10
+_PROGRESS_CHUNKED = 20
+
+
+def _update_job(job_id, **fields):
+    """只更新指定字段，避免覆盖轮询期间的其他写入"""
+    fields['updated_at'] = timezone.now()
+    PdfIngestionJob.objects.filter(id=job_id).update(**fields)
+
+
+def _fail_job(job, stage, error):
+    logger.error(f"[PDF Pipeline ERROR] 任务 {job.id} 在 {stage} 阶段失败: {error}")
+    _update_job(job.id, status='failed', failed_stage=stage, error=str(error), finished_at=timezone.now())
+
+
+def get_active_job(requirement_id):
+    """
+    需求正在处理中的入库任务
+
+    每个任务都会提取并替换该需求的全部文档切块，同一需求同时只允许一个任务运行，
+    否则首批写入前的替换删除会互相删掉对方已写入的切块。
+    调用方应在锁定需求行（select_for_update）的事务中检查后再创建或重启任务。
+    """
+    return PdfIngestionJob.objects.filter(
+        requirement_id=requirement_id,
+        status__in=PdfIngestionJob.ACTIVE_STATUSES,
+        updated_at__gte=timezone.now() - timedelta(seconds=JOB_STALE_SECONDS),
+    ).first()
+
+
+def start_pdf_ingestion(job_id):
+    """
+    分派PDF入库流水线（extract → chunk → embed/insert）
+
+    已完成切块的任务（如向量化阶段失败后重试）直接从向量化阶段继续。
+    """
+    job = PdfIngestionJob.objects.only('id', 'total_chunks').get(id=job_id)
+    if job.total_chunks:
+        return embed_and_insert_pdf_task.delay(str(job_id))
+    return chain(
+        extract_pdf_task.si(str(job_id)),
+        embed_and_insert_pdf_task.si(str(job_id)),
+    ).apply_async()
+
+
+@shared_task
+def extract_pdf_task(job_id):
+    """
+    流水线阶段一：提取需求全部文档文本并切块，切块结果持久化到任务记录
+
+    与需求保存/文件变更触发的 sync_raw_docs_auto 共用同一套提取与切块逻辑，
+    写入同一个 project_raw_docs 集合，每个文件只提取、切块、向量化一次。
+    """
+    from project.models import Requirement
+    from project.services import build_raw_docs_text, split_raw_docs_text, RAW_DOCS_VALID_STATUSES
+
+    try:
+        job = PdfIngestionJob.objects.get(id=job_id)
+    except PdfIngestionJob.DoesNotExist:
+        logger.warning(f"[PDF Pipeline] 任务 {job_id} 不存在")
+        return None
+
+    if job.status == 'completed' or job.total_chunks:
+        return job_id
+
+    _update_job(job_id, status='extracting', error='', failed_stage='', attempts=F('attempts') + 1)
+
+    try:
+        requirement = Requirement.objects.prefetch_related('files', 'tag1', 'tag2').get(id=job.requirement_id)
+        if requirement.status not in RAW_DOCS_VALID_STATUSES:
+            # 草稿/审核失败的需求不建立索引，状态变为有效后由 post_save 信号统一同步
+            logger.info(f"[PDF Pipeline] 需求 {requirement.id} 状态为 {requirement.status}，跳过索引")
+            _update_job(job_id, status='completed', progress=100, finished_at=timezone.now())
+            return job_id
+        raw_text = build_raw_docs_text(requirement)
+    except Exception as e:
+        _fail_job(job, 'extracting', e)
+        raise
+
+    _update_job(job_id, status='chunking', progress=_PROGRESS_EXTRACTED)
+
+    try:
+        chunks = split_raw_docs_text(raw_text)
+    except Exception as e:
+        _fail_job(job, 'chunking', e)
+        raise
+
+    _update_job(
+        job_id, status='embedding', progress=_PROGRESS_CHUNKED,
+        chunks=chunks, total_chunks=len(chunks), processed_chunks=0
+    )
+    logger.info(f"[PDF Pipeline] 任务 {job_id} 切块完成，共 {len(chunks)} 段")
+    return job_id
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(ConnectionError, IncompleteEmbeddingError),
+    retry_backoff=True,
+    max_retries=3,
+)
+def embed_and_insert_pdf_task(self, job_id):
+    """
+    流水线阶段二：分批向量化并写入 Milvus (project_raw_docs)
+
+    每批写入后记录 processed_chunks，失败重试时从断点批次继续，不会重复写入已完成的批次。
+    批次中有切块向量获取失败时整批不写入并重试，重试耗尽后任务标记为失败。
+    """
+    from project.services import get_or_create_collection, insert_raw_docs_chunks, COLLECTION_RAW_DOCS
+
+    try:
+        job = PdfIngestionJob.objects.get(id=job_id)
+    except PdfIngestionJob.DoesNotExist:
+        logger.warning(f"[PDF Pipeline] 任务 {job_id} 不存在")
+        return None
+
+    if job.status in ('completed', 'failed') and job.processed_chunks >= job.total_chunks:
+        return job_id
+
+    chunks = job.chunks or []
+    total = len(chunks)
+    _update_job(job_id, status='embedding', error='', failed_stage='')
+
+    try:
+        collection = get_or_create_collection(COLLECTION_RAW_DOCS)
+        if collection is None:
+            raise ConnectionError("无法连接到Milvus")
+
+        start = job.processed_chunks
+        while start < total:
+            batch = chunks[start:start + EMBED_BATCH_SIZE]
+            # 首批写入前替换该需求的旧数据；断点续传时保留已写入批次
+            written = insert_raw_docs_chunks(job.requirement_id, batch, start, collection, replace=(start == 0))
+            if written < len(batch):
+                raise IncompleteEmbeddingError(f"批次 {start} 仅写入 {written}/{len(batch)} 段")
+            start += len(batch)
+            progress = _PROGRESS_CHUNKED + int((100 - _PROGRESS_CHUNKED) * start / total)
+            _update_job(job_id, processed_chunks=start, progress=min(progress, 99))
+        collection.flush()
+    except (ConnectionError, IncompleteEmbeddingError) as e:
+        if self.request.retries >= self.max_retries:
+            _fail_job(job, 'embedding', e)
+        raise
+    except Exception as e:
+        _fail_job(job, 'embedding', e)
+        raise
+
+    # 完成后清空切块，避免任务表长期保存大文本
+    _update_job(job_id, status='completed', progress=100, chunks=[], finished_at=timezone.now())
+    logger.info(f"[PDF Pipeline] 任务 {job_id} 处理完成，Pid={job.requirement_id}，共 {total} 段")
+    return job_id
@@ -1,3 +1,122 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import json
+import multiprocessing
+from unittest import mock
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from organization.models import Organization
+from process_pdf import extraction_service as extraction
+from process_pdf import views
+from process_pdf.models import PdfIngestionJob
+from project.models import Requirement
+from user.models import OrganizationUser, User
+
+
+def _extract_in_daemon(paths, queue):
+    """在守护进程中提取（模拟 Celery prefork 子进程）"""
+    service = extraction.DocumentExtractionService(max_workers=2)
+    try:
+        texts = service.extract_texts(paths)
+        pdf_pages = list(service.iter_pdf_pages(paths[0]))
+        queue.put((type(service._get_executor()).__name__, texts, pdf_pages))
+    except Exception as e:
+        queue.put(('error', repr(e), None))
+    finally:
+        service.shutdown()
+
+
+class DocumentExtractionServiceTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def _write_text(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def _write_pdf(self, name, page_count):
+        import fitz  # PyMuPDF
+
+        path = os.path.join(self.tmpdir, name)
+        with fitz.open() as doc:
+            for i in range(page_count):
+                doc.new_page().insert_text((72, 72), f'page {i}')
+            doc.save(path)
+        return path
+
+    def test_daemonic_process_uses_process_pool(self):
+        """守护进程中不降级为串行，改用 billiard 进程池并行提取"""
+        pdf_path = self._write_pdf('large.pdf', extraction.LARGE_PDF_PAGE_THRESHOLD + 1)
+        paths = [pdf_path, self._write_text('a.txt', '需求A'), self._write_text('b.md', '需求B')]
+
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        process = ctx.Process(target=_extract_in_daemon, args=(paths, queue), daemon=True)
+        process.start()
+        executor_type, texts, pdf_pages = queue.get(timeout=60)
+        process.join(timeout=10)
+
+        self.assertEqual(executor_type, '_BilliardExecutor', texts)
+        self.assertEqual(texts[paths[1]], '需求A')
+        self.assertEqual(texts[paths[2]], '需求B')
+        self.assertEqual(len(pdf_pages), extraction.LARGE_PDF_PAGE_THRESHOLD + 1)
+        self.assertEqual(pdf_pages[-1].strip(), f'page {extraction.LARGE_PDF_PAGE_THRESHOLD}')
+        self.assertTrue(texts[pdf_path].startswith('page 0'))
+
+    def test_single_worker_extracts_in_process(self):
+        service = extraction.DocumentExtractionService(max_workers=1)
+        path = self._write_text('a.txt', 'hello')
+        self.assertIsNone(service._get_executor())
+        self.assertEqual(service.extract_texts([path, '/missing.txt']), {path: 'hello', '/missing.txt': ''})
+
+
+@mock.patch('process_pdf.views.start_pdf_ingestion')
+class RetryPdfJobTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create(username='org', email='org@example.com')
+        organization = Organization.objects.create(
+            name='组织', organization_type='enterprise', enterprise_type='private'
+        )
+        publisher = OrganizationUser.objects.create(user=user, organization=organization, status='approved')
+        self.requirement = Requirement.objects.create(
+            title='需求', organization=organization, publish_people=publisher, description='d', brief='b'
+        )
+
+    def _create_job(self, **fields):
+        return PdfIngestionJob.objects.create(requirement=self.requirement, file_path='/tmp/a.pdf', **fields)
+
+    def _retry(self, job):
+        with self.captureOnCommitCallbacks(execute=True):
+            return views.retry_pdf_job(RequestFactory().post('/'), job.id)
+
+    def test_concurrent_retry_dispatches_once(self, start_pdf_ingestion):
+        job = self._create_job(status='failed', total_chunks=3, processed_chunks=1)
+        stale = PdfIngestionJob.objects.get(id=job.id)
+
+        self.assertEqual(self._retry(job).status_code, 202)
+        # 并发的第二个请求读取到的仍是 failed 状态
+        with mock.patch.object(PdfIngestionJob.objects, 'get', return_value=stale):
+            self.assertEqual(self._retry(job).status_code, 409)
+        start_pdf_ingestion.assert_called_once_with(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'embedding')
+
+    def test_retry_blocked_while_requirement_has_active_job(self, start_pdf_ingestion):
+        failed = self._create_job(status='failed')
+        active = self._create_job(status='embedding')
+
+        response = self._retry(failed)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content)['job_id'], str(active.id))
+
+        PdfIngestionJob.objects.filter(id=active.id).update(status='completed')
+        # 已有更新的任务完成后，旧任务续传会写回过时的切块
+        self.assertEqual(self._retry(failed).status_code, 409)
+        start_pdf_ingestion.assert_not_called()
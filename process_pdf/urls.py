@@ -5,4 +5,6 @@ app_name = 'process_pdf'
 
 urlpatterns = [
     path('process-pdf/', views.upload_pdf, name='upload_pdf'),
-]
\ No newline at end of file
+    path('process-pdf/jobs/<uuid:job_id>/', views.pdf_job_status, name='pdf_job_status'),
+    path('process-pdf/jobs/<uuid:job_id>/retry/', views.retry_pdf_job, name='retry_pdf_job'),
+]
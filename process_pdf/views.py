@@ -1,80 +1,109 @@
 import os
-from django.http import JsonResponse
+import logging
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
 
-# 导入PDF处理函数
-from .pdf_chunk_milvus import process_pdf
+# 导入PDF入库流水线
+from .models import PdfIngestionJob
+from .tasks import get_active_job, start_pdf_ingestion
 # 导入相关模型和函数
 from project.models import File, Requirement, get_requirement_file_path, generate_unique_filename
+from common_utils import FastJsonResponse
+
+logger = logging.getLogger(__name__)
+
 
 @csrf_exempt
 def upload_pdf(request):
     """
-    处理PDF上传并进行向量化存储
+    处理PDF上传，创建异步入库任务后立即返回
+    
+    文件保存后由 Celery 流水线完成 提取 → 切块 → 分批向量化 → 写入Milvus，
+    客户端通过 status_url 轮询进度。
     
     请求参数:
     - pid: 项目需求ID，用于在Milvus中标识该文档
     - pdf: PDF文件
     
-    返回:
-    - status: 处理状态 (success/error)
+    返回 (202):
+    - status: accepted
+    - job_id: 入库任务ID
     - pid: 项目需求ID
-    - chunks: 分块数量
     - file_id: 保存的文件ID
+    - status_url: 任务状态查询地址
     - error: 错误信息(如果有)
     """
     if request.method != "POST":
-        return JsonResponse({"error": "只允许POST方法"}, status=405)
+        return FastJsonResponse({"error": "只允许POST方法"}, status=405)
 
     pid = request.POST.get("pid")
     pdf_file = request.FILES.get("pdf")
 
     if not pid or not pdf_file:
-        return JsonResponse({"error": "缺少pid或pdf文件"}, status=400)
+        return FastJsonResponse({"error": "缺少pid或pdf文件"}, status=400)
 
     try:
         # 验证需求是否存在
         requirement = Requirement.objects.get(id=int(pid))
     except (ValueError, Requirement.DoesNotExist):
-        return JsonResponse({"error": "无效的需求ID"}, status=400)
+        return FastJsonResponse({"error": "无效的需求ID"}, status=400)
 
-    # DEBUG: 打印接收到的文件信息
-    print(f"[DEBUG]接收到的文件:{pdf_file.name}，大小={pdf_file.size}")
+    logger.debug(f"接收到的文件: {pdf_file.name}，大小={pdf_file.size}")
 
     try:
-        # 生成唯一文件名和保存路径
-        file_path = get_requirement_file_path(pid, pdf_file.name)
-        
-        # 保存文件到指定目录
-        saved_path = default_storage.save(file_path, pdf_file)
-        full_file_path = os.path.join(settings.MEDIA_ROOT, saved_path)
+        with transaction.atomic():
+            # 锁定需求行：同一需求同时只允许一个入库任务
+            Requirement.objects.select_for_update().only('id').get(id=requirement.id)
+            active_job = get_active_job(requirement.id)
+            if active_job:
+                return FastJsonResponse({"error": "该需求有正在处理的入库任务，请完成后再上传",
+                                         **active_job.to_status_dict()}, status=409)
+
+            # 生成唯一文件名和保存路径
+            file_path = get_requirement_file_path(pid, pdf_file.name)
         
-        # DEBUG: 打印保存路径信息
-        print(f"[DEBUG]保存路径:{full_file_path}，是否存在:{os.path.exists(full_file_path)}")
+            # 保存文件到指定目录
+            saved_path = default_storage.save(file_path, pdf_file)
+            full_file_path = os.path.join(settings.MEDIA_ROOT, saved_path)
         
-        # 创建File模型记录
-        file_obj = File.objects.create(
-            name=pdf_file.name,
-            path=f"/需求文档/{requirement.title}/{pdf_file.name}",  # 虚拟路径
-            real_path=saved_path,  # 实际存储路径
-            parent_path=f"/需求文档/{requirement.title}",  # 父级虚拟路径
-            is_folder=False,
-            is_cloud_link=False,
-            size=pdf_file.size
-        )
+            logger.debug(f"保存路径: {full_file_path}")
         
-        # 将文件关联到需求
-        requirement.files.add(file_obj)
+            # 创建File模型记录
+            file_obj = File.objects.create(
+                name=pdf_file.name,
+                path=f"/需求文档/{requirement.title}/{pdf_file.name}",  # 虚拟路径
+                real_path=saved_path,  # 实际存储路径
+                parent_path=f"/需求文档/{requirement.title}",  # 父级虚拟路径
+                is_folder=False,
+                is_cloud_link=False,
+                size=pdf_file.size
+            )
         
-        # 调用PDF处理函数
-        result = process_pdf(full_file_path, int(pid))
+            # 将文件关联到需求
+            # 由下方的入库任务统一提取/向量化，跳过 files m2m 信号触发的重复同步
+            requirement._skip_raw_docs_sync = True
+            requirement.files.add(file_obj)
         
-        # 添加文件ID到返回结果
-        result["file_id"] = file_obj.id
+            # 创建入库任务，事务提交后分派 Celery 流水线
+            job = PdfIngestionJob.objects.create(
+                requirement=requirement,
+                file=file_obj,
+                file_path=full_file_path,
+            )
+            transaction.on_commit(lambda: start_pdf_ingestion(job.id))
         
-        return JsonResponse({"status": "success", **result})
+            return FastJsonResponse({
+                "status": "accepted",
+                "job_id": str(job.id),
+                "pid": requirement.id,
+                "file_id": file_obj.id,
+                "status_url": request.build_absolute_uri(reverse("process_pdf:pdf_job_status", args=[job.id])),
+            }, status=202)
         
     except Exception as e:
         # 发生错误时删除已保存的文件
@@ -86,4 +115,70 @@ def upload_pdf(request):
         except:
             pass
         
-        return JsonResponse({"error": str(e)}, status=500)
+        return FastJsonResponse({"error": str(e)}, status=500)
+
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def pdf_job_status(request, job_id):
+    """
+    查询PDF入库任务状态
+
+    返回:
+    - status: pending/extracting/chunking/embedding/completed/failed
+    - stage: 当前阶段（失败时为失败所在阶段）
+    - progress: 进度百分比
+    - resumable: 失败后是否可通过 retry 接口从断点继续
+    """
+    try:
+        job = PdfIngestionJob.objects.get(id=job_id)
+    except (PdfIngestionJob.DoesNotExist, ValueError):
+        return FastJsonResponse({"error": "任务不存在"}, status=404)
+
+    return FastJsonResponse(job.to_status_dict())
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def retry_pdf_job(request, job_id):
+    """
+    重试失败的PDF入库任务
+
+    已完成切块的任务从向量化阶段的断点批次继续，否则从文本提取重新开始。
+    同一需求有其他任务正在处理或已有更新的任务时不允许重试。
+    """
+    try:
+        job = PdfIngestionJob.objects.get(id=job_id)
+    except (PdfIngestionJob.DoesNotExist, ValueError):
+        return FastJsonResponse({"error": "任务不存在"}, status=404)
+
+    with transaction.atomic():
+        # 锁定需求行：同一需求同时只允许一个入库任务
+        Requirement.objects.select_for_update().only('id').get(id=job.requirement_id)
+        active_job = get_active_job(job.requirement_id)
+        if active_job and active_job.id != job.id:
+            return FastJsonResponse({"error": "该需求有正在处理的入库任务", **active_job.to_status_dict()},
+                                    status=409)
+        if PdfIngestionJob.objects.filter(
+            requirement_id=job.requirement_id, created_at__gt=job.created_at
+        ).exclude(status='failed').exists():
+            # 每个任务都替换需求的全部切块，旧任务续传会写回过时的切块
+            return FastJsonResponse({"error": "该需求已有更新的入库任务", **job.to_status_dict()}, status=409)
+
+        # 条件更新：并发重试只有一个请求能把任务从 failed 改回处理中
+        retried = PdfIngestionJob.objects.filter(id=job.id, status='failed').update(
+            status='embedding' if job.total_chunks else 'pending',
+            error='',
+            failed_stage='',
+            finished_at=None,
+            updated_at=timezone.now(),
+        )
+        if retried:
+            transaction.on_commit(lambda: start_pdf_ingestion(job.id))
+
+    job.refresh_from_db()
+    if not retried:
+        return FastJsonResponse({"error": "只有失败的任务可以重试", **job.to_status_dict()},
+                                status=409)
+    return FastJsonResponse(job.to_status_dict(), status=202)
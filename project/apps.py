@@ -7,4 +7,7 @@ class ProjectConfig(AppConfig):
     verbose_name = '项目管理'
 
     def ready(self):
-        import project.signals
\ No newline at end of file
+        import project.signals
+        # 数据表版本号（分页总数缓存等依赖）
+        from common_utils import connect_model_version_signals
+        connect_model_version_signals()
\ No newline at end of file
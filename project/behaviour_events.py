@@ -0,0 +1,239 @@
+# project/behaviour_events.py
+"""
+用户行为事件流
+
+浏览/收藏/申请等行为写入 Redis Stream (user, item, action, ts)，由消费者组批量消费：
+- 需求标签从进程内 需求ID -> 标签 映射读取，避免每个事件查询 MySQL
+- 同一批内按用户聚合标签权重增量，一个 pipeline 写入 user:dynamic_tags:{user_id}
+  （只有 ACTION_WEIGHTS 中的行为计入动态标签，apply 仅用于热度榜）
+- 同一批内按需求聚合热度增量，写入需求热度榜（view 事件仅计当日首次浏览）
+"""
+import time
+import random
+import logging
+from collections import defaultdict
+from django.conf import settings
+
+from common_utils import get_cache_redis_client
+from .trending import TRENDING_WEIGHTS, trending_index
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = 'behaviour:events'
+CONSUMER_GROUP = 'dynamic_tags'
+# Stream 近似保留的事件数（XADD MAXLEN ~）
+STREAM_MAXLEN = getattr(settings, 'BEHAVIOUR_STREAM_MAXLEN', 100000)
+# 每次 XREADGROUP 读取的事件数 / 每次任务最多处理的批数
+BATCH_SIZE = getattr(settings, 'BEHAVIOUR_STREAM_BATCH_SIZE', 500)
+MAX_BATCHES = getattr(settings, 'BEHAVIOUR_STREAM_MAX_BATCHES', 20)
+# 消费者崩溃后，超过该时长未确认的事件由其他消费者接管（毫秒）
+CLAIM_MIN_IDLE_MS = 60 * 1000
+
+# 动态标签行为权重: action -> (tag1 权重, tag2 权重)，不在其中的行为不影响动态标签
+ACTION_WEIGHTS = {
+    'view': (1.0, 0.5),
+    'favorite': (3.0, 3.0),
+}
+
+DYNAMIC_TAGS_KEY = 'user:dynamic_tags:{}'
+DYNAMIC_TAGS_TTL = 7 * 24 * 3600
+# 每个用户每批有 10% 概率触发全量衰减 (x 0.95)，避免长期膨胀
+DECAY_PROBABILITY = 0.1
+DECAY_FACTOR = 0.95
+
+# 需求标签映射缓存有效期（秒），标签变更后最多延迟该时长生效
+TAG_MAP_TTL = 600
+
+
+def publish(user_id, item_id, action, client=None):
+    """写入一条行为事件"""
+    if not user_id or not item_id:
+        return
+    client = client or get_cache_redis_client()
+    if client is None:
+        raise ConnectionError("Redis client not available")
+    client.xadd(
+        STREAM_KEY,
+        {'user': user_id, 'item': item_id, 'action': action, 'ts': time.time()},
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+class RequirementTagMap:
+    """进程内 需求ID -> (tag1 ID 列表, tag2 ID 列表) 映射，按需批量加载、定时过期"""
+
+    def __init__(self, ttl=TAG_MAP_TTL):
+        self.ttl = ttl
+        self._tags = {}
+        self._loaded_at = time.monotonic()
+
+    def get_many(self, requirement_ids):
+        from .models import Requirement
+
+        if time.monotonic() - self._loaded_at > self.ttl:
+            self._tags = {}
+            self._loaded_at = time.monotonic()
+
+        missing = {rid for rid in requirement_ids if rid not in self._tags}
+        if missing:
+            loaded = {rid: ([], []) for rid in missing}
+            for rid, tag_id in Requirement.tag1.through.objects.filter(
+                requirement_id__in=missing
+            ).values_list('requirement_id', 'tag1_id'):
+                loaded[rid][0].append(tag_id)
+            for rid, tag_id in Requirement.tag2.through.objects.filter(
+                requirement_id__in=missing
+            ).values_list('requirement_id', 'tag2_id'):
+                loaded[rid][1].append(tag_id)
+            self._tags.update(loaded)
+
+        return {rid: self._tags[rid] for rid in requirement_ids}
+
+
+def decay_dynamic_tags(redis_client, redis_key):
+    """动态标签全量衰减，分数过小 (<0.1) 的字段直接删除"""
+    all_tags = redis_client.hgetall(redis_key)
+    if not all_tags:
+        return
+    pipeline = redis_client.pipeline()
+    for field, score in all_tags.items():
+        try:
+            new_score = float(score) * DECAY_FACTOR
+            if new_score < 0.1:
+                pipeline.hdel(redis_key, field)
+            else:
+                pipeline.hset(redis_key, field, new_score)
+        except ValueError:
+            pass
+    pipeline.execute()
+
+
+class BehaviourEventConsumer:
+    """行为事件消费者（消费者组 dynamic_tags）"""
+
+    def __init__(self, consumer_name, tag_map=None):
+        self.consumer_name = consumer_name
+        self.tag_map = tag_map or RequirementTagMap()
+
+    def _ensure_group(self, client):
+        try:
+            client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id='0', mkstream=True)
+        except Exception as e:
+            # 消费者组已存在
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def _read_batch(self, client):
+        # 先接管其他消费者长时间未确认的事件，再读取新事件
+        claimed = client.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, self.consumer_name,
+            min_idle_time=CLAIM_MIN_IDLE_MS, start_id='0-0', count=BATCH_SIZE
+        )
+        if claimed and claimed[1]:
+            return claimed[1]
+        response = client.xreadgroup(
+            CONSUMER_GROUP, self.consumer_name, {STREAM_KEY: '>'}, count=BATCH_SIZE
+        )
+        return response[0][1] if response else []
+
+    @staticmethod
+    def _decode(value):
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def parse(self, events):
+        """
+        解析一批事件
+
+        Returns:
+            list: [(user_id, item_id, action, 是否计入热度), ...]
+        """
+        parsed = []
+        for _, fields in events:
+            if not fields:
+                continue
+            fields = {self._decode(k): self._decode(v) for k, v in fields.items()}
+            try:
+                parsed.append((
+                    int(fields['user']),
+                    int(fields['item']),
+                    fields.get('action', 'view'),
+                    fields.get('new', '1') != '0',
+                ))
+            except (KeyError, ValueError):
+                continue
+        return parsed
+
+    def aggregate(self, parsed):
+        """
+        将一批事件聚合为每个用户的标签权重增量
+
+        Returns:
+            dict: {user_id: {field: 增量}}
+        """
+        tags = self.tag_map.get_many({item for _, item, _, _ in parsed})
+        increments = defaultdict(lambda: defaultdict(float))
+        for user_id, item_id, action, _ in parsed:
+            if action not in ACTION_WEIGHTS:
+                continue
+            tag1_weight, tag2_weight = ACTION_WEIGHTS[action]
+            tag1_ids, tag2_ids = tags[item_id]
+            for tag_id in tag1_ids:
+                increments[user_id][f"tag1_{tag_id}"] += tag1_weight
+            for tag_id in tag2_ids:
+                increments[user_id][f"tag2_{tag_id}"] += tag2_weight
+        return increments
+
+    @staticmethod
+    def aggregate_trending(parsed):
+        """
+        将一批事件聚合为每个需求的热度增量
+
+        Returns:
+            dict: {item_id: 增量}
+        """
+        increments = defaultdict(float)
+        for _, item_id, action, counted in parsed:
+            if counted:
+                increments[item_id] += TRENDING_WEIGHTS.get(action, TRENDING_WEIGHTS['view'])
+        return increments
+
+    def apply(self, client, increments):
+        """一个 pipeline 写入全部用户的增量"""
+        if not increments:
+            return
+        pipeline = client.pipeline()
+        for user_id, fields in increments.items():
+            redis_key = DYNAMIC_TAGS_KEY.format(user_id)
+            for field, score in fields.items():
+                pipeline.hincrbyfloat(redis_key, field, score)
+            pipeline.expire(redis_key, DYNAMIC_TAGS_TTL)
+        pipeline.execute()
+
+        for user_id in increments:
+            if random.random() < DECAY_PROBABILITY:
+                decay_dynamic_tags(client, DYNAMIC_TAGS_KEY.format(user_id))
+
+    def consume(self, max_batches=MAX_BATCHES):
+        """
+        消费事件直到 Stream 中没有新事件或达到批数上限
+
+        Returns:
+            int: 处理的事件数
+        """
+        client = get_cache_redis_client()
+        if client is None:
+            raise ConnectionError("Redis client not available")
+        self._ensure_group(client)
+
+        total = 0
+        for _ in range(max_batches):
+            events = self._read_batch(client)
+            if not events:
+                break
+            parsed = self.parse(events)
+            self.apply(client, self.aggregate(parsed))
+            trending_index.incr_many(self.aggregate_trending(parsed), client=client)
+            client.xack(STREAM_KEY, CONSUMER_GROUP, *[event_id for event_id, _ in events])
+            total += len(events)
+        return total
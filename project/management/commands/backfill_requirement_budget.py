@@ -0,0 +1,47 @@
+"""
+Django管理命令：回填需求预算数值区间 (budget_min / budget_max)
+新增字段上线后执行一次，之后由 Requirement.save() 自动维护
+使用方法：
+  python manage.py backfill_requirement_budget
+  python manage.py backfill_requirement_budget --batch-size 500
+"""
+
+from django.core.management.base import BaseCommand
+from common_utils import bump_model_versions
+from project.models import Requirement
+
+
+class Command(BaseCommand):
+    help = '根据 budget 字段回填需求预算数值区间'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批更新的需求数',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        rows = Requirement.objects.only('id', 'budget', 'budget_min', 'budget_max').order_by('id')
+
+        batch, updated, last_id = [], 0, 0
+        while True:
+            chunk = list(rows.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            for req in chunk:
+                budget_min, budget_max = Requirement.parse_budget(req.budget)
+                if (budget_min, budget_max) != (req.budget_min, req.budget_max):
+                    req.budget_min, req.budget_max = budget_min, budget_max
+                    batch.append(req)
+            if batch:
+                Requirement.objects.bulk_update(batch, ['budget_min', 'budget_max'])
+                updated += len(batch)
+                batch = []
+
+        if updated:
+            bump_model_versions(Requirement)
+        self.stdout.write(self.style.SUCCESS(f'回填完成：更新 {updated} 个需求'))
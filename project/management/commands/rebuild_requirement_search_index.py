@@ -0,0 +1,37 @@
+"""
+Django管理命令：重建需求关键词检索索引 (requirement_search_term)
+新部署或标签文本批量修改后执行，之后由需求保存与标签变更信号增量维护
+使用方法：
+  python manage.py rebuild_requirement_search_index            # 重建全部需求
+  python manage.py rebuild_requirement_search_index --id 12    # 仅重建指定需求
+"""
+
+from django.core.management.base import BaseCommand
+from project.models import Requirement
+from project.search_index import requirement_search_index
+
+
+class Command(BaseCommand):
+    help = '重建需求关键词检索倒排索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--id',
+            type=int,
+            action='append',
+            help='仅重建指定需求（可重复指定）',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Requirement.objects.prefetch_related('tag1', 'tag2').order_by('id')
+        if options['id']:
+            queryset = queryset.filter(id__in=options['id'])
+
+        count = terms = 0
+        for requirement in queryset.iterator(chunk_size=500):
+            terms += requirement_search_index.index_requirement(requirement)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'重建完成：{count} 个需求，{terms} 个词项')
+        )
@@ -1,4 +1,6 @@
+from collections import defaultdict
 from rest_framework import serializers
+from django.db.models import Q
 from django.core.files.storage import default_storage
 from django.conf import settings
 from user.models import Tag1, Tag2
@@ -8,42 +10,92 @@ import uuid
 import os
 
 
+def load_related_projects(requirement_ids):
+    """
+    批量加载需求的关联项目、项目负责人与已通过的成员（固定 2 次查询，与需求数和项目数无关）
+
+    Args:
+        requirement_ids: 需求ID列表
+
+    Returns:
+        dict: {需求ID: [(项目, 负责人 Student 或 None, [已通过的 ProjectParticipant, ...]), ...]}
+    """
+    from studentproject.models import StudentProject, ProjectParticipant
+
+    requirement_ids = list(requirement_ids)
+    result = {rid: [] for rid in requirement_ids}
+    projects = list(StudentProject.objects.filter(requirement_id__in=requirement_ids))
+    if not projects:
+        return result
+
+    leaders = {}
+    approved = defaultdict(list)
+    participants = ProjectParticipant.objects.filter(
+        Q(status='approved') | Q(role='leader'),
+        project_id__in=[project.id for project in projects],
+    ).select_related('student__user', 'student__school')
+    for participant in participants:
+        if participant.role == 'leader':
+            leaders.setdefault(participant.project_id, participant.student)
+        if participant.status == 'approved':
+            approved[participant.project_id].append(participant)
+
+    for project in projects:
+        result[project.requirement_id].append((project, leaders.get(project.id), approved[project.id]))
+    return result
+
+
 class ProjectRelatedMixin:
-    """项目相关方法 Mixin"""
+    """
+    项目相关方法 Mixin
+
+    关联项目数据由 load_related_projects 按页批量加载：调用方可通过 context['related_projects_map'] 传入；
+    未传入时，首次访问为整页（many=True 时父序列化器的全部实例）加载一次
+    """
+
+    def _get_related_project_data(self, obj):
+        related_map = self.context.get('related_projects_map')
+        if related_map is not None and obj.id in related_map:
+            return related_map[obj.id]
+
+        related_map = getattr(self, '_related_projects_map', None)
+        if related_map is None or obj.id not in related_map:
+            requirement_ids = {obj.id}
+            if isinstance(self.parent, serializers.ListSerializer) and self.parent.instance is not None:
+                requirement_ids.update(item.id for item in self.parent.instance)
+            related_map = self._related_projects_map = load_related_projects(requirement_ids)
+        return related_map[obj.id]
+
+    def _student_brief(self, student, role=None):
+        info = {
+            'id': student.id,
+            'username': student.user.username,
+            'school': {
+                'id': student.school.id,
+                'name': student.school.school
+            } if student.school else None,
+        }
+        if role is not None:
+            info['role'] = role
+        info['avatar'] = build_media_url(student.user.avatar, self.context.get('request')) if student.user.avatar else None
+        return info
 
     def get_related_projects(self, obj):
         """获取关联的项目信息"""
         try:
-            from studentproject.models import StudentProject, ProjectParticipant
-            projects = StudentProject.objects.filter(requirement=obj)
             result = []
-            for project in projects:
-                participants = ProjectParticipant.objects.filter(project=project, status='approved')
-                project_participants = [{
-                    'id': participant.student.id,
-                    'username': participant.student.user.username,
-                    'school': {
-                        'id': participant.student.school.id,
-                        'name': participant.student.school.school
-                    } if participant.student.school else None,
-                    'role': participant.role,
-                    'avatar': build_media_url(participant.student.user.avatar, self.context.get('request')) if participant.student.user.avatar else None,
-                } for participant in participants]
+            for project, leader, participants in self._get_related_project_data(obj):
+                project_participants = [
+                    self._student_brief(participant.student, role=participant.role)
+                    for participant in participants
+                ]
 
                 result.append({
                     'id': project.id,
                     'title': project.title,
                     'status': project.status,
                     'created_at': project.created_at.strftime('%Y-%m-%d %H:%M:%S') if project.created_at else None,
-                    'leader': {
-                        'id': project.get_leader().id,
-                        'username': project.get_leader().user.username,
-                        'school': {
-                            'id': project.get_leader().school.id,
-                            'name': project.get_leader().school.school
-                        } if project.get_leader().school else None,
-                        'avatar': build_media_url(project.get_leader().user.avatar, self.context.get('request')) if project.get_leader().user.avatar else None,
-                    } if project.get_leader() else None,
+                    'leader': self._student_brief(leader) if leader else None,
                     'participants': project_participants,
                 })
             return result
@@ -53,28 +105,109 @@ class ProjectRelatedMixin:
     def get_total_project_members(self, obj):
         """获取项目总成员数（只记录状态为已通过的项目成员数）"""
         try:
-            from studentproject.models import StudentProject, ProjectParticipant
-            total_members = 0
-            projects = StudentProject.objects.filter(requirement=obj)
-
-            for project in projects:
-                # 统计每个项目状态为已通过的参与者数量
-                participants_count = ProjectParticipant.objects.filter(project=project, status='approved').count()
-                total_members += participants_count
-
-            return total_members
+            return sum(len(participants) for _, _, participants in self._get_related_project_data(obj))
         except ImportError:
             return 0
 
     def get_total_project(self, obj):
         """获取关联的项目总数"""
         try:
-            from studentproject.models import StudentProject
-            return StudentProject.objects.filter(requirement=obj).count()
+            return len(self._get_related_project_data(obj))
         except ImportError:
             return 0
 
 
+def parse_sparse_fields(request):
+    """
+    解析请求中的稀疏字段参数（逗号分隔）
+
+    Returns:
+        tuple: (fields, expand)，未传入的参数为 None
+    """
+    def _split(name):
+        value = request.GET.get(name)
+        if value is None:
+            return None
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    return _split('fields'), _split('expand')
+
+
+class SparseFieldsMixin:
+    """
+    稀疏字段 Mixin：序列化器接受 fields / expand 参数，只输出（并只查询）请求的字段
+
+    - 两者均未传入：输出全部字段（与原有返回一致）
+    - fields：只输出列出的字段（id 始终输出），高开销字段也可直接列出
+    - expand：在 fields（未传入时为全部普通字段）基础上追加 expandable_fields 中的高开销字段
+
+    子类通过 field_query_plan 声明每个字段依赖的列与关联，视图调用 optimize_queryset 生成
+    select_related / prefetch_related / only() 查询计划。
+    """
+
+    # 高开销字段：传入 fields 或 expand 后，需显式请求才输出
+    expandable_fields = ()
+    # 始终查询的列（排序、游标分页等依赖的列）
+    base_columns = ('id',)
+    # 字段 -> {'columns': [...], 'select_related': [...], 'prefetch_related': [...]}，未声明的字段按同名列处理
+    field_query_plan = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        allowed = self.resolve_fields(fields, expand)
+        if allowed is not None:
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+    @classmethod
+    def resolve_fields(cls, fields=None, expand=None):
+        """
+        计算需要输出的字段
+
+        Returns:
+            set | None: 字段名集合；未传入 fields 与 expand 时返回 None（输出全部字段）
+        """
+        if fields is None and expand is None:
+            return None
+        declared = list(cls.Meta.fields)
+        if fields is None:
+            allowed = {name for name in declared if name not in cls.expandable_fields}
+        else:
+            allowed = {name for name in fields if name in declared}
+        allowed.update(name for name in (expand or []) if name in cls.expandable_fields)
+        allowed.add('id')
+        return allowed
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=None):
+        """按请求的字段生成查询计划；未传入 fields 与 expand 时原样返回"""
+        allowed = cls.resolve_fields(fields, expand)
+        if allowed is None:
+            return queryset
+
+        model_fields = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        columns = set(cls.base_columns)
+        select_related = []
+        prefetch_related = []
+        for name in allowed:
+            plan = cls.field_query_plan.get(name)
+            if plan is None:
+                if name in model_fields:
+                    columns.add(name)
+                continue
+            columns.update(plan.get('columns', ()))
+            select_related.extend(plan.get('select_related', ()))
+            prefetch_related.extend(plan.get('prefetch_related', ()))
+
+        # 重置调用方预设的关联加载，只保留请求字段需要的部分
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*sorted(set(select_related)))
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(set(prefetch_related)))
+        return queryset.only(*sorted(columns))
+
+
 class BaseFieldsMixin:
     """基础字段定义 Mixin，用于减少 Create 和 Update 序列化器中的重复字段定义"""
 
@@ -7,6 +7,10 @@ User = get_user_model()
 
 import uuid
 import os
+from decimal import Decimal, InvalidOperation
+
+# budget_min / budget_max 可存储的绝对值上限 (max_digits=15, decimal_places=2)
+BUDGET_MAX_VALUE = Decimal('1e13')
 
 
 def generate_unique_filename(original_filename):
@@ -137,6 +141,9 @@ class Requirement(models.Model):
     publish_people = models.ForeignKey(OrganizationUser, on_delete=models.CASCADE, verbose_name='发布人')
     finish_time = models.DateField(null=True, blank=True, verbose_name='完成时间')
     budget = models.CharField(max_length=255, verbose_name='预算', null=True, blank=True)
+    # 由 budget 解析出的数值区间（单个值时上下限相同，无法解析时为空），保存时自动同步，用于预算范围筛选
+    budget_min = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, editable=False, verbose_name='预算下限')
+    budget_max = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, editable=False, verbose_name='预算上限')
     people_count = models.CharField(max_length=255, verbose_name='人数需求', null=True, blank=True)
     contact_person = models.CharField(max_length=100, verbose_name='联系人')
     contact_info = models.CharField(max_length=255, verbose_name='联系方式')
@@ -185,6 +192,7 @@ class Requirement(models.Model):
             models.Index(fields=['views'], name='req_views_idx'),
             models.Index(fields=['title'], name='req_title_idx'),
             models.Index(fields=['evaluation_criteria'], name='req_eval_criteria_idx'),
+            models.Index(fields=['budget_min', 'budget_max'], name='req_budget_range_idx'),
 
             # 复合索引（按查询频率排序）
             models.Index(fields=['status', 'created_at'], name='req_status_created_idx'),
@@ -201,6 +209,59 @@ class Requirement(models.Model):
     def __str__(self):
         return self.title
 
+    @staticmethod
+    def parse_budget(budget):
+        """
+        解析预算字符串
+
+        Args:
+            budget (str): 预算，格式为 "min-max" 或单个数值
+
+        Returns:
+            tuple: (下限, 上限)，无法解析时为 (None, None)
+        """
+        if not budget:
+            return None, None
+        budget = str(budget).strip()
+        try:
+            if '-' in budget:
+                low, high = budget.split('-', 1)
+                low, high = Decimal(low.strip()), Decimal(high.strip())
+            else:
+                low = high = Decimal(budget)
+        except (InvalidOperation, ValueError):
+            return None, None
+        # 超出字段精度范围的值视为无法解析
+        if not all(v.is_finite() and abs(v) < BUDGET_MAX_VALUE for v in (low, high)):
+            return None, None
+        return low.quantize(Decimal('0.01')), high.quantize(Decimal('0.01'))
+
+    def save(self, *args, **kwargs):
+        self.budget_min, self.budget_max = self.parse_budget(self.budget)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'budget' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'budget_min', 'budget_max'}
+        super().save(*args, **kwargs)
+
+
+class RequirementSearchTerm(models.Model):
+    """需求关键词倒排索引 - 词项在需求各检索字段中的加权出现次数，由 project.search_index 维护"""
+
+    term = models.CharField(max_length=64, verbose_name='词项')
+    requirement = models.ForeignKey(Requirement, on_delete=models.CASCADE, related_name='search_terms', verbose_name='需求')
+    weight = models.FloatField(default=1.0, verbose_name='权重', help_text='各字段词频 × 字段权重之和')
+
+    class Meta:
+        db_table = 'requirement_search_term'
+        verbose_name = '需求关键词索引'
+        verbose_name_plural = '需求关键词索引'
+        indexes = [
+            models.Index(fields=['term', 'requirement'], name='req_search_term_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} - 需求{self.requirement_id} ({self.weight})"
+
 
 class RequirementFavorite(models.Model):
     """需求收藏模型"""
@@ -0,0 +1,165 @@
+# project/search_index.py
+"""
+需求关键词检索索引
+
+需求的标题、简介、描述、目标、期望成果、联系人、联系方式及 tag1/tag2 文本分词后写入
+倒排表 requirement_search_term（分词规则与需求文档 BM25 索引一致：汉字二元组 + 字母数字串），
+由需求保存与标签变更信号增量维护。
+
+检索时只读取查询词项的倒排记录，耗时与命中的记录数相关，与需求总数无关：
+- 汉字二元组精确匹配，字母数字串按前缀匹配（"java" 可命中 "javascript"，"script" 不能；
+  与原模糊匹配的子串语义不同，无结果时由调用方回退为模糊匹配）
+- 需求须包含全部查询词项，按 字段权重 × 词频 × IDF 排序
+- 传入 queryset 时只读取其中需求的倒排记录（子查询），状态、组织、标签、预算等筛选在截取前生效
+- 索引为空（如上线后尚未执行 rebuild_requirement_search_index）时返回 None，调用方回退为模糊匹配
+"""
+import math
+import logging
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Q
+
+from read_search.lexical_index import tokenize
+from .models import Requirement, RequirementSearchTerm
+
+logger = logging.getLogger(__name__)
+
+# 检索字段权重
+FIELD_WEIGHTS = {
+    'title': 5.0,
+    'brief': 2.0,
+    'description': 1.0,
+    'goal': 1.0,
+    'expected_result': 1.0,
+    'contact_person': 1.0,
+    'contact_info': 1.0,
+}
+TAG_WEIGHT = 3.0
+
+
+def _is_cjk(term):
+    return '\u4e00' <= term[0] <= '\u9fff'
+
+
+class RequirementSearchIndex:
+    """需求关键词倒排索引"""
+
+    @staticmethod
+    def build_terms(requirement):
+        """
+        计算需求的词项权重
+
+        Returns:
+            dict: {词项: 权重}
+        """
+        weights = defaultdict(float)
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(requirement, field, '') or ''):
+                weights[term] += field_weight
+
+        # 使用 .all() 以复用调用方的 prefetch_related
+        tag_texts = [tag.value for tag in requirement.tag1.all()]
+        for tag in requirement.tag2.all():
+            tag_texts.extend([tag.category, tag.subcategory, tag.specialty])
+        for text in tag_texts:
+            for term in tokenize(text or ''):
+                weights[term] += TAG_WEIGHT
+        return weights
+
+    def index_requirement(self, requirement):
+        """重建单个需求的索引记录"""
+        weights = self.build_terms(requirement)
+        with transaction.atomic():
+            RequirementSearchTerm.objects.filter(requirement_id=requirement.pk).delete()
+            RequirementSearchTerm.objects.bulk_create(
+                [
+                    RequirementSearchTerm(term=term, requirement_id=requirement.pk, weight=weight)
+                    for term, weight in weights.items()
+                ],
+                batch_size=1000,
+            )
+        return len(weights)
+
+    def index_requirement_by_id(self, requirement_id):
+        requirement = Requirement.objects.filter(pk=requirement_id).first()
+        if requirement is None:
+            RequirementSearchTerm.objects.filter(requirement_id=requirement_id).delete()
+            return 0
+        return self.index_requirement(requirement)
+
+    @staticmethod
+    def query_terms(keyword):
+        """
+        查询词项；汉字单字无法与二元组索引匹配，有其他词项时忽略
+
+        Returns:
+            list: 词项列表，无可用词项时为空（调用方应回退为模糊匹配）
+        """
+        terms = set(tokenize(keyword))
+        return [term for term in terms if not (_is_cjk(term) and len(term) == 1)]
+
+    def search(self, keyword, queryset=None, limit=None):
+        """
+        关键词检索
+
+        Args:
+            keyword: 关键词
+            queryset: 需求查询集，只在其中检索（已应用调用方的筛选条件）；None 表示全部需求
+            limit: 按相关度截取的结果数，None 表示不截取
+
+        Returns:
+            list | None: 按相关度降序的需求ID列表；
+                关键词无可用词项、索引为空，或含字母数字词项且前缀匹配无结果时返回 None
+        """
+        terms = self.query_terms(keyword)
+        if not terms:
+            return None
+
+        cjk_terms = [term for term in terms if _is_cjk(term)]
+        prefix_terms = [term for term in terms if not _is_cjk(term)]
+
+        condition = Q(term__in=cjk_terms) if cjk_terms else Q()
+        for term in prefix_terms:
+            condition |= Q(term__startswith=term)
+
+        # 每个需求: {查询词项: 权重}
+        terms_qs = RequirementSearchTerm.objects.filter(condition)
+        if queryset is not None:
+            terms_qs = terms_qs.filter(requirement_id__in=queryset.order_by().values('pk'))
+
+        matched = defaultdict(lambda: defaultdict(float))
+        for requirement_id, term, weight in terms_qs.values_list('requirement_id', 'term', 'weight'):
+            if term in cjk_terms:
+                matched[requirement_id][term] += weight
+            for prefix in prefix_terms:
+                if term.startswith(prefix):
+                    matched[requirement_id][prefix] += weight
+
+        if not matched:
+            # 索引为空或字母数字串前缀匹配不到时，交由调用方按子串模糊匹配
+            if prefix_terms or not RequirementSearchTerm.objects.exists():
+                return None
+            return []
+
+        n_docs = len(matched)
+        doc_freqs = defaultdict(int)
+        for term_weights in matched.values():
+            for term in term_weights:
+                doc_freqs[term] += 1
+        idf = {term: math.log(1 + n_docs / df) for term, df in doc_freqs.items()}
+
+        scores = [
+            (requirement_id, sum(weight * idf[term] for term, weight in term_weights.items()))
+            for requirement_id, term_weights in matched.items()
+            if len(term_weights) == len(terms)
+        ]
+        if not scores and prefix_terms:
+            return None
+        scores.sort(key=lambda x: x[1], reverse=True)
+        if limit is not None:
+            scores = scores[:limit]
+        return [requirement_id for requirement_id, _ in scores]
+
+
+# 全局实例
+requirement_search_index = RequirementSearchIndex()
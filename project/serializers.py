@@ -8,7 +8,7 @@ from .models import Requirement, Resource, File, RequirementFavorite, get_requir
 from user.models import Tag1, Tag2, OrganizationUser
 from organization.models import Organization
 from common_utils import build_media_url
-from .mixins import TagValidationMixin, FileHandlingMixin, ProjectRelatedMixin, BaseFieldsMixin
+from .mixins import TagValidationMixin, FileHandlingMixin, ProjectRelatedMixin, BaseFieldsMixin, SparseFieldsMixin
 from audit.utils import AuditLogMixin
 import uuid
 import os
@@ -59,8 +59,8 @@ class FileSerializer(serializers.ModelSerializer):
         return None
 
 
-class ResourceSerializer(serializers.ModelSerializer):
-    """资源序列化器"""
+class ResourceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """资源序列化器（支持 fields / expand 稀疏字段）"""
     tag1 = serializers.SerializerMethodField()
     tag2 = serializers.SerializerMethodField()
     files = FileSerializer(many=True, read_only=True)
@@ -76,6 +76,17 @@ class ResourceSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+    expandable_fields = ('files',)
+    # 排序与游标分页依赖的列
+    base_columns = ('id', 'title', 'downloads', 'views', 'created_at')
+    field_query_plan = {
+        'tag1': {'prefetch_related': ['tag1']},
+        'tag2': {'prefetch_related': ['tag2']},
+        'files': {'prefetch_related': ['files']},
+        'create_person_name': {'columns': ['create_person'], 'select_related': ['create_person__user']},
+        'update_person_name': {'columns': ['update_person'], 'select_related': ['update_person__user']},
+    }
     
     def get_tag1(self, obj):
         """获取兴趣标签列表"""
@@ -301,8 +312,8 @@ class ResourceSimpleSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'title', 'type']
 
 
-class RequirementSerializer(ProjectRelatedMixin, serializers.ModelSerializer):
-    """需求序列化器（用于返回数据）"""
+class RequirementSerializer(SparseFieldsMixin, ProjectRelatedMixin, serializers.ModelSerializer):
+    """需求序列化器（用于返回数据，支持 fields / expand 稀疏字段）"""
     tag1 = serializers.SerializerMethodField()
     tag2 = serializers.SerializerMethodField()
     organization = OrganizationSimpleSerializer(read_only=True)
@@ -332,6 +343,27 @@ class RequirementSerializer(ProjectRelatedMixin, serializers.ModelSerializer):
             'evaluation_published', 'is_favorited', 'recommendation_reason', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'views', 'evaluation_published', 'is_favorited', 'created_at', 'updated_at']
+
+    expandable_fields = (
+        'resources', 'files', 'evaluation_criteria', 'related_projects', 'total_project_members', 'total_project'
+    )
+    # 排序、游标分页与推荐理由依赖的列
+    base_columns = ('id', 'title', 'status', 'views', 'created_at')
+    field_query_plan = {
+        'tag1': {'prefetch_related': ['tag1']},
+        'tag2': {'prefetch_related': ['tag2']},
+        'organization': {'columns': ['organization'], 'select_related': ['organization']},
+        'publish_people': {'columns': ['publish_people'], 'select_related': ['publish_people__user']},
+        'resources': {'prefetch_related': ['resources']},
+        'files': {'prefetch_related': ['files']},
+        'evaluation_criteria': {
+            'columns': ['evaluation_criteria'],
+            'select_related': ['evaluation_criteria'],
+            'prefetch_related': ['evaluation_criteria__indicators'],
+        },
+    }
+    # 由 load_related_projects 批量加载的字段
+    related_project_fields = {'related_projects', 'total_project_members', 'total_project'}
     
     def get_recommendation_reason(self, obj):
         """获取推荐理由"""
@@ -357,13 +389,15 @@ class RequirementSerializer(ProjectRelatedMixin, serializers.ModelSerializer):
         if obj.evaluation_criteria:
             try:
                 criteria = obj.evaluation_criteria
+                # 使用 .all() 以复用列表查询的 prefetch_related
+                indicators = criteria.indicators.all()
                 return {
                     'id': criteria.id,
                     'name': criteria.name,
                     'description': criteria.description,
                     'status': criteria.status,
-                    'indicator_count': criteria.indicators.count(),
-                    'total_weight': sum(indicator.weight for indicator in criteria.indicators.all()),
+                    'indicator_count': len(indicators),
+                    'total_weight': sum(indicator.weight for indicator in indicators),
                     'created_at': criteria.created_at.strftime('%Y-%m-%d %H:%M:%S') if criteria.created_at else None
                 }
             except Exception as e:
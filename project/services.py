@@ -1,35 +1,33 @@
 import os
+import re
 import json
+import hashlib
 import logging
-import time
 from openai import OpenAI
 from django.conf import settings
 from langchain_core.documents import Document
-from pymilvus import connections, Collection, utility, DataType, FieldSchema, CollectionSchema
+from .vector_store import get_vector_store, COLLECTION_EMBEDDINGS, COLLECTION_RAW_DOCS
+from .trending import trending_index
 
 logger = logging.getLogger(__name__)
 
-# 配置 Milvus 连接
-MILVUS_HOST = os.getenv('MILVUS_HOST') or getattr(settings, 'MILVUS_HOST', '10.160.64.18')
-MILVUS_PORT = str(os.getenv('MILVUS_PORT') or getattr(settings, 'MILVUS_PORT', '19530'))
-MILVUS_ALIAS = 'default'
-MILVUS_CONNECT_TIMEOUT = float(os.getenv('MILVUS_CONNECT_TIMEOUT', '1.0'))
-MILVUS_UNAVAILABLE_TTL = int(os.getenv('MILVUS_UNAVAILABLE_TTL', '30'))
-_MILVUS_UNAVAILABLE_KEY = 'milvus_connection_unavailable_until'
-
-# 向量集合名称
-COLLECTION_EMBEDDINGS = 'project_embeddings'
-COLLECTION_RAW_DOCS = 'project_raw_docs'
-
 # 默认使用 DashScope text-embedding-v4
 DEFAULT_EMBEDDING_MODEL = "text-embedding-v4"
 DEFAULT_EMBEDDING_DIM = 1536
 
+# 推荐候选集缓存有效期（秒），键为 recommend_candidates_{user_id}
+RECOMMEND_CANDIDATES_TIMEOUT = 600
+
 class EmbeddingService:
     """
     统一的向量化服务类，提供文本切块和向量化功能
     统一使用 DashScope text-embedding-v4 模型 (Local Version for Server_Project_ZH/project)
     """
+
+    @staticmethod
+    def cache_key(text):
+        # 内置 hash() 每个进程随机加盐，跨 worker 无法命中缓存，这里使用稳定的内容摘要
+        return f"embedding:v4:{hashlib.md5(text.encode('utf-8')).hexdigest()}"
     
     @staticmethod
     def get_dashscope_client():
@@ -91,9 +89,9 @@ class EmbeddingService:
             uncached_texts = []
             uncached_indices = []
             
+            cached_map = cache.get_many([EmbeddingService.cache_key(text) for text in texts])
             for i, text in enumerate(texts):
-                cache_key = f"embedding:v4:{hash(text)}" 
-                cached = cache.get(cache_key)
+                cached = cached_map.get(EmbeddingService.cache_key(text))
                 if cached:
                     cached_embeddings.append((i, cached))
                 else:
@@ -125,8 +123,7 @@ class EmbeddingService:
                 
                 # 写入缓存
                 if use_cache:
-                    cache_key = f"embedding:v4:{hash(uncached_texts[i])}"
-                    cache.set(cache_key, embedding, timeout=86400 * 7) # 7天
+                    cache.set(EmbeddingService.cache_key(uncached_texts[i]), embedding, timeout=86400 * 7) # 7天
             
             # 合并结果
             all_embeddings = cached_embeddings + new_embeddings
@@ -152,7 +149,7 @@ class RecommendationService:
     @staticmethod
     def get_dynamic_tags(user_id, min_score=2.0):
         """获取用户动态标签 (高分标签)"""
-        from django.core.cache import cache
+        from common_utils import get_cache_redis_client
         
         dynamic_tag1_ids = [] # 兴趣/领域
         dynamic_tag2_ids = [] # 技能
@@ -160,11 +157,7 @@ class RecommendationService:
         try:
             redis_key = f"user:dynamic_tags:{user_id}"
             # 获取 Redis client
-            redis_client = None
-            if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                redis_client = cache.client.get_client()
-            elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                redis_client = cache._cache.get_client()
+            redis_client = get_cache_redis_client()
                 
             if redis_client:
                 all_tags = redis_client.hgetall(redis_key)
@@ -377,8 +370,22 @@ class RecommendationService:
             three_days_ago = now - timedelta(days=3)
             seven_days_ago = now - timedelta(days=7)
             
+            trending_scores = {}
             if not combined_skill_ids and not combined_interest_ids:
-                # 冷启动 B 路
+                # 冷启动 B 路：热度榜（O(log n) 区间读取）中的需求排在前面，
+                # 榜单不足 200 条（如冷清时段、刚上线）或不可用时由全表新鲜度与浏览量打分补齐
+                try:
+                    trending = trending_index.top(200)
+                    if trending:
+                        existing = set(base_qs.filter(id__in=[rid for rid, _ in trending]).values_list('id', flat=True))
+                        top_score = trending[0][1] or 1.0
+                        # 热度归一化到与原冷启动静态分相近的区间 (0~50]
+                        trending_scores = {
+                            rid: score / top_score * 50 for rid, score in trending if rid in existing
+                        }
+                except Exception as e:
+                    logger.warning(f"读取需求热度榜失败: {e}")
+
                 b_qs = base_qs.annotate(
                     freshness_score=Case(
                         When(created_at__gte=three_days_ago, then=50),
@@ -404,9 +411,13 @@ class RecommendationService:
                     static_score=F('skill_score') + F('interest_score') + F('freshness_score') + F('hot_score')
                 ).order_by('-static_score', '-created_at')
 
-            # 获取 B 路 Top 200
-            path_b_results = list(b_qs.values('id', 'static_score')[:200])
-            path_b_map = {item['id']: item['static_score'] for item in path_b_results}
+            # 获取 B 路 Top 200（热度榜中的需求使用热度分，其余保留静态分）
+            path_b_map = dict(trending_scores)
+            if len(path_b_map) < 200:
+                for item in b_qs.values('id', 'static_score')[:200]:
+                    if len(path_b_map) >= 200:
+                        break
+                    path_b_map.setdefault(item['id'], item['static_score'])
             
             # === 4. 双路合并与打分 ===
             # 需要计算 A 路召回但未在 B 路 Top 200 中的需求的 static_score
@@ -468,66 +479,18 @@ def generate_embedding(text):
         return []
 
 def ensure_milvus_connection():
-    from django.core.cache import cache
-
-    unavailable_until = cache.get(_MILVUS_UNAVAILABLE_KEY)
-    now = time.time()
-    if unavailable_until and now < float(unavailable_until):
-        logger.warning("Milvus is temporarily marked unavailable, skip connect attempt")
-        return False
-
-    try:
-        connections.connect(
-            alias=MILVUS_ALIAS,
-            host=MILVUS_HOST,
-            port=MILVUS_PORT,
-            timeout=MILVUS_CONNECT_TIMEOUT
-        )
-        cache.delete(_MILVUS_UNAVAILABLE_KEY)
-        return True
-    except Exception as e:
-        logger.error(f"Failed to connect to Milvus: {e}")
-        cache.set(_MILVUS_UNAVAILABLE_KEY, now + MILVUS_UNAVAILABLE_TTL, timeout=MILVUS_UNAVAILABLE_TTL)
-        return False
+    """确保向量存储后端可用（Milvus 连接失败后短时间内不再重试）"""
+    return get_vector_store().connect()
 
 def get_or_create_collection(collection_name, dim=1536):
+    """获取集合句柄，集合不存在时按 COLLECTION_SPECS 创建；后端不可用时返回 None"""
     if not ensure_milvus_connection():
         return None
-    
-    if utility.has_collection(collection_name):
-        return Collection(collection_name)
-    
-    # 定义 Schema
-    if collection_name == COLLECTION_EMBEDDINGS:
-        fields = [
-            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-            FieldSchema(name="project_id", dtype=DataType.INT64),
-            FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
-            FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=65535)
-        ]
-    elif collection_name == COLLECTION_RAW_DOCS:
-        fields = [
-            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-            FieldSchema(name="project_id", dtype=DataType.INT64),
-            FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dim),
-            FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=65535),
-            FieldSchema(name="chunk_index", dtype=DataType.INT64)
-        ]
-    else:
-        raise ValueError(f"Unknown collection: {collection_name}")
-        
-    schema = CollectionSchema(fields, f"{collection_name} schema")
-    collection = Collection(collection_name, schema)
-    
-    # 创建索引
-    index_params = {
-        "metric_type": "COSINE",
-        "index_type": "IVF_FLAT",
-        "params": {"nlist": 128}
-    }
-    collection.create_index(field_name="vector", index_params=index_params)
-    collection.load()
-    return collection
+
+    store = get_vector_store()
+    if not store.has_collection(collection_name):
+        store.create_collection(collection_name, dim=dim)
+    return store.collection(collection_name)
 
 def sync_requirement_vectors(requirement):
     """
@@ -573,13 +536,11 @@ def sync_requirement_vectors(requirement):
             logger.warning(f"Milvus unavailable, skip semantic vector sync for requirement {requirement.id}")
             return
         
-        data = [
-            [requirement.id],  # project_id
-            [vector],          # vector
-            [full_text[:65535]]  # content (Use full text up to 65535)
-        ]
-        
-        collection.insert(data)
+        collection.insert([{
+            "project_id": requirement.id,
+            "vector": vector,
+            "content": full_text[:65535],  # content (Use full text up to 65535)
+        }])
         collection.flush() # Ensure data is written
         logger.info(f"Successfully synced vectors for requirement {requirement.id}")
         
@@ -587,47 +548,165 @@ def sync_requirement_vectors(requirement):
         logger.error(f"Error syncing vectors for requirement {requirement.id}: {e}")
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import fitz  # PyMuPDF
-import docx  # python-docx
+from process_pdf.extraction_service import extraction_service
 
 def extract_text_from_file(file_path):
     """
     根据文件扩展名提取文本
     支持: .pdf, .docx, .doc (视作docx尝试或文本), .txt, .md
+    大 PDF 由 DocumentExtractionService 按页段在进程池中并行解析
     """
-    if not os.path.exists(file_path):
-        return ""
-    
+    return extraction_service.extract_text(file_path)
+
+# 有效状态列表 (Raw Docs 仅对这些状态的需求建立索引)
+RAW_DOCS_VALID_STATUSES = ['under_review', 'in_progress', 'completed', 'paused']
+
+# Raw Docs 数据版本号 (每个需求一个计数器)，检索结果缓存以此判断是否失效
+RAW_DOCS_VERSION_KEY = 'raw_docs_version:{}'
+
+def bump_raw_docs_version(requirement_id):
+    """需求的 Raw Docs 发生写入/删除后递增版本号，使相关检索缓存自然失效"""
+    from django.core.cache import cache
+
+    key = RAW_DOCS_VERSION_KEY.format(requirement_id)
     try:
-        ext = os.path.splitext(file_path)[1].lower()
-        text = ""
-        
-        if ext == '.pdf':
-            with fitz.open(file_path) as doc:
-                for page in doc:
-                    text += page.get_text() + "\n"
-                    
-        elif ext in ['.docx', '.doc']:
-            # 注意: .doc 实际上 python-docx 不支持旧版二进制 Word，但如果是 docx 改名则支持
-            # 如果是纯文本内容，尝试用 python-docx 读取
-            try:
-                doc = docx.Document(file_path)
-                text = "\n".join([p.text for p in doc.paragraphs])
-            except Exception:
-                # 兜底：尝试作为文本读取
-                logger.warning(f"Failed to read {file_path} with python-docx, trying text fallback")
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
-                    
-        else:
-            # 默认尝试文本读取 (txt, md, etc.)
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
-                
-        return text
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Failed to bump raw docs version for requirement {requirement_id}: {e}")
+        cache.delete(key)
+
+def get_raw_docs_versions(requirement_ids):
+    """批量获取需求的 Raw Docs 版本号 (一次缓存往返)，未写入过的需求版本为 0"""
+    from django.core.cache import cache
+
+    keys = {RAW_DOCS_VERSION_KEY.format(rid): rid for rid in requirement_ids}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception:
+        found = {}
+    return {rid: int(found.get(key) or 0) for key, rid in keys.items()}
+
+def build_raw_docs_text(requirement):
+    """
+    文档入库流水线 - 提取阶段
+    有文件则并行提取所有关联文件的文本，无文件 (或提取失败) 时使用 Description + Metadata 兜底
+    """
+    # 1. 获取所有关联文件 (过滤文件夹)
+    valid_files = []
+    if requirement.pk:
+        for f in requirement.files.all():
+            if not f.is_folder and f.real_path:
+                valid_files.append(f)
+
+    logger.info(f"Requirement {requirement.id} checking files: found {len(valid_files)} valid files.")
+
+    full_text_content = ""
+
+    # 2. 提取内容 (多文件在进程池中并行提取)
+    if valid_files:
+        logger.info(f"Requirement {requirement.id} has {len(valid_files)} files. Extracting text...")
+        file_paths = []
+        for file_obj in valid_files:
+            # 构建绝对路径
+            if os.path.isabs(file_obj.real_path):
+                file_paths.append(file_obj.real_path)
+            else:
+                file_paths.append(os.path.join(settings.MEDIA_ROOT, file_obj.real_path))
+        file_texts = extraction_service.extract_texts(file_paths)
+        parts = []
+        for file_obj, file_abs_path in zip(valid_files, file_paths):
+            file_text = file_texts.get(file_abs_path)
+            if file_text:
+                parts.append(f"\n\n--- File: {file_obj.name} ---\n{file_text}")
+        full_text_content = "".join(parts)
+
+    # 3. 如果没有文件内容 (无文件或提取失败)，使用 Metadata 兜底
+    if not full_text_content.strip():
+        logger.info(f"Requirement {requirement.id} has no file content. Using description fallback.")
+        tags1 = [t.value for t in requirement.tag1.all()]
+        tags2 = [t.post for t in requirement.tag2.all()]
+        full_text_content = (
+            f"Title: {requirement.title}\n"
+            f"Brief: {requirement.brief}\n"
+            f"Goal: {requirement.goal}\n"
+            f"Expected Result: {requirement.expected_result}\n"
+            f"Description: {requirement.description}"
+        )
+        if tags1 or tags2:
+            full_text_content += f"\nTags: {', '.join(tags1 + tags2)}"
+
+    return full_text_content
+
+def split_raw_docs_text(text):
+    """
+    文档入库流水线 - 切块阶段 (全局唯一的文档切块器)
+    """
+    if not text:
+        return []
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", "。", "！", "!", ".", " "]
+    )
+    # 过滤太短的
+    return [chunk for chunk in splitter.split_text(text) if len(chunk.strip()) >= 10]
+
+class IncompleteEmbeddingError(Exception):
+    """一批切块中有向量获取失败（可重试），该批不写入"""
+
+
+def insert_raw_docs_chunks(requirement_id, chunks, start_index=0, collection=None, replace=False):
+    """
+    文档入库流水线 - 向量化 + 写入阶段
+    批量向量化一批切块并写入 project_raw_docs，chunk_index 从 start_index 开始编号
+    全部切块向量获取成功后才写入；replace=True 时写入前删除该需求的旧数据，向量获取失败则保留旧数据
+
+    Returns:
+        int: 写入的切块数 (等于 len(chunks))
+
+    Raises:
+        IncompleteEmbeddingError: 有切块向量获取失败，整批不写入，调用方可从该批重试
+    """
+    if not chunks:
+        return 0
+
+    collection = collection or get_or_create_collection(COLLECTION_RAW_DOCS)
+    if collection is None:
+        raise ConnectionError("Milvus unavailable")
+
+    # 批量获取向量 (自带缓存和批量请求)
+    vectors = EmbeddingService.get_embeddings(chunks, use_cache=True)
+
+    # 获取失败的向量为 None 或 空列表
+    failed = sum(1 for vec in vectors if not vec)
+    if failed or len(vectors) != len(chunks):
+        raise IncompleteEmbeddingError(
+            f"{failed or len(chunks) - len(vectors)}/{len(chunks)} chunks failed to embed "
+            f"for requirement {requirement_id} (chunk_index from {start_index})"
+        )
+
+    if replace:
+        delete_requirement_vectors(requirement_id, [COLLECTION_RAW_DOCS])
+
+    final_vectors = vectors
+    final_chunks = [chunk[:65535] for chunk in chunks]
+    indices = list(range(start_index, start_index + len(chunks)))
+
+    collection.insert([
+        {"project_id": requirement_id, "vector": vec, "content": chunk, "chunk_index": idx}
+        for vec, chunk, idx in zip(final_vectors, final_chunks, indices)
+    ])
+
+    # 同步写入 BM25 词法索引，供混合检索使用
+    try:
+        from read_search.lexical_index import lexical_index
+        lexical_index.index_chunks(requirement_id, final_chunks, indices)
     except Exception as e:
-        logger.error(f"Error extracting text from {file_path}: {e}")
-        return ""
+        logger.error(f"Error updating lexical index for requirement {requirement_id}: {e}")
+
+    bump_raw_docs_version(requirement_id)
+    return len(final_vectors)
 
 def sync_raw_docs_auto(requirement):
     """
@@ -649,124 +728,44 @@ def sync_raw_docs_auto(requirement):
         logger.error(f"Requirement {requirement.id} not found in sync_raw_docs_auto: {e}")
         return
 
-    # 有效状态列表
-    VALID_STATUSES = ['under_review', 'in_progress', 'completed', 'paused']
-    if requirement.status not in VALID_STATUSES:
+    if requirement.status not in RAW_DOCS_VALID_STATUSES:
         delete_requirement_vectors(requirement.id, [COLLECTION_RAW_DOCS])
         return
 
     try:
-        # 1. 获取所有关联文件 (过滤文件夹)
-        # 注意: 需要确保 files 关联已保存
-        valid_files = []
-        if requirement.pk:
-            for f in requirement.files.all():
-                if not f.is_folder and f.real_path:
-                     valid_files.append(f)
-        
-        logger.info(f"Requirement {requirement.id} checking files: found {len(valid_files)} valid files.")
-        
-        full_text_content = ""
-        
-        # 2. 提取内容
-        if valid_files:
-            logger.info(f"Requirement {requirement.id} has {len(valid_files)} files. Extracting text...")
-            for file_obj in valid_files:
-                # 构建绝对路径
-                if os.path.isabs(file_obj.real_path):
-                    file_abs_path = file_obj.real_path
-                else:
-                    file_abs_path = os.path.join(settings.MEDIA_ROOT, file_obj.real_path)
-                file_text = extract_text_from_file(file_abs_path)
-                if file_text:
-                    full_text_content += f"\n\n--- File: {file_obj.name} ---\n{file_text}"
-        
-        # 3. 如果没有文件内容 (无文件或提取失败)，使用 Metadata 兜底
-        if not full_text_content.strip():
-            logger.info(f"Requirement {requirement.id} has no file content. Using description fallback.")
-            tags1 = [t.value for t in requirement.tag1.all()]
-            tags2 = [t.post for t in requirement.tag2.all()]
-            full_text_content = (
-                f"Title: {requirement.title}\n"
-                f"Brief: {requirement.brief}\n"
-                f"Goal: {requirement.goal}\n"
-                f"Expected Result: {requirement.expected_result}\n"
-                f"Description: {requirement.description}"
-            )
-            if tags1 or tags2:
-                full_text_content += f"\nTags: {', '.join(tags1 + tags2)}"
-        
-        # 4. 执行同步 (切片 + 向量化 + 存储)
-        # 复用 sync_raw_docs_from_text 的逻辑，因为它本质上就是处理一段长文本
+        full_text_content = build_raw_docs_text(requirement)
+        # 执行同步 (切片 + 向量化 + 存储)
         sync_raw_docs_from_text(requirement.id, full_text_content)
-        
+    except IncompleteEmbeddingError:
+        raise
     except Exception as e:
         logger.error(f"Error in sync_raw_docs_auto for requirement {requirement.id}: {e}")
 
 def sync_raw_docs_from_text(requirement_id, text):
     """
-    当没有文件时，将纯文本描述切片并存入 project_raw_docs
+    将一段长文本切片、向量化并存入 project_raw_docs (覆盖该需求的旧数据)
+    有切块向量获取失败时保留旧数据并抛出 IncompleteEmbeddingError，由调用方重试
     """
     if not text or not requirement_id:
         return
         
     try:
-        # 1. 文本切片
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", "。", "！", "!", ".", " "]
-        )
-        chunks = splitter.split_text(text)
-        
+        chunks = split_raw_docs_text(text)
         if not chunks:
             return
 
-        # 2. 生成向量 (使用 EmbeddingService 批量处理)
-        # 过滤太短的
-        valid_chunks = [chunk for chunk in chunks if len(chunk.strip()) >= 10]
-        
-        if not valid_chunks:
-            return
-
-        # 批量获取向量 (自带缓存和批量请求)
-        vectors = EmbeddingService.get_embeddings(valid_chunks, use_cache=True)
-        
-        # 过滤获取失败的向量 (None 或 空列表)
-        final_vectors = []
-        final_chunks = []
-        indices = []
-        
-        for i, vec in enumerate(vectors):
-            if vec and len(vec) > 0:
-                final_vectors.append(vec)
-                final_chunks.append(valid_chunks[i][:65535])
-                indices.append(i)
-        
-        if not final_vectors:
-            return
-            
-        # 3. 存入 Milvus
-        # 先删除旧的
-        delete_requirement_vectors(requirement_id, [COLLECTION_RAW_DOCS])
-        
         collection = get_or_create_collection(COLLECTION_RAW_DOCS)
         if collection is None:
             logger.warning(f"Milvus unavailable, skip raw docs sync for requirement {requirement_id}")
             return
-        
-        pids = [requirement_id] * len(final_vectors)
-        data = [
-            pids,
-            final_vectors,
-            final_chunks,
-            indices
-        ]
-        
-        collection.insert(data)
+
+        # 先删除旧的再写入
+        inserted = insert_raw_docs_chunks(requirement_id, chunks, 0, collection, replace=True)
         collection.flush()
-        logger.info(f"Synced {len(final_vectors)} text chunks for requirement {requirement_id}")
+        logger.info(f"Synced {inserted} text chunks for requirement {requirement_id}")
         
+    except IncompleteEmbeddingError:
+        raise
     except Exception as e:
         logger.error(f"Error syncing raw text docs for requirement {requirement_id}: {e}")
 
@@ -780,12 +779,15 @@ def delete_requirement_vectors(requirement_id, collection_names=None):
     if collection_names is None:
         collection_names = [COLLECTION_EMBEDDINGS, COLLECTION_RAW_DOCS]
         
+    store = get_vector_store()
     for name in collection_names:
         try:
-            if utility.has_collection(name):
-                collection = Collection(name)
-                expr = f"project_id == {requirement_id}"
-                collection.delete(expr)
+            if store.has_collection(name):
+                store.delete(name, [requirement_id])
+                if name == COLLECTION_RAW_DOCS:
+                    from read_search.lexical_index import lexical_index
+                    lexical_index.delete_requirement(requirement_id)
+                    bump_raw_docs_version(requirement_id)
                 logger.info(f"Deleted vectors for requirement {requirement_id} in {name}")
         except Exception as e:
             logger.error(f"Error deleting vectors for requirement {requirement_id} in {name}: {e}")
@@ -797,28 +799,15 @@ def search_similar_requirements(query_vector, top_k=200):
     if not ensure_milvus_connection():
         return []
     try:
-        collection = Collection(COLLECTION_EMBEDDINGS)
-        collection.load()
-        
-        search_params = {
-            "metric_type": "COSINE",
-            "params": {"nprobe": 10},
-        }
-        
-        results = collection.search(
-            data=[query_vector],
-            anns_field="vector",
-            param=search_params,
-            limit=top_k,
-            expr=None,
-            output_fields=["id"]
+        results = get_vector_store().search(
+            COLLECTION_EMBEDDINGS, [query_vector], top_k, output_fields=["project_id"]
         )
         
-        # Parse results: [(id, score), ...]
+        # Parse results: [(project_id, score), ...]
         ret = []
         for hits in results:
             for hit in hits:
-                ret.append((hit.id, hit.score))
+                ret.append((hit["project_id"], hit["score"]))
         return ret
     except Exception as e:
         logger.error(f"Milvus search failed: {e}")
@@ -834,13 +823,7 @@ def get_vectors_by_ids(ids):
     if not ensure_milvus_connection():
         return []
     try:
-        collection = Collection(COLLECTION_EMBEDDINGS)
-        collection.load()
-        
-        res = collection.query(
-            expr=f"project_id in {ids}",
-            output_fields=["project_id", "vector"]
-        )
+        res = get_vector_store().query(COLLECTION_EMBEDDINGS, ids, output_fields=["project_id", "vector"])
         # res is a list of dicts: [{'project_id': 1, 'vector': [...]}, ...]
         return res
     except Exception as e:
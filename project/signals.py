@@ -2,11 +2,23 @@ from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from .models import Requirement
 from .tasks import sync_requirement_vectors_task, sync_raw_docs_auto_task, delete_requirement_vectors_task
+from .search_index import requirement_search_index
 import logging
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
+
+def _reindex_search_terms(requirement_id):
+    """事务提交后重建需求关键词索引，索引失败不影响业务写入"""
+    def run():
+        try:
+            requirement_search_index.index_requirement_by_id(requirement_id)
+        except Exception as e:
+            logger.error(f"更新需求关键词索引失败: {e}")
+    transaction.on_commit(run)
+
+
 @receiver(post_save, sender=Requirement)
 def handle_requirement_save(sender, instance, created, **kwargs):
     """
@@ -20,6 +32,7 @@ def handle_requirement_save(sender, instance, created, **kwargs):
     # 使用 Celery 异步任务 + on_commit 确保事务提交后执行
     transaction.on_commit(lambda: sync_requirement_vectors_task.delay(instance.id))
     transaction.on_commit(lambda: sync_raw_docs_auto_task.delay(instance.id))
+    _reindex_search_terms(instance.id)
 
 @receiver(post_delete, sender=Requirement)
 def handle_requirement_delete(sender, instance, **kwargs):
@@ -44,13 +57,22 @@ def handle_tags_change(sender, instance, **kwargs):
         transaction.on_commit(lambda: sync_requirement_vectors_task.delay(instance.id))
         # Tags 变化也可能影响 fallback text (如果无文件模式下)
         transaction.on_commit(lambda: sync_raw_docs_auto_task.delay(instance.id))
+        # 标签文本参与关键词检索（反向操作时 instance 为标签，pk_set 为需求ID）
+        if kwargs.get('reverse'):
+            for requirement_id in kwargs.get('pk_set') or []:
+                _reindex_search_terms(requirement_id)
+        else:
+            _reindex_search_terms(instance.id)
 
 # 监听 M2M 字段变化 (Files)
 @receiver(m2m_changed, sender=Requirement.files.through)
 def handle_files_change(sender, instance, **kwargs):
     """
     当关联文件发生变化时，重新同步 Raw Docs
+    process_pdf 上传入口会自行创建入库任务，并通过 _skip_raw_docs_sync 标记跳过这里的重复同步
     """
+    if getattr(instance, '_skip_raw_docs_sync', False):
+        return
     if kwargs.get('action') in ['post_add', 'post_remove', 'post_clear']:
         logger.info(f"Requirement files changed: {instance.id}")
         transaction.on_commit(lambda: sync_raw_docs_auto_task.delay(instance.id))
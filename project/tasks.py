@@ -1,13 +1,14 @@
 from celery import shared_task
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import F, Q
+from django.db.models import Q
+from common_utils import get_cache_redis_client, set_refreshable_cache
 from .models import Requirement
-from .services import get_or_create_collection, delete_requirement_vectors, sync_requirement_vectors, sync_raw_docs_auto
+from .view_counter import view_counter
+from .services import RECOMMEND_CANDIDATES_TIMEOUT, get_or_create_collection, delete_requirement_vectors, sync_requirement_vectors, sync_raw_docs_auto, bump_raw_docs_version, IncompleteEmbeddingError
 import logging
 import os
 import time
-from pymilvus import utility
 
 logger = logging.getLogger(__name__)
 
@@ -19,84 +20,17 @@ def sync_requirement_views_to_db():
     """
     定时任务：将 Redis 中的需求浏览量缓冲同步回 MySQL
     建议执行频率：每 5 分钟执行一次
+    
+    只处理脏集合中有增量的需求，每批一条 UPDATE ... CASE 语句；
+    取走增量与累加均为 Lua 原子操作，同步期间的新增浏览量计入下一次同步。
     """
     logger.info("Starting sync_requirement_views_to_db task...")
     try:
-        # 1. 扫描 Redis 中所有浏览量缓冲的 key
-        # 注意：keys 命令在生产环境慎用，如果 key 数量巨大建议使用 scan_iter
-        # pattern: requirement_views_buffer_*
-        if hasattr(cache, 'keys'):
-            keys = cache.keys("requirement_views_buffer_*")
-        elif hasattr(cache, 'iter_keys'):
-            keys = list(cache.iter_keys("requirement_views_buffer_*"))
-        else:
-            # 如果 cache backend 不支持 keys/iter_keys (如 Memcached)，则无法自动扫描
-            # 需要在写入时维护一个 key 集合，这里假设是 Redis
-            # 尝试使用 django-redis 的原生 client
-            try:
-                from django_redis import get_redis_connection
-                con = get_redis_connection("default")
-                # 使用 scan_iter 避免阻塞
-                keys = [k.decode('utf-8') for k in con.scan_iter("requirement_views_buffer_*")]
-            except ImportError:
-                logger.warning("django-redis not installed or keys not supported, skipping sync.")
-                return "Skipped (backend not supported)"
-
-        if not keys:
+        _drain_legacy_view_buffers()
+        count = view_counter.flush()
+        if not count:
             logger.info("No views to sync.")
             return "No views to sync"
-
-        count = 0
-        for key in keys:
-            try:
-                # 解析 requirement_id
-                # key format: requirement_views_buffer_123
-                # 注意：django-redis 的 keys 可能会带上前缀 (prefix:version:key)
-                # 这里做简单处理，提取最后一部分数字
-                import re
-                match = re.search(r'requirement_views_buffer_(\d+)', key)
-                if not match:
-                    continue
-                
-                req_id = int(match.group(1))
-                
-                # 获取并删除 key (原子操作 getset 或者 get + delete)
-                # 为防止并发丢失，使用 getset (getset 将 key 设为 0 并返回旧值)
-                # 但 cache 接口通常没有 getset，这里使用 get + delete 的简单策略
-                # 风险：在 get 和 delete 之间如果有新写入，会丢失这部分计数
-                # 优化策略：使用 pipeline 或者 lua 脚本，或者只 decr
-                
-                # 简单策略：读取 -> 数据库 + N -> Redis decr N
-                # 这样即使有新写入，也只会保留在 Redis 中等待下次同步
-                
-                # 获取当前缓冲值
-                views_to_add = cache.get(key)
-                if not views_to_add:
-                    continue
-                
-                views_to_add = int(views_to_add)
-                
-                if views_to_add > 0:
-                    # 更新数据库 (F 表达式原子更新)
-                    Requirement.objects.filter(id=req_id).update(views=F('views') + views_to_add)
-                    
-                    # Redis 中减去已同步的值 (decr)
-                    try:
-                        cache.decr(key, views_to_add)
-                        # 如果减到 0 或负数，删除 key 以节省空间
-                        # (由于并发，可能减完后变成负数或者还有剩余，这里简单判断)
-                        new_val = cache.get(key)
-                        if new_val is not None and int(new_val) <= 0:
-                            cache.delete(key)
-                    except Exception:
-                        # 如果不支持 decr，直接 delete (会有微小丢失风险)
-                        cache.delete(key)
-                    
-                    count += 1
-            except Exception as e:
-                logger.error(f"Error syncing key {key}: {e}")
-                continue
-                
         logger.info(f"Synced views for {count} requirements.")
         return f"Synced {count} requirements"
         
@@ -105,6 +39,58 @@ def sync_requirement_views_to_db():
         return f"Error: {e}"
 
 
+LEGACY_VIEWS_DRAINED_KEY = 'requirement_views_legacy_drained'
+
+# 原子地读取并删除一个旧缓冲键（旧节点仍在写入时，读取与删除之间的增量不会丢失）
+_LEGACY_TAKE_SCRIPT = """
+local v = redis.call('GET', KEYS[1])
+if v then
+    redis.call('DEL', KEYS[1])
+end
+return v
+"""
+
+
+def _drain_legacy_view_buffers():
+    """
+    迁移旧版 requirement_views_buffer_{id} 缓存键中尚未写库的浏览量
+
+    每个旧键由 Lua 脚本原子地取走；写库失败时增量放回新缓冲（由 flush 写库），
+    全部写库成功后才记录完成标记，之前每次同步都会继续迁移剩余的旧键。
+    """
+    if cache.get(LEGACY_VIEWS_DRAINED_KEY):
+        return
+    try:
+        import re
+        keys = list(cache.iter_keys("requirement_views_buffer_*"))
+        client = get_cache_redis_client()
+        if client is None:
+            raise ConnectionError("Redis client not available")
+        take = client.register_script(_LEGACY_TAKE_SCRIPT)
+    except Exception as e:
+        logger.warning(f"Skip draining legacy view buffers: {e}")
+        return
+
+    deltas = {}
+    for key in keys:
+        match = re.search(r'requirement_views_buffer_(\d+)', key)
+        if not match:
+            continue
+        raw = take(keys=[cache.client.make_key(key)])
+        views = cache.client.decode(raw) if raw is not None else 0
+        if views:
+            rid = int(match.group(1))
+            deltas[rid] = deltas.get(rid, 0) + int(views)
+    if deltas:
+        try:
+            view_counter.apply_to_db(deltas)
+        except Exception:
+            view_counter.restore(deltas)
+            raise
+    cache.set(LEGACY_VIEWS_DRAINED_KEY, 1, timeout=None)
+    logger.info(f"Drained legacy view buffers for {len(deltas)} requirements.")
+
+
 @shared_task
 def sync_all_requirement_vectors():
     """
@@ -125,31 +111,25 @@ def sync_all_requirement_vectors():
     for col_name in [COLLECTION_EMBEDDINGS, COLLECTION_RAW_DOCS]:
         try:
             collection = get_or_create_collection(col_name)
+            if collection is None:
+                logger.warning(f"Vector store unavailable, skip syncing {col_name}")
+                continue
             
             # 获取所有 project_id
-            # 使用 Query Iterator 处理大数据集
-            # 假设数据量在万级以上，使用 iterator 分批获取
+            # 假设数据量在万级以上，分批遍历
             milvus_pids = set()
-            iterator = collection.query_iterator(
-                batch_size=1000, 
-                expr="id > 0", 
-                output_fields=["project_id"]
-            )
-            
-            while True:
-                result = iterator.next()
-                if not result:
-                    iterator.close()
-                    break
-                for r in result:
+            for batch in collection.iterate(output_fields=["project_id"], batch_size=1000):
+                for r in batch:
                     milvus_pids.add(r['project_id'])
             
             # 1. 找出需要删除的 (Milvus 有，但 MySQL 没有或无效)
             to_delete = milvus_pids - valid_ids_set
             if to_delete:
                 logger.info(f"Found {len(to_delete)} stale records in {col_name}, deleting...")
-                ids_str = ','.join(str(pid) for pid in to_delete)
-                collection.delete(f"project_id in [{ids_str}]")
+                collection.delete(to_delete)
+                if col_name == COLLECTION_RAW_DOCS:
+                    for pid in to_delete:
+                        bump_raw_docs_version(pid)
                 
             # 2. 找出需要补全的 (MySQL 有，但 Milvus 没有)
             # 仅针对 project_embeddings (推荐库) 进行自动补全
@@ -229,14 +209,17 @@ def sync_requirement_vectors_task(requirement_id):
     except Exception as e:
         logger.error(f"Error in sync_requirement_vectors_task: {e}")
 
-@shared_task
+@shared_task(autoretry_for=(IncompleteEmbeddingError,), retry_backoff=True, max_retries=3)
 def sync_raw_docs_auto_task(requirement_id):
     """
     异步同步需求 Raw Docs (QA)
+    切块向量获取失败时保留旧数据并重试
     """
     try:
         req = Requirement.objects.get(id=requirement_id)
         sync_raw_docs_auto(req)
+    except IncompleteEmbeddingError:
+        raise
     except Requirement.DoesNotExist:
         logger.warning(f"Requirement {requirement_id} not found for raw docs sync")
     except Exception as e:
@@ -255,88 +238,54 @@ def delete_requirement_vectors_task(requirement_id):
 @shared_task
 def update_user_dynamic_tags_task(user_id, requirement_id, action_type):
     """
-    更新用户动态标签权重
-    action_type: 'view' (+1), 'favorite' (+3), 'apply' (+5)
+    更新用户动态标签权重（兼容入口）
+    行为事件已改为写入 Redis Stream，由 consume_behaviour_events 批量消费；
+    此任务仅将队列中遗留的调用转写为行为事件
     """
     if not user_id or not requirement_id:
         return
-        
     try:
-        from django.core.cache import cache
-        from project.models import Requirement
-        import random
-        
-        # 1. 获取需求标签
-        try:
-            req = Requirement.objects.prefetch_related('tag1', 'tag2').get(id=requirement_id)
-        except Requirement.DoesNotExist:
-            return
-            
-        # 2. 确定权重
-        weights = {
-            'view': 1.0,
-            'favorite': 3.0,
-            'apply': 5.0
-        }
-        score_add = weights.get(action_type, 1.0)
-        score_add_tag2 = score_add
-        if action_type == 'view':
-            score_add_tag2 = 0.5
-        
-        # 3. 更新 Redis
-        redis_key = f"user:dynamic_tags:{user_id}"
-        
-        # 获取 redis client
-        redis_client = None
-        if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-            redis_client = cache.client.get_client()
-        elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-            redis_client = cache._cache.get_client()
-            
-        if not redis_client:
-            logger.warning("Redis client not available for dynamic tags update")
-            return
-            
-        pipeline = redis_client.pipeline()
-        
-        # 处理 Tag1 (兴趣/领域)
-        for tag in req.tag1.all():
-            field = f"tag1_{tag.id}"
-            pipeline.hincrbyfloat(redis_key, field, score_add)
-            
-        # 处理 Tag2 (技能)
-        for tag in req.tag2.all():
-            field = f"tag2_{tag.id}"
-            pipeline.hincrbyfloat(redis_key, field, score_add_tag2)
-            
-        # 4. 衰减机制：每次更新时有 10% 概率触发全量衰减 (x 0.95)
-        # 这样避免每次请求都读取全量并重写，又能保证长期不膨胀
-        if random.random() < 0.1:
-            all_tags = redis_client.hgetall(redis_key)
-            if all_tags:
-                decay_pipeline = redis_client.pipeline()
-                for field, score in all_tags.items():
-                    try:
-                        new_score = float(score) * 0.95
-                        # 如果分数过小 (<0.1)，直接删除，清理空间
-                        if new_score < 0.1:
-                            decay_pipeline.hdel(redis_key, field)
-                        else:
-                            decay_pipeline.hset(redis_key, field, new_score)
-                    except ValueError:
-                        pass
-                decay_pipeline.execute()
-            
-        # 执行增量 pipeline
-        pipeline.execute()
-        
-        # 保持有效期
-        redis_client.expire(redis_key, 7 * 24 * 3600)
-        
-        logger.info(f"Updated dynamic tags for user {user_id} on req {requirement_id} ({action_type})")
-        
+        from .behaviour_events import publish
+        publish(user_id, requirement_id, action_type)
+    except Exception as e:
+        logger.error(f"Error publishing behaviour event: {e}")
+
+
+# 每个 worker 进程复用同一个消费者（需求标签映射缓存随进程保留）
+_behaviour_consumer = None
+
+
+@shared_task
+def consume_behaviour_events():
+    """
+    批量消费用户行为事件，更新动态标签权重
+    """
+    global _behaviour_consumer
+    try:
+        from .behaviour_events import BehaviourEventConsumer
+        if _behaviour_consumer is None:
+            import socket
+            _behaviour_consumer = BehaviourEventConsumer(f"{socket.gethostname()}-{os.getpid()}")
+        count = _behaviour_consumer.consume()
+        if count:
+            logger.info(f"Consumed {count} behaviour events")
+        return count
+    except Exception as e:
+        logger.error(f"Error consuming behaviour events: {e}")
+
+
+@shared_task
+def rescale_trending_requirements():
+    """
+    需求热度榜重标定：分值换算到当前时刻并清理已衰减的需求
+    """
+    try:
+        from .trending import trending_index
+        removed = trending_index.rescale()
+        logger.info(f"Rescaled trending requirements, removed {removed}")
+        return removed
     except Exception as e:
-        logger.error(f"Error updating dynamic tags: {e}")
+        logger.error(f"Error rescaling trending requirements: {e}")
 
 
 @shared_task
@@ -368,7 +317,7 @@ def warmup_user_recommendation_cache_task(user_id):
         )
 
         if candidate_ids:
-            cache.set(f"recommend_candidates_{user_id}", candidate_ids, 600)
+            set_refreshable_cache(f"recommend_candidates_{user_id}", candidate_ids, RECOMMEND_CANDIDATES_TIMEOUT)
 
     except Student.DoesNotExist:
         logger.warning(f"warmup skipped: student profile not found for user {user_id}")
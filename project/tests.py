@@ -1,3 +1,249 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from common_utils import (
+    CachedCountPaginator, CursorPaginator, CustomPaginator, build_paginator, bump_model_versions, cache_response,
+    count_buckets, count_grouped, get_async_redis_client, get_or_refresh_cache, get_redis_client, mark_cache_stale,
+    range_buckets, set_refreshable_cache, value_buckets,
+)
+from user.models import Tag2
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CursorPaginatorTests(TestCase):
+
+    def setUp(self):
+        # 排序字段存在重复值，翻页依赖 (category, id) 定位
+        for i, category in enumerate(['a', 'b', 'b', 'b', 'c', 'c', 'd']):
+            Tag2.objects.create(post=f'post-{i}', category=category, subcategory='s')
+        self.queryset = Tag2.objects.order_by('category')
+        self.expected = list(Tag2.objects.order_by('category', 'pk').values_list('pk', flat=True))
+
+    def test_cursor_round_trip(self):
+        seen, cursor = [], None
+        for _ in range(10):
+            paginator = CursorPaginator(self.queryset, cursor, page_size=2)
+            seen.extend(obj.pk for obj in paginator.get_page_data())
+            cursor = paginator.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_build_paginator_uses_cursor_and_links_next_page(self):
+        request = RequestFactory().get('/items/', {'cursor': '', 'page_size': 3})
+        paginator = build_paginator(request, self.queryset, allow_cursor=True)
+        self.assertIsInstance(paginator, CursorPaginator)
+
+        info = paginator.get_pagination_info(request)
+        self.assertTrue(info['has_next'])
+        self.assertIsNone(info['total_count'])
+        self.assertIn(f"cursor={info['next_cursor']}", info['next_url'])
+
+        request = RequestFactory().get('/items/', {'cursor': info['next_cursor'], 'page_size': 3})
+        page = build_paginator(request, self.queryset, allow_cursor=True).get_page_data()
+        self.assertEqual([obj.pk for obj in page], self.expected[3:6])
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        # 无法解码的游标；可解码但 id 不是整数（{"id": "x"}）
+        for cursor in ('not-a-cursor', 'eyJpZCI6ICJ4In0'):
+            paginator = CursorPaginator(self.queryset, cursor, page_size=2)
+            self.assertEqual([obj.pk for obj in paginator.get_page_data()], self.expected[:2])
+
+    def test_unsupported_ordering_falls_back_to_page_numbers(self):
+        # 可为空的排序字段不能作为游标
+        request = RequestFactory().get('/items/', {'cursor': ''})
+        paginator = build_paginator(request, Tag2.objects.order_by('specialty'), allow_cursor=True)
+        self.assertIsInstance(paginator, CustomPaginator)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedCountPaginatorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i, category in enumerate(['a', 'b', 'b', 'c']):
+            Tag2.objects.create(post=f'post-{i}', category=category, subcategory='s')
+
+    def test_count_is_cached_until_the_table_is_written(self):
+        self.assertEqual(CachedCountPaginator(Tag2.objects.all(), 2).count, 4)
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(Tag2.objects.all(), 2).count, 4)
+
+        # 模型信号在事务提交后递增版本号，缓存的总数随之失效
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag2.objects.create(post='post-new', category='d', subcategory='s')
+        self.assertEqual(CachedCountPaginator(Tag2.objects.all(), 2).count, 5)
+
+    def test_bulk_update_invalidates_after_explicit_bump(self):
+        queryset = Tag2.objects.filter(category='b')
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 2)
+
+        # QuerySet.update() 不触发信号，写入方显式递增版本号
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag2.objects.filter(category='a').update(category='b')
+            bump_model_versions(Tag2)
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+    def test_stale_count_is_recounted_when_page_comes_back_empty(self):
+        queryset = Tag2.objects.filter(category='b').order_by('pk')
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 2)
+        Tag2.objects.filter(category='b').update(category='z')
+
+        paginator = CustomPaginator(queryset, page=1, page_size=2)
+        self.assertEqual(list(paginator.get_page_data()), [])
+        self.assertEqual(paginator.get_pagination_info()['total_count'], 0)
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheResponseTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Tag2.objects.create(post='post-0', category='a', subcategory='s')
+        self.calls = 0
+
+        def overlay(request, data):
+            data['data']['viewer'] = request.META.get('HTTP_X_VIEWER')
+
+        @api_view(['GET'])
+        @permission_classes([AllowAny])
+        @cache_response([Tag2], overlay=overlay)
+        def tag_count(request):
+            self.calls += 1
+            return Response({'status': 'success', 'data': {'count': Tag2.objects.count()}})
+
+        self.view = tag_count
+
+    def get(self, viewer=None):
+        response = self.view(RequestFactory().get('/tags/count/', HTTP_X_VIEWER=viewer))
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_hit_skips_view_and_applies_overlay(self):
+        self.assertEqual(self.get(viewer='alice'), {'count': 1, 'viewer': 'alice'})
+
+        # 命中缓存时不执行视图，每用户字段按本次请求重新叠加
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(viewer='bob'), {'count': 1, 'viewer': 'bob'})
+        self.assertEqual(self.calls, 1)
+
+    def test_table_write_invalidates_cached_response(self):
+        self.assertEqual(self.get()['count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag2.objects.create(post='post-1', category='b', subcategory='s')
+        self.assertEqual(self.get()['count'], 2)
+        self.assertEqual(self.calls, 2)
+
+
+class CountBucketsTests(TestCase):
+
+    def setUp(self):
+        parent = Tag2.objects.create(post='root', category='a', subcategory='s')
+        for i, (category, specialty) in enumerate([('a', 'x'), ('b', None), ('b', 'y'), ('c', 'x'), ('d', None)]):
+            Tag2.objects.create(post=f'post-{i}', category=category, subcategory='s', specialty=specialty,
+                                parent=parent if i % 2 else None)
+
+    def test_matches_individual_counts_in_one_query(self):
+        queryset = Tag2.objects.exclude(post='root')
+        buckets = {
+            'total': None,
+            **value_buckets('category', {'a': 'a', 'b_or_c': ['b', 'c']}),
+            **range_buckets('id', {'early': (None, queryset.order_by('pk')[2].pk), 'all': (None, None)}),
+            # 桶名与模型字段重名
+            'specialty': Q(specialty__isnull=False),
+            'has_parent': Exists(Tag2.objects.filter(pk=OuterRef('parent_id'))),
+        }
+        with self.assertNumQueries(1):
+            result = count_buckets(queryset, buckets)
+
+        expected = {
+            name: queryset.count() if condition is None else queryset.filter(condition).count()
+            for name, condition in buckets.items()
+        }
+        self.assertEqual(result, expected)
+        self.assertEqual(result['b_or_c'], 3)
+        self.assertEqual(result['early'], 2)
+        self.assertEqual(result['all'], 5)
+
+    def test_count_grouped(self):
+        self.assertEqual(count_grouped(Tag2.objects.exclude(post='root'), 'category'), {'a': 1, 'b': 2, 'c': 1, 'd': 1})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RefreshableCacheTests(TestCase):
+
+    key = 'tests:refreshable'
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.release = threading.Event()
+
+    def compute(self):
+        self.calls += 1
+        self.release.wait(5)
+        return 'new'
+
+    def wait_for_refresh(self):
+        deadline = time.monotonic() + 5
+        while cache.get(f'{self.key}:lock') is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_stale_value_served_while_one_refresh_runs(self):
+        set_refreshable_cache(self.key, 'old', soft_timeout=60)
+        mark_cache_stale(self.key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: get_or_refresh_cache(self.key, self.compute, 60), range(8)))
+
+        # 刷新尚未完成：所有请求都拿到过期值，且只提交了一次刷新
+        self.assertEqual([value for value, _ in results], ['old'] * 8)
+        self.assertTrue(all(info['is_stale'] for _, info in results))
+        self.assertEqual(self.calls, 1)
+
+        self.release.set()
+        self.wait_for_refresh()
+        value, info = get_or_refresh_cache(self.key, self.compute, 60)
+        self.assertEqual(value, 'new')
+        self.assertFalse(info['is_stale'])
+        self.assertEqual(self.calls, 1)
+
+    def test_cold_start_computes_once(self):
+        timer = threading.Timer(0.2, self.release.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: get_or_refresh_cache(self.key, self.compute, 60), range(4)))
+
+        self.assertEqual([value for value, _ in results], ['new'] * 4)
+        self.assertEqual(self.calls, 1)
+
+
+class PooledRedisClientTests(SimpleTestCase):
+    """客户端只创建连接池，不需要可用的 Redis"""
+
+    def test_sync_client_is_shared(self):
+        client = get_redis_client()
+        self.assertIs(get_redis_client(), client)
+
+    def test_async_client_is_shared_per_event_loop(self):
+        async def clients():
+            return get_async_redis_client(), get_async_redis_client()
+
+        first, same_loop = asyncio.run(clients())
+        other_loop, _ = asyncio.run(clients())
+        self.assertIs(first, same_loop)
+        self.assertIsNot(first, other_loop)
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from .vector_store import InMemoryVectorStore, COLLECTION_EMBEDDINGS, COLLECTION_RAW_DOCS
+
+
+class InMemoryVectorStoreTestCase(SimpleTestCase):
+    def setUp(self):
+        self.store = InMemoryVectorStore()
+        self.store.create_collection(COLLECTION_RAW_DOCS, dim=3)
+        self.collection = self.store.collection(COLLECTION_RAW_DOCS)
+        self.collection.insert([
+            {"project_id": 1, "vector": [1.0, 0.0, 0.0], "content": "a", "chunk_index": 0},
+            {"project_id": 1, "vector": [0.0, 1.0, 0.0], "content": "b", "chunk_index": 1},
+            {"project_id": 2, "vector": [0.9, 0.1, 0.0], "content": "c", "chunk_index": 0},
+        ])
+
+    def test_search_orders_by_cosine_and_filters_keys(self):
+        hits = self.collection.search([[1.0, 0.0, 0.0]], top_k=2, output_fields=["project_id", "content"])[0]
+        self.assertEqual([h["content"] for h in hits], ["a", "c"])
+        self.assertAlmostEqual(hits[0]["score"], 1.0, places=5)
+
+        hits = self.collection.search([[1.0, 0.0, 0.0]], top_k=5, keys=[2], output_fields=["content"])[0]
+        self.assertEqual([h["content"] for h in hits], ["c"])
+
+    def test_delete_query_and_iterate(self):
+        self.collection.delete([1])
+        self.assertEqual(self.collection.query([1], output_fields=["content"]), [])
+        batches = list(self.collection.iterate(output_fields=["project_id"], batch_size=1))
+        self.assertEqual(batches, [[{"project_id": 2}]])
+
+    def test_dim_mismatch_raises(self):
+        self.store.create_collection(COLLECTION_EMBEDDINGS, dim=3)
+        with self.assertRaises(ValueError):
+            self.store.insert(COLLECTION_EMBEDDINGS, [{"project_id": 1, "vector": [1.0], "content": ""}])
@@ -0,0 +1,139 @@
+# project/trending.py
+"""
+需求热度榜
+
+热度分按指数衰减（半衰期 TRENDING_HALF_LIFE_HOURS），采用“前向衰减”存储：
+ZSET 中的分值为 权重 × 2^((t - epoch) / 半衰期)，新事件按当前时刻放大后 ZINCRBY，
+已有分值无需随时间改写，排序即等价于衰减后的热度。
+定时任务把全部分值乘以 2^(-(now - epoch) / 半衰期) 并把 epoch 移到当前时刻，
+防止数值溢出，同时清理已衰减到阈值以下的需求。
+"""
+import math
+import time
+import logging
+from django.conf import settings
+
+from common_utils import get_cache_redis_client
+
+logger = logging.getLogger(__name__)
+
+TRENDING_KEY = 'requirement:trending'              # ZSET: 需求ID -> 前向衰减热度分
+TRENDING_EPOCH_KEY = 'requirement:trending:epoch'  # STRING: 当前分值的基准时间戳
+
+TRENDING_HALF_LIFE_HOURS = getattr(settings, 'REQUIREMENT_TRENDING_HALF_LIFE_HOURS', 24)
+# 衰减后低于该分值的需求在重标定时移出榜单
+TRENDING_MIN_SCORE = 0.05
+
+# 行为权重
+TRENDING_WEIGHTS = {
+    'view': 1.0,
+    'favorite': 3.0,
+    'apply': 5.0,
+}
+
+# ARGV: 当前时间戳, 半衰期(秒), 需求ID1, 增量1, 需求ID2, 增量2, ...
+_INCR_SCRIPT = """
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+if not epoch then
+    epoch = tonumber(ARGV[1])
+    redis.call('SET', KEYS[2], ARGV[1])
+end
+local factor = math.pow(2, (tonumber(ARGV[1]) - epoch) / tonumber(ARGV[2]))
+for i = 3, #ARGV, 2 do
+    redis.call('ZINCRBY', KEYS[1], tonumber(ARGV[i + 1]) * factor, ARGV[i])
+end
+return #ARGV / 2 - 1
+"""
+
+# ARGV: 当前时间戳, 半衰期(秒), 最低分值；返回移除的需求数
+_RESCALE_SCRIPT = """
+local epoch = tonumber(redis.call('GET', KEYS[2]))
+redis.call('SET', KEYS[2], ARGV[1])
+if not epoch then
+    return 0
+end
+local factor = math.pow(2, (epoch - tonumber(ARGV[1])) / tonumber(ARGV[2]))
+redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', tostring(factor))
+return redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[3])
+"""
+
+
+class TrendingIndex:
+    """需求热度榜（Redis ZSET）"""
+
+    def __init__(self):
+        self._scripts = {}
+
+    def _client(self, client=None):
+        client = client or get_cache_redis_client()
+        if client is None:
+            raise ConnectionError("Redis client not available")
+        return client
+
+    def _script(self, client, name, source):
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = client.register_script(source)
+        return script
+
+    @staticmethod
+    def _half_life_seconds():
+        return TRENDING_HALF_LIFE_HOURS * 3600
+
+    def incr_many(self, increments, client=None):
+        """
+        批量累加热度
+
+        Args:
+            increments (dict): {需求ID: 未衰减的权重增量}
+        """
+        if not increments:
+            return 0
+        client = self._client(client)
+        args = [time.time(), self._half_life_seconds()]
+        for rid, score in increments.items():
+            args.extend([rid, score])
+        script = self._script(client, 'incr', _INCR_SCRIPT)
+        return int(script(keys=[TRENDING_KEY, TRENDING_EPOCH_KEY], args=args))
+
+    def rescale(self, client=None):
+        """
+        将分值重标定到当前时刻并清理低分需求
+
+        Returns:
+            int: 移出榜单的需求数
+        """
+        client = self._client(client)
+        script = self._script(client, 'rescale', _RESCALE_SCRIPT)
+        return int(script(
+            keys=[TRENDING_KEY, TRENDING_EPOCH_KEY],
+            args=[time.time(), self._half_life_seconds(), TRENDING_MIN_SCORE],
+        ))
+
+    def top(self, limit=200, client=None):
+        """
+        热度最高的需求（O(log n + limit)）
+
+        Returns:
+            list: [(需求ID, 当前时刻的衰减热度), ...]，按热度降序
+        """
+        client = self._client(client)
+        pipe = client.pipeline(transaction=False)
+        pipe.zrevrange(TRENDING_KEY, 0, limit - 1, withscores=True)
+        pipe.get(TRENDING_EPOCH_KEY)
+        entries, epoch = pipe.execute()
+        if not entries:
+            return []
+        factor = 1.0
+        if epoch is not None:
+            factor = math.pow(2, (float(epoch) - time.time()) / self._half_life_seconds())
+        return [(int(rid), score * factor) for rid, score in entries]
+
+    def remove(self, requirement_ids, client=None):
+        requirement_ids = list(requirement_ids)
+        if requirement_ids:
+            self._client(client).zrem(TRENDING_KEY, *requirement_ids)
+
+
+# 全局实例
+trending_index = TrendingIndex()
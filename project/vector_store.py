@@ -0,0 +1,427 @@
+# project/vector_store.py
+"""
+向量存储后端
+
+业务代码只通过 VectorStore 接口（建集合、写入、删除、检索、按需求ID查询、分批遍历）访问向量数据，
+不直接依赖 pymilvus：
+- MilvusVectorStore: 生产环境后端
+- InMemoryVectorStore: NumPy 内存后端，用于单元测试、压测与后端性能对比
+
+通过 settings.VECTOR_STORE_BACKEND ('milvus' / 'memory') 选择后端。
+"""
+import time
+import logging
+import threading
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 向量集合名称
+COLLECTION_EMBEDDINGS = 'project_embeddings'
+COLLECTION_RAW_DOCS = 'project_raw_docs'
+COLLECTION_LEGACY = getattr(settings, 'MILVUS_COLLECTION', 'enterprise_vectors')
+
+# 集合定义：fields 为写入顺序（不含自增主键），key_field 为删除/过滤使用的需求ID字段
+COLLECTION_SPECS = {
+    COLLECTION_EMBEDDINGS: {
+        'key_field': 'project_id',
+        'vector_field': 'vector',
+        'dim': 1536,
+        'fields': [('project_id', 'int'), ('vector', 'vector'), ('content', 'text')],
+    },
+    COLLECTION_RAW_DOCS: {
+        'key_field': 'project_id',
+        'vector_field': 'vector',
+        'dim': 1536,
+        'fields': [('project_id', 'int'), ('vector', 'vector'), ('content', 'text'), ('chunk_index', 'int')],
+    },
+    # 旧版 PDF 切块集合（由外部创建，bge-m3 向量）
+    COLLECTION_LEGACY: {
+        'key_field': 'Pid',
+        'vector_field': 'embedding',
+        'dim': getattr(settings, 'EMBEDDING_DIM', 1024),
+        'fields': [
+            ('embedding', 'vector'), ('Pid', 'int'), ('chunk_number', 'int'),
+            ('text', 'text'), ('add_data1', 'json'), ('add_data2', 'json'),
+        ],
+    },
+}
+
+PRIMARY_KEY_FIELD = 'id'
+
+
+def get_collection_spec(name):
+    try:
+        return COLLECTION_SPECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection: {name}")
+
+
+class VectorCollection:
+    """绑定集合名的便捷句柄，接口与 VectorStore 对应方法一致"""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def insert(self, rows):
+        return self.store.insert(self.name, rows)
+
+    def delete(self, keys):
+        return self.store.delete(self.name, keys)
+
+    def search(self, vectors, top_k, keys=None, output_fields=None):
+        return self.store.search(self.name, vectors, top_k, keys=keys, output_fields=output_fields)
+
+    def query(self, keys, output_fields=None):
+        return self.store.query(self.name, keys, output_fields=output_fields)
+
+    def iterate(self, output_fields=None, keys=None, batch_size=1000):
+        return self.store.iterate(self.name, output_fields=output_fields, keys=keys, batch_size=batch_size)
+
+    def flush(self):
+        return self.store.flush(self.name)
+
+
+class VectorStore:
+    """
+    向量存储接口
+
+    - 集合结构由 COLLECTION_SPECS 定义，行数据以 dict 表示（字段名 -> 值）
+    - keys 均指集合的 key_field（需求ID）取值
+    - 检索使用余弦相似度，结果为每个查询向量一组 [{"id", "score", <output_fields>...}]
+    """
+
+    def connect(self):
+        """确保后端可用，返回是否可用"""
+        raise NotImplementedError
+
+    def has_collection(self, name):
+        raise NotImplementedError
+
+    def create_collection(self, name, dim=None):
+        raise NotImplementedError
+
+    def insert(self, name, rows):
+        """写入行数据（主键自增），返回写入条数"""
+        raise NotImplementedError
+
+    def delete(self, name, keys):
+        """删除 key_field 在 keys 中的全部行"""
+        raise NotImplementedError
+
+    def search(self, name, vectors, top_k, keys=None, output_fields=None):
+        raise NotImplementedError
+
+    def query(self, name, keys, output_fields=None):
+        """按需求ID查询行"""
+        raise NotImplementedError
+
+    def iterate(self, name, output_fields=None, keys=None, batch_size=1000):
+        """分批遍历集合（生成器，每次返回一批行）"""
+        raise NotImplementedError
+
+    def flush(self, name):
+        pass
+
+    def collection(self, name):
+        return VectorCollection(self, name)
+
+
+class MilvusVectorStore(VectorStore):
+    """Milvus 后端"""
+
+    UNAVAILABLE_KEY = 'milvus_connection_unavailable_until'
+
+    def __init__(self, host, port, alias='default', connect_timeout=1.0, unavailable_ttl=30):
+        self.host = host
+        self.port = port
+        self.alias = alias
+        self.connect_timeout = connect_timeout
+        self.unavailable_ttl = unavailable_ttl
+
+    def connect(self):
+        from django.core.cache import cache
+        from pymilvus import connections
+
+        # 连接失败后短时间内直接返回，避免每个请求都等待连接超时
+        unavailable_until = cache.get(self.UNAVAILABLE_KEY)
+        now = time.time()
+        if unavailable_until and now < float(unavailable_until):
+            logger.warning("Milvus is temporarily marked unavailable, skip connect attempt")
+            return False
+
+        try:
+            connections.connect(
+                alias=self.alias,
+                host=self.host,
+                port=self.port,
+                timeout=self.connect_timeout
+            )
+            cache.delete(self.UNAVAILABLE_KEY)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to Milvus: {e}")
+            cache.set(self.UNAVAILABLE_KEY, now + self.unavailable_ttl, timeout=self.unavailable_ttl)
+            return False
+
+    def _collection(self, name, load=False):
+        from pymilvus import Collection
+
+        collection = Collection(name)
+        if load:
+            collection.load()
+        return collection
+
+    @staticmethod
+    def _key_expr(name, keys):
+        return f"{get_collection_spec(name)['key_field']} in {[int(k) for k in keys]}"
+
+    def has_collection(self, name):
+        from pymilvus import utility
+        return utility.has_collection(name)
+
+    def create_collection(self, name, dim=None):
+        from pymilvus import Collection, CollectionSchema, DataType, FieldSchema
+
+        spec = get_collection_spec(name)
+        dtypes = {
+            'int': {'dtype': DataType.INT64},
+            'vector': {'dtype': DataType.FLOAT_VECTOR, 'dim': dim or spec['dim']},
+            'text': {'dtype': DataType.VARCHAR, 'max_length': 65535},
+            'json': {'dtype': DataType.JSON},
+        }
+        fields = [FieldSchema(name=PRIMARY_KEY_FIELD, dtype=DataType.INT64, is_primary=True, auto_id=True)]
+        fields += [FieldSchema(name=field, **dtypes[ftype]) for field, ftype in spec['fields']]
+
+        collection = Collection(name, CollectionSchema(fields, f"{name} schema"))
+        collection.create_index(
+            field_name=spec['vector_field'],
+            index_params={"metric_type": "COSINE", "index_type": "IVF_FLAT", "params": {"nlist": 128}}
+        )
+        collection.load()
+
+    def insert(self, name, rows):
+        if not rows:
+            return 0
+        # 按集合字段顺序转为列式数据
+        columns = [[row[field] for row in rows] for field, _ in get_collection_spec(name)['fields']]
+        self._collection(name).insert(columns)
+        return len(rows)
+
+    def delete(self, name, keys):
+        keys = list(keys)
+        if keys:
+            self._collection(name).delete(self._key_expr(name, keys))
+
+    def search(self, name, vectors, top_k, keys=None, output_fields=None):
+        output_fields = list(output_fields or [])
+        results = self._collection(name, load=True).search(
+            data=vectors,
+            anns_field=get_collection_spec(name)['vector_field'],
+            param={"metric_type": "COSINE", "params": {"nprobe": 10}},
+            limit=top_k,
+            expr=self._key_expr(name, keys) if keys is not None else None,
+            output_fields=output_fields
+        )
+        return [
+            [
+                {"id": hit.id, "score": hit.score, **{f: hit.entity.get(f) for f in output_fields}}
+                for hit in hits
+            ]
+            for hits in results
+        ]
+
+    def query(self, name, keys, output_fields=None):
+        keys = list(keys)
+        if not keys:
+            return []
+        return self._collection(name, load=True).query(
+            expr=self._key_expr(name, keys),
+            output_fields=list(output_fields or [])
+        )
+
+    def iterate(self, name, output_fields=None, keys=None, batch_size=1000):
+        iterator = self._collection(name, load=True).query_iterator(
+            batch_size=batch_size,
+            expr=self._key_expr(name, keys) if keys is not None else f"{PRIMARY_KEY_FIELD} > 0",
+            output_fields=list(output_fields or [])
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                yield batch
+        finally:
+            iterator.close()
+
+    def flush(self, name):
+        self._collection(name).flush()
+
+
+class InMemoryVectorStore(VectorStore):
+    """
+    NumPy 内存后端（进程内，不持久化）
+
+    暴力计算余弦相似度，结果与 Milvus IVF_FLAT 近似检索的排序一致性可作为召回率基准。
+    """
+
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.RLock()
+
+    def connect(self):
+        return True
+
+    def _get(self, name):
+        try:
+            return self._collections[name]
+        except KeyError:
+            raise ValueError(f"Collection '{name}' does not exist")
+
+    def has_collection(self, name):
+        return name in self._collections
+
+    def create_collection(self, name, dim=None):
+        spec = get_collection_spec(name)
+        with self._lock:
+            self._collections.setdefault(name, {
+                'spec': spec,
+                'dim': dim or spec['dim'],
+                'rows': [],
+                'next_id': 1,
+                'matrix': None,  # 归一化向量矩阵，写入/删除后重建
+            })
+
+    def insert(self, name, rows):
+        with self._lock:
+            data = self._get(name)
+            vector_field = data['spec']['vector_field']
+            for row in rows:
+                if len(row[vector_field]) != data['dim']:
+                    raise ValueError(f"Vector dim mismatch for {name}: {len(row[vector_field])} != {data['dim']}")
+                data['rows'].append({**row, PRIMARY_KEY_FIELD: data['next_id']})
+                data['next_id'] += 1
+            data['matrix'] = None
+        return len(rows)
+
+    def delete(self, name, keys):
+        keys = {int(k) for k in keys}
+        with self._lock:
+            data = self._get(name)
+            key_field = data['spec']['key_field']
+            data['rows'] = [row for row in data['rows'] if row[key_field] not in keys]
+            data['matrix'] = None
+
+    def _matrix(self, data):
+        import numpy as np
+
+        if data['matrix'] is None:
+            vector_field = data['spec']['vector_field']
+            if data['rows']:
+                matrix = np.asarray([row[vector_field] for row in data['rows']], dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                data['matrix'] = matrix / np.where(norms == 0, 1, norms)
+            else:
+                data['matrix'] = np.empty((0, data['dim']), dtype=np.float32)
+        return data['matrix']
+
+    @staticmethod
+    def _project(row, output_fields):
+        return {f: row.get(f) for f in output_fields}
+
+    def search(self, name, vectors, top_k, keys=None, output_fields=None):
+        import numpy as np
+
+        output_fields = list(output_fields or [])
+        with self._lock:
+            data = self._get(name)
+            rows = data['rows']
+            matrix = self._matrix(data)
+
+        candidates = np.arange(len(rows))
+        if keys is not None:
+            key_field = data['spec']['key_field']
+            keys = {int(k) for k in keys}
+            candidates = np.fromiter(
+                (i for i, row in enumerate(rows) if row[key_field] in keys), dtype=np.int64
+            )
+
+        queries = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        results = []
+        for query in queries:
+            if not len(candidates):
+                results.append([])
+                continue
+            scores = matrix[candidates] @ query
+            k = min(top_k, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results.append([
+                {
+                    "id": rows[candidates[i]][PRIMARY_KEY_FIELD],
+                    "score": float(scores[i]),
+                    **self._project(rows[candidates[i]], output_fields),
+                }
+                for i in top
+            ])
+        return results
+
+    def query(self, name, keys, output_fields=None):
+        keys = {int(k) for k in keys}
+        output_fields = list(output_fields or [])
+        with self._lock:
+            data = self._get(name)
+            key_field = data['spec']['key_field']
+            return [self._project(row, output_fields) for row in data['rows'] if row[key_field] in keys]
+
+    def iterate(self, name, output_fields=None, keys=None, batch_size=1000):
+        output_fields = list(output_fields or [])
+        with self._lock:
+            data = self._get(name)
+            rows = list(data['rows'])
+        if keys is not None:
+            key_field = data['spec']['key_field']
+            keys = {int(k) for k in keys}
+            rows = [row for row in rows if row[key_field] in keys]
+        for start in range(0, len(rows), batch_size):
+            yield [self._project(row, output_fields) for row in rows[start:start + batch_size]]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store():
+    """获取当前进程的向量存储后端（按 settings.VECTOR_STORE_BACKEND 创建）"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_vector_store(getattr(settings, 'VECTOR_STORE_BACKEND', 'milvus'))
+    return _store
+
+
+def set_vector_store(store):
+    """替换当前进程的向量存储后端（测试、压测使用），传入 None 时按配置重新创建"""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def create_vector_store(backend):
+    if backend == 'memory':
+        return InMemoryVectorStore()
+    if backend == 'milvus':
+        import os
+        return MilvusVectorStore(
+            host=os.getenv('MILVUS_HOST') or getattr(settings, 'MILVUS_HOST', '10.160.64.18'),
+            port=str(os.getenv('MILVUS_PORT') or getattr(settings, 'MILVUS_PORT', '19530')),
+            connect_timeout=float(os.getenv('MILVUS_CONNECT_TIMEOUT', '1.0')),
+            unavailable_ttl=int(os.getenv('MILVUS_UNAVAILABLE_TTL', '30')),
+        )
+    raise ValueError(f"Unknown vector store backend: {backend}")
@@ -0,0 +1,225 @@
+# project/view_counter.py
+"""
+需求浏览量缓冲
+
+同一用户每天对同一需求只计一次浏览：每个需求每天一个访客集合（成员为用户ID），
+SADD 的返回值即“是否首次浏览”，判断与标记为同一条命令；SCARD 即当日独立访客数。
+集合大小只与实际访客数相关，只保留防抖所需的最近两天。
+
+浏览量先累加到 Redis，再由定时任务批量写回 MySQL：
+- 计数：Lua 脚本原子地 HINCRBY 缓冲 HASH 并把需求ID加入脏集合
+- 写回：Lua 脚本原子地从脏集合弹出一批ID并取走对应增量，
+  每批用一条 UPDATE ... CASE id WHEN ... 语句写库，耗时只与变更的需求数相关
+"""
+import time
+import logging
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from common_utils import get_cache_redis_client
+
+logger = logging.getLogger(__name__)
+
+VIEWS_BUFFER_KEY = 'requirement:views:buffer'  # HASH: 需求ID -> 未写库的浏览量增量
+VIEWS_DIRTY_KEY = 'requirement:views:dirty'    # SET: 有未写库增量的需求ID
+# SET: 当天浏览过该需求的用户ID，按天滚动
+VIEWERS_KEY = 'requirement:viewer_set:{day}:{rid}'
+
+# 访客集合保留天数（覆盖当天防抖与跨零点的前一天统计）
+VIEWERS_RETENTION_DAYS = getattr(settings, 'REQUIREMENT_VIEWERS_RETENTION_DAYS', 2)
+
+# 每批写回的需求数
+FLUSH_CHUNK_SIZE = getattr(settings, 'REQUIREMENT_VIEWS_FLUSH_CHUNK_SIZE', 500)
+
+_INCR_SCRIPT = """
+local n = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[1])
+return n
+"""
+
+# 返回 {id1, delta1, id2, delta2, ...}
+_TAKE_SCRIPT = """
+local ids = redis.call('SPOP', KEYS[2], ARGV[1])
+local result = {}
+for _, id in ipairs(ids) do
+    local delta = redis.call('HGET', KEYS[1], id)
+    if delta then
+        redis.call('HDEL', KEYS[1], id)
+        result[#result + 1] = id
+        result[#result + 1] = delta
+    end
+end
+return result
+"""
+
+# 需求详情页的全部浏览记账（访客去重、浏览量缓冲、浏览历史、行为事件）合并为一次调用
+# KEYS: 访客集合, 缓冲HASH, 脏集合, 浏览历史ZSET, 行为事件Stream
+# ARGV: 需求ID, 用户ID, 访客集合有效期, 时间戳, 历史保留条数, 历史有效期, Stream保留条数
+# 返回 {是否今日首次浏览, 当前未写库增量}
+_RECORD_VIEW_SCRIPT = """
+local seen = 1 - redis.call('SADD', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+local buffered
+if seen == 0 then
+    buffered = redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+    redis.call('SADD', KEYS[3], ARGV[1])
+else
+    buffered = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+end
+redis.call('ZADD', KEYS[4], ARGV[4], ARGV[1])
+redis.call('ZREMRANGEBYRANK', KEYS[4], 0, -(tonumber(ARGV[5]) + 1))
+redis.call('EXPIRE', KEYS[4], ARGV[6])
+redis.call('XADD', KEYS[5], 'MAXLEN', '~', ARGV[7], '*',
+    'user', ARGV[2], 'item', ARGV[1], 'action', 'view', 'ts', ARGV[4], 'new', 1 - seen)
+return {1 - seen, buffered}
+"""
+
+
+class RequirementViewCounter:
+    """需求浏览量缓冲计数器"""
+
+    def __init__(self):
+        self._scripts = {}
+
+    def _client(self):
+        client = get_cache_redis_client()
+        if client is None:
+            raise ConnectionError("Redis client not available")
+        return client
+
+    def _script(self, client, name, source):
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = client.register_script(source)
+        return script
+
+    @staticmethod
+    def viewers_key(requirement_id, day=None):
+        day = day or timezone.localdate()
+        return VIEWERS_KEY.format(day=day.strftime('%Y%m%d'), rid=requirement_id)
+
+    def record_view(self, requirement_id, user_id):
+        """
+        记录一次需求详情浏览（单次往返）：今日首次浏览时累加浏览量，更新用户浏览历史，
+        并写入一条 view 行为事件
+
+        Returns:
+            tuple: (是否今日首次浏览, 当前未写库增量)
+        """
+        from user.services import UserHistoryService
+        from .behaviour_events import STREAM_KEY, STREAM_MAXLEN
+
+        client = self._client()
+        script = self._script(client, 'record_view', _RECORD_VIEW_SCRIPT)
+        is_new, buffered = script(
+            keys=[
+                self.viewers_key(requirement_id),
+                VIEWS_BUFFER_KEY,
+                VIEWS_DIRTY_KEY,
+                UserHistoryService._get_history_key(user_id, 'requirement'),
+                STREAM_KEY,
+            ],
+            args=[
+                requirement_id,
+                int(user_id),
+                VIEWERS_RETENTION_DAYS * 86400,
+                time.time(),
+                UserHistoryService.MAX_HISTORY_SIZE,
+                UserHistoryService.HISTORY_TTL,
+                STREAM_MAXLEN,
+            ],
+        )
+        return bool(is_new), int(buffered)
+
+    def get_unique_viewers(self, requirement_id, day=None):
+        """指定日期（默认今天）该需求的独立访客数"""
+        return int(self._client().scard(self.viewers_key(requirement_id, day)))
+
+    def incr(self, requirement_id, amount=1):
+        """
+        累加浏览量增量
+
+        Returns:
+            int: 该需求当前未写库的增量（用于读时合并）
+        """
+        client = self._client()
+        script = self._script(client, 'incr', _INCR_SCRIPT)
+        return int(script(keys=[VIEWS_BUFFER_KEY, VIEWS_DIRTY_KEY], args=[requirement_id, amount]))
+
+    def get_buffered(self, requirement_ids):
+        """
+        批量读取未写库的增量（一次 HMGET）
+
+        Returns:
+            dict: {需求ID: 增量}，无增量的需求不在结果中
+        """
+        requirement_ids = list(requirement_ids)
+        if not requirement_ids:
+            return {}
+        values = self._client().hmget(VIEWS_BUFFER_KEY, requirement_ids)
+        return {rid: int(v) for rid, v in zip(requirement_ids, values) if v}
+
+    def take(self, limit=FLUSH_CHUNK_SIZE):
+        """
+        原子地取走一批增量（取走后缓冲中不再保留，期间的新增计入下一批）
+
+        Returns:
+            dict: {需求ID: 增量}
+        """
+        client = self._client()
+        script = self._script(client, 'take', _TAKE_SCRIPT)
+        flat = script(keys=[VIEWS_BUFFER_KEY, VIEWS_DIRTY_KEY], args=[limit])
+        return {int(flat[i]): int(flat[i + 1]) for i in range(0, len(flat), 2)}
+
+    def restore(self, deltas):
+        """写库失败时将增量放回缓冲"""
+        client = self._client()
+        script = self._script(client, 'incr', _INCR_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for rid, delta in deltas.items():
+            script(keys=[VIEWS_BUFFER_KEY, VIEWS_DIRTY_KEY], args=[rid, delta], client=pipe)
+        pipe.execute()
+
+    @staticmethod
+    def apply_to_db(deltas):
+        """一条 UPDATE ... CASE 语句写入一批增量"""
+        from .models import Requirement
+
+        if not deltas:
+            return 0
+        # 不递增 Requirement 表版本号：浏览量由列表/详情接口叠加 Redis 缓冲值返回，
+        # 每次刷写都使需求相关的响应缓存与分页总数失效得不偿失
+        return Requirement.objects.filter(id__in=list(deltas)).update(
+            views=F('views') + Case(
+                *[When(id=rid, then=Value(delta)) for rid, delta in deltas.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+
+    def flush(self, chunk_size=FLUSH_CHUNK_SIZE):
+        """
+        将全部缓冲增量写回数据库
+
+        Returns:
+            int: 写回的需求数
+        """
+        total = 0
+        while True:
+            deltas = self.take(chunk_size)
+            if not deltas:
+                break
+            try:
+                self.apply_to_db(deltas)
+            except Exception:
+                self.restore(deltas)
+                raise
+            total += len(deltas)
+            if len(deltas) < chunk_size:
+                break
+        return total
+
+
+# 全局实例
+view_counter = RequirementViewCounter()
@@ -11,22 +11,36 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Requirement, Resource, File
-from user.models import OrganizationUser, User, Tag1
+from .models import Requirement, Resource, File, RequirementSearchTerm
+from user.models import OrganizationUser, User, Tag1, Tag2
+from organization.models import Organization
+from studentproject.models import StudentProject, ProjectParticipant
+from projectscore.models import EvaluationCriteria
 from .serializers import (
     RequirementSerializer, RequirementCreateSerializer, RequirementUpdateSerializer,
     ResourceSerializer, ResourceCreateSerializer, ResourceUpdateSerializer
 )
-from common_utils import APIResponse, format_validation_errors, paginate_queryset, build_media_url
+from common_utils import (
+    APIResponse, format_validation_errors, paginate_queryset, build_media_url, cache_response, get_cache_redis_client,
+    count_buckets, value_buckets, range_buckets, get_or_refresh_cache,
+)
 from django.utils import timezone
 from .ai_utils import generate_poster_images, save_temp_images
-from django.core.cache import cache
 
 from user.services import UserHistoryService
-from project.services import RecommendationService
+from project.services import RecommendationService, RECOMMEND_CANDIDATES_TIMEOUT
+from project.view_counter import view_counter
+from project.trending import trending_index
+from project.search_index import requirement_search_index
+from project.mixins import load_related_projects, parse_sparse_fields
 
 logger = logging.getLogger(__name__)
 
+# sort_type=trending 时参与排序的热度榜名次数
+TRENDING_LIST_SIZE = 500
+# sort_type=relevance 时按相关度排序的结果数，其余命中按发布时间
+RELEVANCE_ORDER_SIZE = 500
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -62,60 +76,30 @@ def get_requirement_statistics(request):
             created_at__lte=end_datetime
         )
         
-        # 总需求数
-        total_requirements = queryset.count()
-        
-        # 状态统计 - 统计所有状态的需求数量
-        status_counts = queryset.aggregate(
-            under_review=Count('id', filter=Q(status='under_review')),
-            review_failed=Count('id', filter=Q(status='review_failed')),
-
-            in_progress=Count('id', filter=Q(status='in_progress')),
-            completed=Count('id', filter=Q(status='completed')),
-            paused=Count('id', filter=Q(status='paused'))
-        )
-        
-        dates = []
-        publish_count = []
-        
-        # 计算7个周的结束日期（从今天开始，每周往前推7天）
-        week_end_dates = []
-        current_end = today
-        for i in range(7):
-            week_end_dates.append(current_end)
-            current_end = current_end - timedelta(weeks=1)
-        
-        # 反转列表，使其按时间顺序排列（最早的周在前）
-        week_end_dates.reverse()
+        # 计算7个周的结束日期（从今天开始，每周往前推7天），按时间顺序排列（最早的周在前）
+        week_end_dates = [today - timedelta(weeks=i) for i in range(6, -1, -1)]
         
-        # 为每周生成标签和统计数据
+        # 每周区间：第一周从7周前开始，其他周从上一周的结束日期+1天开始，截止到周结束日期当天
+        week_ranges = {}
         for i, week_end in enumerate(week_end_dates):
-            dates.append(week_end.strftime('%m-%d'))
-            
-            # 计算该周的开始日期（7天前，即上一个周的结束日期+1天）
-            if i == 0:
-                # 第一周的开始日期是7周前
-                week_start = seven_weeks_ago
-            else:
-                # 其他周的开始日期是上一周的结束日期+1天
-                week_start = week_end_dates[i-1] + timedelta(days=1)
-            
-            # 转换为datetime范围进行查询
-            week_start_dt = timezone.make_aware(timezone.datetime.combine(week_start, timezone.datetime.min.time()))
-            week_end_dt = timezone.make_aware(timezone.datetime.combine(week_end, timezone.datetime.max.time()))
-            
-            # 统计该周内发布的需求数量
-            week_count = queryset.filter(
-                created_at__gte=week_start_dt,
-                created_at__lte=week_end_dt
-            ).count()
-            
-            publish_count.append(week_count)
+            week_start = seven_weeks_ago if i == 0 else week_end_dates[i - 1] + timedelta(days=1)
+            week_ranges[f'week_{i}'] = (
+                timezone.make_aware(timezone.datetime.combine(week_start, timezone.datetime.min.time())),
+                timezone.make_aware(timezone.datetime.combine(week_end + timedelta(days=1), timezone.datetime.min.time()))
+            )
+        
+        # 总需求数、状态统计与每周发布数量合并为一条条件聚合查询
+        status_keys = ['under_review', 'review_failed', 'in_progress', 'completed', 'paused']
+        counts = count_buckets(queryset, {
+            'total': None,
+            **value_buckets('status', {status: status for status in status_keys}),
+            **range_buckets('created_at', week_ranges),
+        })
+        total_requirements = counts['total']
+        status_counts = {status: counts[status] for status in status_keys}
         
-        # 确保正好7个数据点
-        if len(dates) > 7:
-            dates = dates[:7]
-            publish_count = publish_count[:7]
+        dates = [week_end.strftime('%m-%d') for week_end in week_end_dates]
+        publish_count = [counts[name] for name in week_ranges]
         
         data = {
             'totalRequirements': total_requirements,
@@ -479,61 +463,21 @@ def get_requirement(request, requirement_id):
         )
         
         # 增加浏览量（使用Redis缓冲 + 异步写入策略）
-        # 防抖机制：同一用户在24小时内访问同一需求只计算一次浏览量
-        
-        # 记录用户已访问标记
-        user_viewed_key = f"requirement_viewed_{requirement_id}_{request.user.id}"
-        has_viewed = cache.get(user_viewed_key)
-        
-        # 记录浏览历史 (Redis ZSet) - 无论是否增加浏览量，只要访问了就记录（更新时间戳）
-        UserHistoryService.record_view(request.user.id, requirement_id, 'requirement')
-        
-        # 异步更新动态标签权重
+        # 防抖机制：同一用户每天访问同一需求只计算一次浏览量（按需求按天的访客集合）
+        # 访客去重、浏览量缓冲、浏览历史 (Redis ZSet) 及 view 行为事件（用于更新动态标签权重）
+        # 由一个 Lua 脚本一次往返完成，返回值即读时合并所需的增量
         try:
-            from project.tasks import update_user_dynamic_tags_task
-            update_user_dynamic_tags_task.delay(request.user.id, requirement_id, 'view')
-        except Exception as e:
-            logger.error(f"触发动态标签更新任务失败: {e}")
-        
-        if not has_viewed:
-            # 如果未访问过，增加浏览量并设置访问标记
-            try:
-                # 1. 设置访问标记，有效期24小时
-                cache.set(user_viewed_key, 1, timeout=86400)
-                
-                # 2. 写入 Redis 增量
-                cache_key = f"requirement_views_buffer_{requirement_id}"
-                
-                # 使用 incr 原子操作，如果 key 不存在会自动创建并初始化为 0 后加 1
-                # timeout 设置为 None 表示不过期（或者设置一个较长时间，如 24 小时）
-                # 注意：Django 的 cache backend 可能会有不同的 incr 行为，Redis backend 通常支持
-                try:
-                    cache.incr(cache_key, 1)
-                except ValueError:
-                    # 如果 key 不存在，incr 可能会抛出 ValueError (取决于后端实现)
-                    # 或者如果 key 存在但不是 int 类型
-                    cache.set(cache_key, 1, timeout=86400)
-                except Exception:
-                     # 尝试降级
-                    current_val = cache.get(cache_key, 0)
-                    cache.set(cache_key, int(current_val) + 1, timeout=86400)
-            except Exception as e:
-                logger.warning(f"Redis 浏览量写入失败: {str(e)}")
-                # 再次降级：直接写库（兜底）
-                # 注意：直接写库会失去防抖的高效性，但在Redis失败时是必要的
-                Requirement.objects.filter(id=requirement_id).update(views=F('views') + 1)
-                requirement.refresh_from_db(fields=['views'])
-        else:
-            logger.info(f"用户 {request.user.id} 在24小时内已访问过需求 {requirement_id}，跳过浏览量增加")
-        
-        # 2. 读时合并：从 Redis 获取增量，叠加到数据库的 views 上
-        try:
-            cache_key = f"requirement_views_buffer_{requirement_id}"
-            buffer_views = cache.get(cache_key, 0)
+            is_new_view, buffer_views = view_counter.record_view(requirement_id, request.user.id)
             if buffer_views:
-                requirement.views += int(buffer_views)
-        except Exception:
-            pass  # 读取缓存失败不影响主流程
+                requirement.views += buffer_views
+            if not is_new_view:
+                logger.debug(f"用户 {request.user.id} 今天已访问过需求 {requirement_id}，跳过浏览量增加")
+        except Exception as e:
+            logger.warning(f"Redis 浏览量写入失败: {str(e)}")
+            # 降级：直接写库（兜底）
+            # 注意：直接写库会失去防抖的高效性，但在Redis失败时是必要的
+            Requirement.objects.filter(id=requirement_id).update(views=F('views') + 1)
+            requirement.refresh_from_db(fields=['views'])
         
         # 序列化返回
         serializer = RequirementSerializer(
@@ -554,8 +498,59 @@ def get_requirement(request, requirement_id):
         )
 
 
+def _is_time_sorted_requirement_list(request):
+    """需求列表是否为按时间排序（与用户无关，可使用响应缓存）"""
+    sort_type = request.GET.get('sort_type')
+    if not sort_type:
+        is_student = request.user.is_authenticated and getattr(request.user, 'user_type', '') == 'student'
+        sort_type = 'recommend' if is_student else 'time'
+    return sort_type == 'time'
+
+
+def _overlay_requirement_list(request, data):
+    """在需求列表响应上叠加当前用户的收藏状态与 Redis 中未写库的浏览量增量"""
+    items = data.get('data', {}).get('requirements') or []
+    requirement_ids = [item['id'] for item in items]
+    if not requirement_ids:
+        return
+
+    # 批量查询收藏状态，避免N+1查询
+    favorited_requirements = set()
+    if hasattr(request.user, 'student_profile'):
+        from .models import RequirementFavorite
+        favorited_requirements = set(
+            RequirementFavorite.objects.filter(
+                student=request.user.student_profile,
+                requirement_id__in=requirement_ids
+            ).values_list('requirement_id', flat=True)
+        )
+
+    # 读时合并：一次 HMGET 批量获取浏览量增量
+    try:
+        buffer_data = view_counter.get_buffered(requirement_ids)
+    except Exception as e:
+        logger.warning(f"列表页批量合并浏览量失败: {str(e)}")
+        buffer_data = {}
+
+    for item in items:
+        # 稀疏字段请求中未包含的字段不补充
+        if 'is_favorited' in item:
+            item['is_favorited'] = item['id'] in favorited_requirements
+        if 'views' in item:
+            item['views'] = (item['views'] or 0) + buffer_data.get(item['id'], 0)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response(
+    [
+        Requirement, Requirement.tag1.through, Requirement.tag2.through, Requirement.resources.through,
+        Requirement.files.through, Tag1, Tag2, Resource, File, Organization, RequirementSearchTerm,
+        StudentProject, ProjectParticipant, EvaluationCriteria,
+    ],
+    condition=_is_time_sorted_requirement_list,
+    overlay=_overlay_requirement_list,
+)
 def list_requirements(request):
     """
     获取需求列表接口
@@ -571,17 +566,24 @@ def list_requirements(request):
     - organization_id: 组织ID筛选
     - organization_type: 组织类型筛选（university、enterprise、other）
     - publisher_id: 发布者用户ID筛选（用于获取特定用户发布的需求）
-    - sort_type: 排序字段（title/time/view）
+    - sort_type: 排序字段（title/time/view/trending/relevance，trending 为按时间衰减的热度、relevance 为关键词相关度，均固定降序）
     - sort_order: 排序方式（up升序/down降序）
     - keyword: 搜索关键词（可从需求标题、描述、目标、期望成果、联系人、联系方式、tag1和tag2中模糊检索）
+    - fields: 只返回指定字段（逗号分隔，如 title,tag1,tag2,organization），id 始终返回
+    - expand: 追加高开销字段（resources/files/evaluation_criteria/related_projects/total_project_members/total_project）；
+      传入 fields 或 expand 后，未请求的高开销字段不返回
     """
     try:
         # 构建基础查询集，使用数据库索引优化
         queryset = Requirement.objects.select_related(
-            'organization', 'publish_people__user'
+            'organization', 'publish_people__user', 'evaluation_criteria'
         ).prefetch_related(
-            'tag1', 'tag2', 'resources', 'files'
+            'tag1', 'tag2', 'resources', 'files', 'evaluation_criteria__indicators'
         )
+        # 稀疏字段：查询计划只加载请求字段需要的列与关联
+        fields, expand = parse_sparse_fields(request)
+        queryset = RequirementSerializer.optimize_queryset(queryset, fields, expand)
+        requested_fields = RequirementSerializer.resolve_fields(fields, expand)
         
         # 应用筛选条件
         # 状态筛选（支持多状态查询，用逗号分隔）
@@ -644,42 +646,13 @@ def list_requirements(request):
                             min_budget = float(min_budget_str) if min_budget_str else 0
                             max_budget = float(max_budget_str) if max_budget_str else float('inf')
                             
-                            # 构建复杂查询条件
-                            budget_q = Q()
-                            
-                            # 获取所有需求，然后在Python中进行预算范围匹配
-                            all_requirements = queryset.all()
-                            matching_ids = []
-                            
-                            for req in all_requirements:
-                                if req.budget:
-                                    budget_str = req.budget.strip()
-                                    if '-' in budget_str:
-                                        # 数据库中存储的是范围格式，如"50-100"
-                                        try:
-                                            db_parts = budget_str.split('-', 1)
-                                            db_min = float(db_parts[0].strip())
-                                            db_max = float(db_parts[1].strip())
-                                            
-                                            # 检查范围是否有重叠
-                                            if not (max_budget < db_min or min_budget > db_max):
-                                                matching_ids.append(req.id)
-                                        except (ValueError, IndexError):
-                                            continue
-                                    else:
-                                        # 数据库中存储的是单个值
-                                        try:
-                                            db_budget = float(budget_str)
-                                            if min_budget <= db_budget <= max_budget:
-                                                matching_ids.append(req.id)
-                                        except ValueError:
-                                            continue
-                            
-                            if matching_ids:
-                                queryset = queryset.filter(id__in=matching_ids)
-                            else:
-                                queryset = queryset.none()
-                                
+                            # 区间重叠：需求预算下限 <= 筛选上限 且 需求预算上限 >= 筛选下限
+                            # （单个值的预算上下限相同；无法解析的预算两列为空，不参与匹配）
+                            budget_q = Q(budget_max__gte=min_budget)
+                            if max_budget != float('inf'):
+                                budget_q &= Q(budget_min__lte=max_budget)
+                            queryset = queryset.filter(budget_q)
+
                         except ValueError:
                             # 如果转换失败，使用字符串匹配作为后备
                             queryset = queryset.filter(budget__icontains=budget_filter)
@@ -740,8 +713,18 @@ def list_requirements(request):
                 pass
         
         # 关键词搜索（支持标题、描述、目标、期望成果、联系人、联系方式、tag1、tag2）
+        # 优先使用关键词倒排索引（在已筛选的需求中检索，返回按相关度排序的需求ID）；
+        # 关键词无可用词项、索引为空或不可用、字母数字词项前缀匹配无结果时回退为模糊匹配
         keyword = request.GET.get('keyword')
+        keyword_ranked_ids = None
         if keyword:
+            try:
+                keyword_ranked_ids = requirement_search_index.search(keyword, queryset)
+            except Exception as e:
+                logger.warning(f"需求关键词索引检索失败: {str(e)}")
+        if keyword_ranked_ids is not None:
+            queryset = queryset.filter(id__in=keyword_ranked_ids)
+        elif keyword:
             search_q = (
                 Q(title__icontains=keyword)
                 | Q(description__icontains=keyword)
@@ -783,21 +766,17 @@ def list_requirements(request):
             
             # 候选集缓存键：仅与用户ID相关，与筛选条件无关
             candidate_cache_key = f"recommend_candidates_{request.user.id}"
-            candidate_ids = cache.get(candidate_cache_key)
-            
-            if candidate_ids is None:
-                try:
-                    candidate_ids = RecommendationService.generate_candidates(
-                        request.user.id,
-                        defer_vector_on_cache_miss=True
-                    )
-                    
-                    # 写入缓存 (10分钟)
-                    cache.set(candidate_cache_key, candidate_ids or [], 600)
-                    
-                except Exception as e:
-                    logger.error(f"双路推荐算法执行失败 (View): {str(e)}")
-                    candidate_ids = []
+            user_id = request.user.id
+            try:
+                # 缓存10分钟；过期后仍返回旧候选集，由单个请求在后台重新生成
+                candidate_ids, _ = get_or_refresh_cache(
+                    candidate_cache_key,
+                    lambda: RecommendationService.generate_candidates(user_id, defer_vector_on_cache_miss=True) or [],
+                    RECOMMEND_CANDIDATES_TIMEOUT
+                )
+            except Exception as e:
+                logger.error(f"双路推荐算法执行失败 (View): {str(e)}")
+                candidate_ids = []
 
             # 将当前的 queryset (已经应用了 filter) 限制在候选集范围内
             # 这就是 "在推荐结果中筛选" 的核心：取交集
@@ -849,11 +828,7 @@ def list_requirements(request):
                 dynamic_tag2_ids = []
                 try:
                     redis_key = f"user:dynamic_tags:{request.user.id}"
-                    redis_client = None
-                    if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                        redis_client = cache.client.get_client()
-                    elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                        redis_client = cache._cache.get_client()
+                    redis_client = get_cache_redis_client()
                         
                     if redis_client:
                         all_tags = redis_client.hgetall(redis_key)
@@ -918,7 +893,37 @@ def list_requirements(request):
                 
         # 如果不是推荐排序或推荐排序失败，使用常规排序
 
-        if sort_type != 'recommend':
+        if sort_type == 'trending':
+            # 按热度榜排序：榜单内的需求按名次在前，其余按发布时间
+            try:
+                trending_ids = [rid for rid, _ in trending_index.top(TRENDING_LIST_SIZE)]
+            except Exception as e:
+                logger.warning(f"读取需求热度榜失败: {str(e)}")
+                trending_ids = []
+            if trending_ids:
+                trending_order = Case(
+                    *[When(id=pk, then=pos) for pos, pk in enumerate(trending_ids)],
+                    default=len(trending_ids),
+                    output_field=IntegerField()
+                )
+                queryset = queryset.order_by(trending_order, '-created_at')
+            else:
+                sort_type = 'time'
+
+        if sort_type == 'relevance':
+            # 按关键词相关度排序（需配合 keyword 使用）
+            if keyword_ranked_ids:
+                relevance_ids = keyword_ranked_ids[:RELEVANCE_ORDER_SIZE]
+                relevance_order = Case(
+                    *[When(id=pk, then=pos) for pos, pk in enumerate(relevance_ids)],
+                    default=len(relevance_ids),
+                    output_field=IntegerField()
+                )
+                queryset = queryset.order_by(relevance_order, '-created_at')
+            else:
+                sort_type = 'time'
+
+        if sort_type not in ('recommend', 'trending', 'relevance'):
             # 构建排序字段
             sort_field_map = {
                 'title': 'title',
@@ -936,47 +941,13 @@ def list_requirements(request):
             queryset = queryset.order_by(order_by)
         
         # 使用通用分页工具
-        pagination_result = paginate_queryset(request, queryset, default_page_size=10)
+        pagination_result = paginate_queryset(request, queryset, default_page_size=10, allow_cursor=True)
         paginator = pagination_result['paginator']
         page_data = pagination_result['page_data']
         pagination_info = pagination_result['pagination_info']
         paginator_page = pagination_info['current_page']
         paginator_page_size = pagination_info['page_size']
         
-        # 预取收藏状态数据，避免N+1查询
-        favorited_requirements = set()
-        if request.user.is_authenticated and hasattr(request.user, 'student_profile'):
-            from .models import RequirementFavorite
-            requirement_ids = [req.id for req in page_data]
-            favorited_requirements = set(
-                RequirementFavorite.objects.filter(
-                    student=request.user.student_profile,
-                    requirement_id__in=requirement_ids
-                ).values_list('requirement_id', flat=True)
-            )
-
-        # 3. 批量读时合并：将 Redis 中的浏览量增量合并到列表数据中
-        try:
-            # 收集本页所有需求的 ID
-            page_req_ids = [req.id for req in page_data]
-            if page_req_ids:
-                # 构造所有 keys
-                cache_keys = [f"requirement_views_buffer_{rid}" for rid in page_req_ids]
-                # 批量获取 (如果 cache backend 支持 get_many)
-                if hasattr(cache, 'get_many'):
-                    buffer_data = cache.get_many(cache_keys)
-                else:
-                    buffer_data = {k: cache.get(k) for k in cache_keys}
-                
-                # 更新内存中的对象 (不存库)
-                for req in page_data:
-                    key = f"requirement_views_buffer_{req.id}"
-                    buffer_val = buffer_data.get(key, 0)
-                    if buffer_val:
-                        req.views += int(buffer_val)
-        except Exception as e:
-            logger.warning(f"列表页批量合并浏览量失败: {str(e)}")
-
         # 4. 生成推荐理由（仅针对推荐排序）
         if sort_type == 'recommend':
             for req in page_data:
@@ -1018,14 +989,20 @@ def list_requirements(request):
                 
                 req.recommendation_reason = reasons
 
-        # 序列化
+        # 序列化（关联项目、负责人与成员按页批量加载，避免N+1查询）
+        # 收藏状态与 Redis 浏览量增量属于每用户/实时数据，由 _overlay_requirement_list 在响应上叠加
+        context = {
+            'request': request,
+            'favorited_requirements': set(),
+        }
+        if requested_fields is None or requested_fields & RequirementSerializer.related_project_fields:
+            context['related_projects_map'] = load_related_projects([req.id for req in page_data])
         serializer = RequirementSerializer(
             page_data,
             many=True,
-            context={
-                'request': request,
-                'favorited_requirements': favorited_requirements
-            }
+            context=context,
+            fields=fields,
+            expand=expand
         )
         
         response_data = {
@@ -1543,6 +1520,10 @@ def get_resource_statistics(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response([
+    Resource, Resource.tag1.through, Resource.tag2.through, Resource.files.through, Tag1, Tag2, File,
+    OrganizationUser, Requirement, Requirement.resources.through, StudentProject, ProjectParticipant,
+])
 def list_resources(request):
     """
     获取资源列表接口
@@ -1559,6 +1540,8 @@ def list_resources(request):
     - sort_type: 排序字段（name/time/download/view）
     - sort_order: 排序方式（up升序/down降序）
     - organization_id: 组织ID筛选
+    - fields: 只返回指定字段（逗号分隔），id 始终返回
+    - expand: 追加高开销字段（files）；传入 fields 或 expand 后，未请求的高开销字段不返回
     """
     try:
         # 构建基础查询集，使用数据库索引优化
@@ -1567,6 +1550,9 @@ def list_resources(request):
         ).prefetch_related(
             'tag1', 'tag2', 'files'
         )
+        # 稀疏字段：查询计划只加载请求字段需要的列与关联
+        fields, expand = parse_sparse_fields(request)
+        queryset = ResourceSerializer.optimize_queryset(queryset, fields, expand)
         
         # 应用筛选条件
         # 状态筛选（支持多状态查询，用逗号分隔）
@@ -1681,7 +1667,7 @@ def list_resources(request):
         queryset = queryset.order_by(order_by)
         
         # 使用通用分页工具
-        pagination_result = paginate_queryset(request, queryset, default_page_size=10)
+        pagination_result = paginate_queryset(request, queryset, default_page_size=10, allow_cursor=True)
         paginator = pagination_result['paginator']
         page_data = pagination_result['page_data']
         pagination_info = pagination_result['pagination_info']
@@ -1690,7 +1676,9 @@ def list_resources(request):
         serializer = ResourceSerializer(
             page_data,
             many=True,
-            context={'request': request}
+            context={'request': request},
+            fields=fields,
+            expand=expand
         )
         
         return APIResponse.success({
@@ -1862,12 +1850,12 @@ def toggle_requirement_favorite(request):
                 requirement=requirement
             )
             
-            # 异步更新动态标签权重 (action='favorite')
+            # 写入行为事件，由事件流消费者批量更新动态标签权重 (action='favorite')
             try:
-                from project.tasks import update_user_dynamic_tags_task
-                update_user_dynamic_tags_task.delay(user.id, requirement_id, 'favorite')
+                from project.behaviour_events import publish
+                publish(user.id, requirement_id, 'favorite')
             except Exception as e:
-                logger.error(f"触发动态标签更新任务失败: {e}")
+                logger.error(f"写入收藏行为事件失败: {e}")
             
             # 返回收藏信息
             from .serializers import RequirementFavoriteSerializer
@@ -12,7 +12,7 @@ from .serializers import FileSerializer
 from user.models import OrganizationUser
 from organization.models import Organization
 from studentproject.models import ProjectDeliverable, StudentProject, ProjectParticipant
-from common_utils import build_media_url, APIResponse
+from common_utils import build_media_url, APIResponse, bump_model_versions
 import os
 import uuid
 import json
@@ -325,6 +325,8 @@ class VirtualFileViewSet(viewsets.ModelViewSet):
                                 is_updated=True,
                                 updated_at=timezone.now()
                             )
+                    if updated_objects:
+                        bump_model_versions(Requirement, Resource, ProjectDeliverable)
             
             # 构建响应
             response_data = {
@@ -687,6 +689,7 @@ class VirtualFileViewSet(viewsets.ModelViewSet):
                         is_updated=True,
                         updated_at=timezone.now()
                     )
+                bump_model_versions(Requirement, Resource, ProjectDeliverable)
                 
                 serializer = self.get_serializer(instance)
                 
@@ -797,6 +800,7 @@ class VirtualFileViewSet(viewsets.ModelViewSet):
                         is_updated=True,
                         updated_at=timezone.now()
                     )
+                bump_model_versions(Requirement, Resource, ProjectDeliverable)
                 
                 serializer = self.get_serializer(instance)
                 
@@ -14,6 +14,7 @@ from .models import (
     EvaluationCriteria,
     EvaluationIndicator,
     ProjectEvaluation,
+    IndicatorScore,
     ProjectRanking
 )
 from .serializers import (
@@ -36,8 +37,8 @@ from .serializers import (
 )
 from project.models import Requirement
 from organization.models import Organization
-from studentproject.models import StudentProject
-from common_utils import APIResponse, format_validation_errors, paginate_queryset
+from studentproject.models import StudentProject, ProjectParticipant
+from common_utils import APIResponse, format_validation_errors, paginate_queryset, cache_response, bump_model_versions
 from notification.services import student_notification_service
 
 logger = logging.getLogger(__name__)
@@ -1497,6 +1498,7 @@ def get_project_ranking(request, requirement_id):
                 status='published',
                 published_at=timezone.now()
             )
+            bump_model_versions(ProjectEvaluation)
             
             # 更新需求的evaluation_published字段
             if not requirement.evaluation_published:
@@ -1582,6 +1584,10 @@ def get_project_ranking(request, requirement_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response([
+    ProjectRanking, Requirement, StudentProject, ProjectParticipant,
+    EvaluationCriteria, ProjectEvaluation, IndicatorScore,
+])
 def view_project_ranking(request, requirement_id):
     """
     查看需求下项目排名接口（纯展示功能）
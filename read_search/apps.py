@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReadSearchConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "read_search"
+
+    def ready(self):
+        """应用启动时注册信号处理器"""
+        import read_search.signals  # 维护学生匹配集合
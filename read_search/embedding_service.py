@@ -2,6 +2,7 @@
 import re
 import requests
 import json
+import hashlib
 from django.conf import settings
 from django.core.cache import cache
 import logging
@@ -18,6 +19,11 @@ class EmbeddingService:
     """
     统一的向量化服务类，提供文本切块和向量化功能
     """
+
+    @staticmethod
+    def cache_key(text):
+        # 使用文本MD5作为缓存键 (str 的 hash() 随进程变化)
+        return f"embedding:{hashlib.md5(text.encode('utf-8')).hexdigest()}"
     
     @staticmethod
     def split_text(text, max_char_per_chunk=300, overlap=50):
@@ -85,8 +91,7 @@ class EmbeddingService:
             uncached_indices = []
             
             for i, text in enumerate(texts):
-                cache_key = f"embedding:{hash(text)}"
-                cached = cache.get(cache_key)
+                cached = cache.get(EmbeddingService.cache_key(text))
                 if cached:
                     cached_embeddings.append((i, cached))
                 else:
@@ -106,8 +111,7 @@ class EmbeddingService:
             # 缓存新获取的向量
             for i, text in enumerate(uncached_texts):
                 if i < len(new_embeddings):
-                    cache_key = f"embedding:{hash(text)}"
-                    cache.set(cache_key, new_embeddings[i], timeout=3600)  # 缓存1小时
+                    cache.set(EmbeddingService.cache_key(text), new_embeddings[i], timeout=3600)  # 缓存1小时
             
             # 合并结果
             result = [None] * len(texts)
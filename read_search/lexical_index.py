@@ -0,0 +1,185 @@
+# read_search/lexical_index.py
+import re
+import math
+import logging
+from collections import Counter, defaultdict
+from django.conf import settings
+from common_utils import get_or_refresh_cache, mark_cache_stale
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from .models import RawDocChunk, RawDocTerm
+
+logger = logging.getLogger(__name__)
+
+# BM25 参数
+BM25_K1 = getattr(settings, 'READ_SEARCH_BM25_K1', 1.5)
+BM25_B = getattr(settings, 'READ_SEARCH_BM25_B', 0.75)
+# 单次查询最多使用的词项数，避免长问题扫描过多倒排记录
+MAX_QUERY_TERMS = getattr(settings, 'READ_SEARCH_BM25_MAX_QUERY_TERMS', 32)
+
+# 全局统计（切块总数、平均长度）缓存，写入时标记过期（后台刷新期间沿用旧值）
+_STATS_CACHE_KEY = 'read_search:bm25_stats'
+_STATS_CACHE_TIMEOUT = 600
+
+# 中文按连续汉字切分为二元组；字母数字串（课程编号、产品名、数字等）整体保留
+_TOKEN_RE = re.compile(r'[\u4e00-\u9fff]+|[a-z0-9]+(?:[._\-][a-z0-9]+)*')
+_MAX_TERM_LENGTH = 64
+
+
+def tokenize(text):
+    """
+    分词：汉字串切为相邻二元组（单字保留单字），英文与数字串转小写后整体作为词项
+
+    Args:
+        text (str): 文本
+
+    Returns:
+        list: 词项列表（保留重复，用于统计词频）
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer((text or '').lower()):
+        token = match.group()
+        if '\u4e00' <= token[0] <= '\u9fff':
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token[:_MAX_TERM_LENGTH])
+    return tokens
+
+
+class LexicalIndex:
+    """
+    需求文档 BM25 词法索引（MySQL 倒排表）
+
+    与 project_raw_docs 使用同一批切块，由文档入库流水线 (insert_raw_docs_chunks)
+    增量写入、由 delete_requirement_vectors 同步删除；检索结果与 Milvus 命中做倒数排名融合。
+    """
+
+    @staticmethod
+    def _invalidate_stats():
+        transaction.on_commit(lambda: mark_cache_stale(_STATS_CACHE_KEY))
+
+    def get_stats(self):
+        """返回 (切块总数, 平均词项数)"""
+        stats, _ = get_or_refresh_cache(_STATS_CACHE_KEY, self._compute_stats, _STATS_CACHE_TIMEOUT)
+        return stats
+
+    @staticmethod
+    def _compute_stats():
+        agg = RawDocChunk.objects.aggregate(n=Count('id'), avgdl=Avg('length'))
+        return agg['n'] or 0, float(agg['avgdl'] or 0.0)
+
+    def index_chunks(self, requirement_id, chunks, chunk_indices):
+        """
+        写入一批切块（同一切块序号已存在时覆盖，断点续传重复写入不会产生重复记录）
+
+        Args:
+            requirement_id (int): 需求ID
+            chunks (list): 切块文本
+            chunk_indices (list): 与 chunks 对应的切块序号
+        """
+        if not chunks:
+            return 0
+
+        with transaction.atomic():
+            RawDocChunk.objects.filter(requirement_id=requirement_id, chunk_index__in=chunk_indices).delete()
+
+            term_counts = [Counter(tokenize(text)) for text in chunks]
+            docs = RawDocChunk.objects.bulk_create([
+                RawDocChunk(
+                    requirement_id=requirement_id,
+                    chunk_index=idx,
+                    content=text,
+                    length=sum(counts.values()),
+                )
+                for text, idx, counts in zip(chunks, chunk_indices, term_counts)
+            ])
+            if any(doc.pk is None for doc in docs):
+                # 部分数据库后端 bulk_create 不回填主键
+                pk_map = dict(
+                    RawDocChunk.objects.filter(requirement_id=requirement_id, chunk_index__in=chunk_indices)
+                    .values_list('chunk_index', 'id')
+                )
+                for doc in docs:
+                    doc.pk = pk_map[doc.chunk_index]
+
+            RawDocTerm.objects.bulk_create(
+                [
+                    RawDocTerm(term=term, chunk_id=doc.pk, requirement_id=requirement_id, tf=tf)
+                    for doc, counts in zip(docs, term_counts)
+                    for term, tf in counts.items()
+                ],
+                batch_size=1000,
+            )
+            self._invalidate_stats()
+        return len(docs)
+
+    def delete_requirement(self, requirement_id):
+        """删除需求的全部索引数据"""
+        with transaction.atomic():
+            RawDocTerm.objects.filter(requirement_id=requirement_id).delete()
+            RawDocChunk.objects.filter(requirement_id=requirement_id).delete()
+            self._invalidate_stats()
+
+    def search(self, query, requirement_ids, top_k=10):
+        """
+        在指定需求范围内按 BM25 检索切块
+
+        Args:
+            query (str): 问题文本
+            requirement_ids (list): 需求ID列表
+            top_k (int): 返回数量
+
+        Returns:
+            list: [{"id_chunk", "content", "pid", "bm25_score"}, ...]，按得分降序
+        """
+        query_counts = Counter(tokenize(query))
+        terms = [term for term, _ in query_counts.most_common(MAX_QUERY_TERMS)]
+        if not terms or not requirement_ids:
+            return []
+
+        n_docs, avgdl = self.get_stats()
+        if not n_docs:
+            return []
+
+        doc_freqs = dict(
+            RawDocTerm.objects.filter(term__in=terms)
+            .values('term').annotate(df=Count('id')).values_list('term', 'df')
+        )
+        idf = {
+            term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+        postings = RawDocTerm.objects.filter(
+            term__in=list(idf), requirement_id__in=requirement_ids
+        ).values_list('chunk_id', 'term', 'tf', 'chunk__length')
+
+        scores = defaultdict(float)
+        norm = BM25_K1 * (1 - BM25_B)
+        for chunk_id, term, tf, length in postings:
+            denom = tf + norm + BM25_K1 * BM25_B * length / (avgdl or 1.0)
+            scores[chunk_id] += idf[term] * tf * (BM25_K1 + 1) / denom * query_counts[term]
+
+        if not scores:
+            return []
+
+        top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        chunks = RawDocChunk.objects.in_bulk([chunk_id for chunk_id, _ in top])
+        return [
+            {
+                "id_chunk": chunks[chunk_id].chunk_index,
+                "content": chunks[chunk_id].content,
+                "pid": chunks[chunk_id].requirement_id,
+                "bm25_score": score,
+            }
+            for chunk_id, score in top
+            if chunk_id in chunks
+        ]
+
+
+# 全局实例
+lexical_index = LexicalIndex()
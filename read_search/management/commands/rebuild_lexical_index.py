@@ -0,0 +1,55 @@
+"""
+Django管理命令：从 Milvus project_raw_docs 重建 BM25 词法索引
+新部署或索引数据不一致时执行一次，之后由文档入库流水线增量维护
+使用方法：
+  python manage.py rebuild_lexical_index            # 重建全部需求
+  python manage.py rebuild_lexical_index --pid 12   # 仅重建指定需求
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from project.services import get_or_create_collection, COLLECTION_RAW_DOCS
+from read_search.lexical_index import lexical_index
+
+
+class Command(BaseCommand):
+    help = '从 Milvus project_raw_docs 重建需求文档 BM25 词法索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pid',
+            type=int,
+            action='append',
+            help='仅重建指定需求（可重复指定）',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批从 Milvus 读取的切块数',
+        )
+
+    def handle(self, *args, **options):
+        collection = get_or_create_collection(COLLECTION_RAW_DOCS)
+        if collection is None:
+            raise CommandError('无法连接到Milvus')
+
+        chunks_by_pid = defaultdict(dict)
+        for batch in collection.iterate(
+            output_fields=["project_id", "chunk_index", "content"],
+            keys=options['pid'],
+            batch_size=options['batch_size'],
+        ):
+            for r in batch:
+                chunks_by_pid[r['project_id']][r['chunk_index']] = r['content']
+
+        total = 0
+        for pid, chunks in chunks_by_pid.items():
+            indices = sorted(chunks)
+            lexical_index.delete_requirement(pid)
+            total += lexical_index.index_chunks(pid, [chunks[i] for i in indices], indices)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'重建完成：{len(chunks_by_pid)} 个需求，{total} 个切块')
+        )
@@ -95,3 +95,45 @@ class TagMatch(models.Model):
             return None
         
         return None
+
+
+class RawDocChunk(models.Model):
+    """需求文档切块 - BM25 词法索引的文档表，与 Milvus project_raw_docs 的切块一一对应"""
+
+    requirement_id = models.PositiveIntegerField(verbose_name='项目需求ID', db_column='Pid')
+    chunk_index = models.PositiveIntegerField(verbose_name='切块序号')
+    content = models.TextField(verbose_name='切块内容')
+    length = models.PositiveIntegerField(default=0, verbose_name='词项数', help_text='切块分词后的词项总数，用于BM25长度归一化')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        db_table = 'raw_doc_chunk'
+        verbose_name = '需求文档切块'
+        verbose_name_plural = '需求文档切块'
+        unique_together = [
+            ('requirement_id', 'chunk_index'),
+        ]
+
+    def __str__(self):
+        return f"需求{self.requirement_id} - 切块{self.chunk_index}"
+
+
+class RawDocTerm(models.Model):
+    """需求文档倒排索引 - 词项在切块中的出现次数"""
+
+    term = models.CharField(max_length=64, verbose_name='词项')
+    chunk = models.ForeignKey(RawDocChunk, on_delete=models.CASCADE, related_name='terms', verbose_name='切块')
+    # 冗余需求ID，检索时按学生匹配的需求范围过滤倒排表，无需关联切块表
+    requirement_id = models.PositiveIntegerField(verbose_name='项目需求ID', db_column='Pid')
+    tf = models.PositiveIntegerField(default=1, verbose_name='词频')
+
+    class Meta:
+        db_table = 'raw_doc_term'
+        verbose_name = '需求文档倒排索引'
+        verbose_name_plural = '需求文档倒排索引'
+        indexes = [
+            models.Index(fields=['term', 'requirement_id'], name='raw_doc_term_term_pid_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} - 切块{self.chunk_id} ({self.tf})"
@@ -1,13 +1,15 @@
 # myapp/read_search.py
 import re
+import random
+import hashlib
+import logging
 import requests
 import json
-from pymilvus import connections, Collection, utility
 from django.conf import settings
-from django.core.cache import cache
-from .models import TagMatch
+from common_utils import get_or_refresh_cache
 from .embedding_service import EmbeddingService
-from .milvus_manager import milvus_manager
+
+logger = logging.getLogger(__name__)
 
 # 2. 从Django设置中获取配置
 MILVUS_HOST = settings.MILVUS_HOST
@@ -19,33 +21,6 @@ EMBEDDING_URL = settings.EMBEDDING_URL
 EMBEDDING_MODEL = settings.EMBEDDING_MODEL
 EMBEDDING_DIM = settings.EMBEDDING_DIM
 
-# 4. 使用Django ORM查询标签匹配数据
-def get_mysql_data(sid):
-    """
-    根据学生ID获取标签匹配的项目需求ID列表
-    
-    Args:
-        sid (int): 学生ID
-        
-    Returns:
-        list: 包含Sid和Pid的字典列表
-    """
-    try:
-        # 使用Django ORM查询TagMatch模型
-        tag_matches = TagMatch.objects.filter(student_id=sid).select_related('student', 'requirement')
-        
-        # 转换为原有格式以保持兼容性
-        return [
-            {
-                "Sid": tag_match.student.id, 
-                "Pid": tag_match.requirement.id
-            } 
-            for tag_match in tag_matches
-        ]
-    except Exception as e:
-        print(f"查询标签匹配数据时出错: {e}")
-        return []
-
 # 注意：文本切块和向量化功能已移至 EmbeddingService
 # 为了保持向后兼容性，这里保留原函数作为包装器
 
@@ -61,58 +36,143 @@ def get_embeddings(texts):
     """
     return EmbeddingService.get_embeddings(texts, use_cache=True)
 
+# 5. 检索结果融合与缓存配置
+RRF_K = getattr(settings, 'READ_SEARCH_RRF_K', 60)
+SEARCH_CACHE_TIMEOUT = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 3600)
+# 逐条命中日志的采样率，避免每次检索都输出全部命中
+LOG_SAMPLE_RATE = getattr(settings, 'READ_SEARCH_LOG_SAMPLE_RATE', 0.01)
+# 是否融合 BM25 词法检索结果（精确词项如课程编号、产品名、数字等）
+HYBRID_SEARCH_ENABLED = getattr(settings, 'READ_SEARCH_HYBRID_ENABLED', True)
+
+
+def _log_sampled(message, *args):
+    if random.random() < LOG_SAMPLE_RATE:
+        logger.info(message, *args)
+
+
+def _search_cache_key(query, pid_ints, top_k, versions):
+    """缓存键 = 查询指纹 + 每个 Pid 的数据版本，任一需求的文档变更都会使键失效"""
+    query_fp = hashlib.md5(f"{top_k}:{query.strip()}".encode('utf-8')).hexdigest()
+    version_fp = hashlib.md5(
+        ",".join(f"{pid}:{versions.get(pid, 0)}" for pid in pid_ints).encode('utf-8')
+    ).hexdigest()
+    return f"read_search:{query_fp}:{version_fp}"
+
+
+def fuse_results(result_sets, top_k, rrf_k=RRF_K):
+    """
+    倒数排名融合 (Reciprocal Rank Fusion)
+
+    每个查询切块的结果列表按排名贡献 1 / (rrf_k + rank)，以 (Pid, chunk) 去重累加。
+
+    Args:
+        result_sets (list): 每个查询切块的命中列表，元素为 dict(pid, id_chunk, content, score)
+        top_k (int): 返回数量
+
+    Returns:
+        list: 融合后的结果，score 为该切块在各列表中的最高相似度，rrf_score 为融合分
+    """
+    fused = {}
+    for hits in result_sets:
+        for rank, hit in enumerate(hits, start=1):
+            key = (hit["pid"], hit["id_chunk"])
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {**hit, "rrf_score": 0.0}
+            elif hit["score"] > entry["score"]:
+                entry["score"] = hit["score"]
+            entry["rrf_score"] += 1.0 / (rrf_k + rank)
+
+    output = sorted(fused.values(), key=lambda x: (x["rrf_score"], x["score"]), reverse=True)
+    return output[:top_k]
+
+
 # 6. 从 Milvus 检索
-def search_in_milvus(Query, Pids, top_k=5):
-    # 使用MilvusManager管理连接
-    collection = milvus_manager.get_collection(load=True)
+def search_in_milvus(Query, Pids, top_k=5, use_cache=True):
+    """
+    在学生匹配的需求文档中检索与问题最相关的切块
+
+    查询按句切块后每块一个向量分别检索，再加上一路 BM25 词法检索，结果以 (Pid, chunk)
+    去重并做倒数排名融合；最终结果按 查询指纹 + 各 Pid 数据版本 缓存，
+    相同问题命中同一批需求时直接返回缓存，并发的相同检索只执行一次。
+
+    Args:
+        Query (str): 问题文本
+        Pids (list): 需求ID列表
+        top_k (int): 返回数量
+        use_cache (bool): 是否使用结果缓存
+
+    Returns:
+        list: [{"id_chunk", "content", "pid", "score", "rrf_score"}, ...]，
+              score 为向量相似度，仅由词法检索命中的切块为 0
+    """
+    from project.services import get_raw_docs_versions
+
+    pid_ints = sorted({int(pid) for pid in Pids})
+    if not pid_ints:
+        return []
+
+    if not use_cache:
+        return _search_in_milvus(Query, pid_ints, top_k)
+
+    # 缓存键包含数据版本，文档变更后自然失效，无需保留过期值（stale_timeout=0）
+    cache_key = _search_cache_key(Query, pid_ints, top_k, get_raw_docs_versions(pid_ints))
+    output, cache_info = get_or_refresh_cache(
+        cache_key, lambda: _search_in_milvus(Query, pid_ints, top_k), SEARCH_CACHE_TIMEOUT, stale_timeout=0
+    )
+    if cache_info is not None:
+        _log_sampled("[ReadSearch] 命中结果缓存: pids=%d, results=%d", len(pid_ints), len(output))
+    return output
+
+
+def _search_in_milvus(Query, pid_ints, top_k):
+    """向量检索 + BM25 词法检索并融合（不使用结果缓存）"""
+    # 需求文档统一存储在 project_raw_docs（与文档入库流水线使用同一向量模型）
+    from project.services import EmbeddingService as DocEmbeddingService, get_or_create_collection, COLLECTION_RAW_DOCS
+
+    collection = get_or_create_collection(COLLECTION_RAW_DOCS)
+    if collection is None:
+        raise ConnectionError("无法连接到Milvus")
     
     chunks = split_text(Query, max_char_per_chunk=300, overlap=30)
-    embeddings = EmbeddingService.get_embeddings(chunks, use_cache=True)
-    # 将字符串PID转换为整数，以匹配Milvus中的Int32字段类型
-    pid_ints = [int(pid) for pid in Pids]
-    expr = f"Pid in {pid_ints}"
-    print(f"[DEBUG] 过滤条件: {expr}")
-    print(f"[DEBUG] Pids参数: {Pids} -> {pid_ints}")
-    print(f"[DEBUG] 嵌入向量数量: {len(embeddings)}")
-    #query_vector = model.encode(embeddings).tolist()
-    # 使用所有嵌入向量进行搜索
+    embeddings = DocEmbeddingService.get_embeddings(chunks, use_cache=True)
     if not embeddings:
-        embeddings = [[0.0] * EMBEDDING_DIM]
-        print(f"[DEBUG] 使用默认嵌入向量")
+        embeddings = [DocEmbeddingService.get_single_embedding(Query)]
     
+    # 每个查询向量多取一些候选，供融合排序使用
     results = collection.search(
-        data=embeddings,
-        anns_field="embedding",
-        param={"metric_type": "COSINE", "params": {"nprobe": 10}},
-        limit=top_k,
-        expr=expr,  # 这里添加过滤条件
-        output_fields=["chunk_number", "text", "Pid"]
+        embeddings,
+        top_k=max(top_k * 2, 10),
+        keys=pid_ints,
+        output_fields=["chunk_index", "content", "project_id"]
     )
-    # 合并所有搜索结果
-    print(f"[DEBUG] Milvus搜索返回 {len(results)} 个结果集")
-    output = []
-    seen_ids = set()  # 用于去重
-    
-    for i, result_set in enumerate(results):
-        print(f"[DEBUG] 结果集 {i} 包含 {len(result_set)} 个结果")
+
+    result_sets = []
+    for result_set in results:
+        hits = []
         for hit in result_set:
-            hit_id = hit.entity.get("chunk_number")
-            content = hit.entity.get("text")
-            pid = hit.entity.get("Pid")
-            score = hit.score
-            print(f"[DEBUG] 找到结果: id={hit_id}, content_len={len(content) if content else 0}, pid={pid}, score={score}")
-            
-            # 避免重复结果
-            if hit_id not in seen_ids:
-                seen_ids.add(hit_id)
-                output.append({
-                    "id_chunk": hit_id,  # 将原来的 id 字段改为 id_chunk
-                    "content": content,
-                    "pid": pid,
-                    "score": score
-                })
-    
-    print(f"[DEBUG] 最终输出 {len(output)} 个结果")
-    # 按分数降序排序并限制结果数量
-    output.sort(key=lambda x: x["score"], reverse=True)
-    return output[:top_k]
\ No newline at end of file
+            hits.append({
+                "id_chunk": hit["chunk_index"],
+                "content": hit["content"],
+                "pid": hit["project_id"],
+                "score": hit["score"]
+            })
+            _log_sampled("[ReadSearch] 命中: pid=%s, chunk=%s, score=%.4f",
+                         hits[-1]["pid"], hits[-1]["id_chunk"], hit["score"])
+        result_sets.append(hits)
+
+    if HYBRID_SEARCH_ENABLED:
+        try:
+            from .lexical_index import lexical_index
+            lexical_hits = lexical_index.search(Query, pid_ints, top_k=max(top_k * 2, 10))
+            result_sets.append([
+                {"id_chunk": h["id_chunk"], "content": h["content"], "pid": h["pid"], "score": 0.0}
+                for h in lexical_hits
+            ])
+        except Exception as e:
+            logger.warning(f"[ReadSearch] BM25 检索失败，仅使用向量结果: {e}")
+
+    output = fuse_results(result_sets, top_k)
+    logger.debug(f"[ReadSearch] pids={len(pid_ints)}, 查询向量={len(embeddings)}, 输出={len(output)}")
+
+    return output
@@ -1,69 +1,132 @@
 # read_search/services.py
 import logging
 import threading
-from typing import List, Dict, Any, Optional
+from typing import List, Any, Iterable, Optional
 from django.core.cache import cache
 from django.conf import settings
-from .models import TagMatch
+from common_utils import get_cache_redis_client
 from .read_search import get_embeddings, search_in_milvus, split_text
 
 logger = logging.getLogger(__name__)
 
 
-class SearchService:
+# 学生匹配需求集合（Redis SET，成员为需求ID）
+MATCH_SET_KEY = 'student:matched_reqs:{}'
+MATCH_SET_TIMEOUT = getattr(settings, 'STUDENT_MATCH_SET_TIMEOUT', 24 * 3600)
+# 占位成员：标记集合已构建（Redis 不保存空集合，无匹配的学生也需要命中）
+_BUILT_MARKER = 0
+
+# 仅对已构建的集合追加成员，未构建的集合留待首次读取时完整构建
+_SADD_IF_EXISTS = """
+local n = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('SADD', key, unpack(ARGV))
+        n = n + 1
+    end
+end
+return n
+"""
+
+
+class StudentMatchSetService:
     """
-    搜索服务类 - 处理学生标签匹配的初筛逻辑
+    学生-需求标签匹配集合服务
+
+    每个学生一个 Redis SET，保存与其兴趣标签(tag1)或能力标签(tag2)有交集的需求ID。
+    读取为一次 SMEMBERS，未命中时按标签关联表构建；学生标签或需求标签变更时由
+    read_search.signals 增量维护，过期时间仅作为兜底。
     """
-    
+
     def __init__(self):
-        self.cache_timeout = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 3600)  # 默认1小时缓存
-    
-    def get_student_matched_requirements(self, student_id: int) -> List[Dict[str, Any]]:
+        self._sadd_if_exists = None
+
+    @staticmethod
+    def _get_client():
+        client = get_cache_redis_client()
+        if client is None:
+            raise ConnectionError("Redis client not available")
+        return client
+
+    @staticmethod
+    def compute_requirement_ids(student_id: int) -> List[int]:
+        """从标签关联表计算学生匹配的需求ID（只查询ID，不加载需求对象）"""
+        from project.models import Requirement
+
+        by_tag1 = Requirement.tag1.through.objects.filter(
+            tag1__tag1stumatch__student_id=student_id
+        ).values_list('requirement_id', flat=True)
+        by_tag2 = Requirement.tag2.through.objects.filter(
+            tag2__tag2stumatch__student_id=student_id
+        ).values_list('requirement_id', flat=True)
+        return list(by_tag1.union(by_tag2))
+
+    def rebuild(self, student_id: int) -> List[int]:
+        """重新构建学生的匹配集合"""
+        requirement_ids = self.compute_requirement_ids(student_id)
+        key = MATCH_SET_KEY.format(student_id)
+        pipe = self._get_client().pipeline()
+        pipe.delete(key)
+        pipe.sadd(key, _BUILT_MARKER, *requirement_ids)
+        pipe.expire(key, MATCH_SET_TIMEOUT)
+        pipe.execute()
+        return requirement_ids
+
+    def get_requirement_ids(self, student_id: int) -> List[int]:
         """
-        获取学生匹配的项目需求列表（初筛）- 实时查询，不使用缓存
-        
-        Args:
-            student_id (int): 学生ID
-            
-        Returns:
-            List[Dict]: 匹配的项目需求列表
+        获取学生匹配的需求ID列表
+
+        Redis 不可用时直接查询数据库，不影响搜索。
         """
         try:
-            # 使用Django ORM查询TagMatch模型
-            tag_matches = TagMatch.objects.filter(
-                student_id=student_id
-            ).distinct()
-            
-            # 获取所有相关的需求ID
-            requirement_ids = list(tag_matches.values_list('requirement_id', flat=True).distinct())
-            
-            # 批量查询需求信息
-            from project.models import Requirement
-            requirements_dict = {}
-            if requirement_ids:
-                requirements = Requirement.objects.filter(id__in=requirement_ids)
-                requirements_dict = {req.id: req for req in requirements}
-            
-            # 转换为字典格式
-            result = []
-            for tag_match in tag_matches:
-                requirement = requirements_dict.get(tag_match.requirement_id)
-                requirement_data = {
-                    "Sid": tag_match.student_id,
-                    "Pid": tag_match.requirement_id,
-                    "requirement_title": requirement.title if requirement else f"需求{tag_match.requirement_id}",
-                    "tag_source": tag_match.tag_source,
-                    "tag_id": tag_match.tag_id,
-                }
-                result.append(requirement_data)
-            
-            logger.info(f"实时查询为学生{student_id}找到{len(result)}个匹配的项目需求")
-            
-            return result
-            
+            members = self._get_client().smembers(MATCH_SET_KEY.format(student_id))
         except Exception as e:
-            logger.error(f"获取学生{student_id}匹配需求时出错: {e}")
-            return []
+            logger.warning(f"读取学生{student_id}匹配集合失败，改为实时查询: {e}")
+            return self.compute_requirement_ids(student_id)
+
+        if not members:
+            try:
+                return self.rebuild(student_id)
+            except Exception as e:
+                logger.warning(f"构建学生{student_id}匹配集合失败: {e}")
+                return self.compute_requirement_ids(student_id)
+
+        return [int(m) for m in members if int(m) != _BUILT_MARKER]
+
+    def invalidate(self, student_ids: Iterable[int]) -> None:
+        """删除学生匹配集合，下次读取时重新构建"""
+        keys = [MATCH_SET_KEY.format(sid) for sid in set(student_ids)]
+        if keys:
+            self._get_client().delete(*keys)
+
+    def add_requirement(self, student_ids: Iterable[int], requirement_ids: Iterable[int]) -> None:
+        """将需求追加到已构建的学生匹配集合"""
+        keys = [MATCH_SET_KEY.format(sid) for sid in set(student_ids)]
+        requirement_ids = list(requirement_ids)
+        if not keys or not requirement_ids:
+            return
+        if self._sadd_if_exists is None:
+            self._sadd_if_exists = self._get_client().register_script(_SADD_IF_EXISTS)
+        self._sadd_if_exists(keys=keys, args=requirement_ids)
+
+    def remove_requirement(self, student_ids: Iterable[int], requirement_id: int) -> None:
+        """从学生匹配集合中移除需求"""
+        student_ids = set(student_ids)
+        if not student_ids:
+            return
+        pipe = self._get_client().pipeline(transaction=False)
+        for sid in student_ids:
+            pipe.srem(MATCH_SET_KEY.format(sid), requirement_id)
+        pipe.execute()
+
+
+class SearchService:
+    """
+    搜索服务类 - 处理学生标签匹配的初筛逻辑
+    """
+    
+    def __init__(self):
+        self.cache_timeout = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 3600)  # 默认1小时缓存
     
     def get_requirement_ids_for_student(self, student_id: int) -> List[int]:
         """
@@ -75,23 +138,24 @@ class SearchService:
         Returns:
             List[int]: 去重后的项目需求ID列表
         """
-        matched_requirements = self.get_student_matched_requirements(student_id)
-        # 使用set去重，然后转换回list并保持顺序
-        requirement_ids = [req["Pid"] for req in matched_requirements]
-        return list(dict.fromkeys(requirement_ids))  # 保持顺序的去重
+        return match_set_service.get_requirement_ids(student_id)
     
     def clear_student_cache(self, student_id: int) -> bool:
         """
-        清除学生相关的缓存（已禁用缓存，此方法保留兼容性）
+        清除学生的匹配集合，下次搜索时重新构建
         
         Args:
             student_id (int): 学生ID
             
         Returns:
-            bool: 总是返回True（缓存已禁用）
+            bool: 是否成功清除
         """
-        logger.info(f"缓存已禁用，无需清除学生{student_id}的缓存")
-        return True
+        try:
+            match_set_service.invalidate([student_id])
+            return True
+        except Exception as e:
+            logger.error(f"清除学生{student_id}匹配集合时出错: {e}")
+            return False
 
 
 class CacheService:
@@ -192,5 +256,6 @@ class CacheService:
 
 
 # 创建服务实例
+match_set_service = StudentMatchSetService()
 search_service = SearchService()
 cache_service = CacheService()
\ No newline at end of file
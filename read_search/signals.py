@@ -0,0 +1,103 @@
+import logging
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from project.models import Requirement
+from user.models import Tag1StuMatch, Tag2StuMatch
+from .services import match_set_service
+
+logger = logging.getLogger(__name__)
+
+# 标签来源 -> (学生标签关联模型, 需求标签关联表)
+_TAG_RELATIONS = {
+    'tag1': (Tag1StuMatch, Requirement.tag1.through),
+    'tag2': (Tag2StuMatch, Requirement.tag2.through),
+}
+
+
+def _on_commit(func, *args):
+    """事务提交后维护匹配集合，Redis 异常不影响业务写入"""
+    def run():
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"维护学生匹配集合失败: {e}")
+    transaction.on_commit(run)
+
+
+def _students_with_tags(tag_field, tag_ids):
+    stu_model = _TAG_RELATIONS[tag_field][0]
+    return set(
+        stu_model.objects.filter(**{f'{tag_field}_id__in': tag_ids}).values_list('student_id', flat=True)
+    )
+
+
+def _add_tag_requirements(tag_field, student_id, tag_id):
+    """学生新增标签：将带有该标签的需求追加到学生匹配集合"""
+    through = _TAG_RELATIONS[tag_field][1]
+    requirement_ids = through.objects.filter(**{f'{tag_field}_id': tag_id}).values_list('requirement_id', flat=True)
+    match_set_service.add_requirement([student_id], requirement_ids)
+
+
+# ========== 学生标签变更 ==========
+@receiver(post_save, sender=Tag1StuMatch)
+@receiver(post_save, sender=Tag2StuMatch)
+def handle_student_tag_saved(sender, instance, created, **kwargs):
+    tag_field = 'tag1' if sender is Tag1StuMatch else 'tag2'
+    if created:
+        _on_commit(_add_tag_requirements, tag_field, instance.student_id, getattr(instance, f'{tag_field}_id'))
+    else:
+        _on_commit(match_set_service.invalidate, [instance.student_id])
+
+
+@receiver(post_delete, sender=Tag1StuMatch)
+@receiver(post_delete, sender=Tag2StuMatch)
+def handle_student_tag_deleted(sender, instance, **kwargs):
+    # 需求可能仍通过其他标签匹配，直接重建该学生的集合
+    _on_commit(match_set_service.invalidate, [instance.student_id])
+
+
+# ========== 需求标签变更 ==========
+def _handle_requirement_tags_changed(tag_field, instance, action, reverse, pk_set):
+    if action == 'post_add' and pk_set:
+        if reverse:
+            # instance 为标签，pk_set 为需求ID
+            students = _students_with_tags(tag_field, [instance.pk])
+            _on_commit(match_set_service.add_requirement, students, list(pk_set))
+        else:
+            students = _students_with_tags(tag_field, pk_set)
+            _on_commit(match_set_service.add_requirement, students, [instance.pk])
+    elif action in ('pre_remove', 'pre_clear'):
+        # 移除前记录受影响的学生（clear 时 pk_set 为空，需在关联删除前查询）
+        if reverse:
+            instance._match_set_students = _students_with_tags(tag_field, [instance.pk])
+        else:
+            tag_ids = pk_set if action == 'pre_remove' else getattr(instance, tag_field).values_list('id', flat=True)
+            instance._match_set_students = _students_with_tags(tag_field, tag_ids)
+    elif action in ('post_remove', 'post_clear'):
+        students = getattr(instance, '_match_set_students', None)
+        if students:
+            _on_commit(match_set_service.invalidate, students)
+        instance._match_set_students = None
+
+
+@receiver(m2m_changed, sender=Requirement.tag1.through)
+def handle_requirement_tag1_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _handle_requirement_tags_changed('tag1', instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=Requirement.tag2.through)
+def handle_requirement_tag2_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _handle_requirement_tags_changed('tag2', instance, action, reverse, pk_set)
+
+
+@receiver(pre_delete, sender=Requirement)
+def handle_requirement_deleted(sender, instance, **kwargs):
+    # 关联行随需求级联删除且不触发 m2m_changed，删除前记录匹配的学生
+    students = (
+        _students_with_tags('tag1', instance.tag1.values_list('id', flat=True))
+        | _students_with_tags('tag2', instance.tag2.values_list('id', flat=True))
+    )
+    if students:
+        _on_commit(match_set_service.remove_requirement, students, instance.pk)
@@ -5,3 +5,6 @@ class StudentprojectConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "studentproject"
     verbose_name = "学生项目"
+
+    def ready(self):
+        import studentproject.signals
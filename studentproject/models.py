@@ -579,3 +579,38 @@ class ProjectInvitation(models.Model):
     
     def __str__(self):
         return f'{self.inviter.user.real_name} 邀请 {self.invitee.user.real_name} 加入 {self.project.title}'
+
+
+class OrganizationMonthlyProgress(models.Model):
+    """
+    组织项目月度进度 - 组织概览中“项目进度统计”的按月快照，由 studentproject.overview 维护
+
+    月份结束后首次统计时写入，之后直接读取不再重算；该月创建的项目新增、状态变化或删除时删除对应快照，
+    下次统计时按当前状态重新写入
+    """
+
+    organization = models.ForeignKey(
+        'organization.Organization',
+        on_delete=models.CASCADE,
+        related_name='monthly_progress',
+        verbose_name='组织'
+    )
+    year = models.PositiveSmallIntegerField(verbose_name='年份')
+    month = models.PositiveSmallIntegerField(verbose_name='月份')
+    completed = models.PositiveIntegerField(default=0, verbose_name='已完成项目数')
+    in_progress = models.PositiveIntegerField(default=0, verbose_name='进行中项目数')
+    recruiting = models.PositiveIntegerField(default=0, verbose_name='招募中项目数')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='统计时间'
+    )
+
+    class Meta:
+        db_table = 'student_project_monthly_progress'
+        verbose_name = '07-组织项目月度进度'
+        verbose_name_plural = '07-组织项目月度进度'
+        unique_together = ['organization', 'year', 'month']
+        ordering = ['organization', 'year', 'month']
+
+    def __str__(self):
+        return f'{self.organization_id} - {self.year}年{self.month}月'
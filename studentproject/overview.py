@@ -0,0 +1,273 @@
+# studentproject/overview.py
+"""
+组织数据概览
+
+各项统计均由数据库聚合完成，不加载记录到 Python：
+- 需求、资源、学生项目各一条条件聚合查询，同时统计 当前 与 上月同期 的数量
+- 技能分布在 需求-tag2 中间表上按 post 分组计数（一条 GROUP BY 查询）
+- 当年已过月份的项目进度按月写入 OrganizationMonthlyProgress，已有快照的月份直接读取不再重算，
+  缺失的月份合并为一条条件聚合查询补齐；项目新增、状态变化或删除时删除其创建月份的快照（见 signals.py），
+  以 QuerySet.update() 修改项目状态的写入方需调用 invalidate_projects_monthly_progress
+
+整份概览按组织缓存，缓存键包含相关数据表的版本号，数据写入后自然失效。
+"""
+import hashlib
+import logging
+from datetime import datetime
+
+import pytz
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from common_utils import count_buckets, count_grouped, get_or_refresh_cache, get_table_versions
+from project.models import Requirement, Resource
+from user.models import OrganizationUser, Tag2
+from .models import StudentProject, OrganizationMonthlyProgress
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_CACHE_KEY = 'org_overview:{org_id}:{version}'
+# 版本号覆盖数据写入；有效期兜底“上月同期”时间点的推移
+OVERVIEW_CACHE_TIMEOUT = getattr(settings, 'ORG_OVERVIEW_CACHE_TIMEOUT', 300)
+
+# 技能分布展示的标签数，其余合并为“其他”
+TOP_SKILLS = 10
+
+# 项目进度统计的状态（快照字段名与状态值一致）
+PROGRESS_STATUSES = ['completed', 'in_progress', 'recruiting']
+
+# 概览依赖的数据表
+OVERVIEW_TABLES = [
+    Requirement._meta.db_table,
+    Requirement.tag2.through._meta.db_table,
+    Tag2._meta.db_table,
+    Resource._meta.db_table,
+    OrganizationUser._meta.db_table,
+    StudentProject._meta.db_table,
+]
+
+
+def last_month_same_time(now):
+    """上月同期时间点（日期超出上月天数时取上月可用的日期）"""
+    current_date = now.date()
+    if current_date.month == 1:
+        last_month_same_date = current_date.replace(year=current_date.year - 1, month=12)
+    else:
+        try:
+            last_month_same_date = current_date.replace(month=current_date.month - 1)
+        except ValueError:
+            # 处理月末日期问题（如3月31日 -> 2月28/29日）
+            last_month = current_date.month - 1
+            if last_month == 2:
+                # 2月最多29天
+                day = min(current_date.day, 29)
+            else:
+                # 其他月份最多30天
+                day = min(current_date.day, 30)
+            last_month_same_date = current_date.replace(month=last_month, day=day)
+
+    return now.replace(
+        year=last_month_same_date.year,
+        month=last_month_same_date.month,
+        day=last_month_same_date.day
+    )
+
+
+def _growth_rate(current, previous):
+    if previous > 0:
+        return round(((current - previous) / previous) * 100, 2)
+    return 0
+
+
+def _rate(part, total):
+    if total > 0:
+        return round((part / total) * 100, 2)
+    return 0
+
+
+def _month_range(year, month):
+    """UTC 自然月区间 [月初, 下月初)"""
+    start = datetime(year, month, 1, tzinfo=pytz.UTC)
+    end = datetime(year + 1, 1, 1, tzinfo=pytz.UTC) if month == 12 else datetime(year, month + 1, 1, tzinfo=pytz.UTC)
+    return start, end
+
+
+def invalidate_monthly_progress(organization_id, created_at):
+    """删除组织在 created_at 所在月份（UTC）的进度快照，下次统计时重新补齐"""
+    if organization_id is None or created_at is None:
+        return 0
+    created_at = created_at.astimezone(pytz.UTC)
+    deleted, _ = OrganizationMonthlyProgress.objects.filter(
+        organization_id=organization_id, year=created_at.year, month=created_at.month
+    ).delete()
+    return deleted
+
+
+def project_months(projects):
+    """一批项目所属的 (组织ID, 创建月份月初 UTC) 组合，供删除对应的进度快照"""
+    return list(
+        projects.filter(requirement__isnull=False)
+        .annotate(month_start=TruncMonth('created_at', tzinfo=pytz.UTC))
+        .order_by()
+        .values_list('requirement__organization_id', 'month_start')
+        .distinct()
+    )
+
+
+def invalidate_projects_monthly_progress(projects):
+    """
+    删除一批项目所属组织、创建月份的进度快照
+
+    项目保存、删除由 signals.py 处理；以 QuerySet.update() 修改项目状态（不触发 post_save）的写入方
+    需在更新后以同一查询集调用
+    """
+    for organization_id, month_start in project_months(projects):
+        invalidate_monthly_progress(organization_id, month_start)
+
+
+def get_monthly_progress(organization, year, current_month):
+    """
+    当年已过月份（1 月至上月）的项目进度
+
+    已有快照的月份直接读取；缺失的月份用一条条件聚合查询统计后写入快照
+
+    Returns:
+        list: [{'month': 'N月', 'completed', 'in_progress', 'recruiting'}]
+    """
+    months = range(1, current_month)
+    snapshots = {
+        row['month']: row
+        for row in OrganizationMonthlyProgress.objects.filter(
+            organization=organization, year=year, month__lt=current_month
+        ).values('month', *PROGRESS_STATUSES)
+    }
+
+    missing = [month for month in months if month not in snapshots]
+    if missing:
+        ranges = {month: _month_range(year, month) for month in missing}
+        buckets = {
+            f'{month}:{status}': Q(created_at__gte=start, created_at__lt=end, status=status)
+            for month, (start, end) in ranges.items()
+            for status in PROGRESS_STATUSES
+        }
+        counts = count_buckets(
+            StudentProject.objects.filter(
+                requirement__organization=organization,
+                created_at__gte=ranges[missing[0]][0],
+                created_at__lt=ranges[missing[-1]][1],
+            ),
+            buckets,
+        )
+        created = []
+        for month in missing:
+            snapshots[month] = {status: counts[f'{month}:{status}'] for status in PROGRESS_STATUSES}
+            created.append(OrganizationMonthlyProgress(
+                organization=organization, year=year, month=month, **snapshots[month]
+            ))
+        # 并发请求可能同时补齐同一月份，以先写入者为准
+        OrganizationMonthlyProgress.objects.bulk_create(created, ignore_conflicts=True)
+
+    return [
+        {
+            'month': f'{month}月',
+            'completed': snapshots[month]['completed'],
+            'in_progress': snapshots[month]['in_progress'],
+            'recruiting': snapshots[month]['recruiting'],
+        }
+        for month in months
+    ]
+
+
+def get_skill_distribution(organization):
+    """
+    需求技能分布：按 tag2 的 post 计数，前 TOP_SKILLS 个标签及其占比，其余合并为“其他”
+
+    Returns:
+        list: [{'skill', 'count', 'percentage'}]
+    """
+    tag_counts = count_grouped(
+        Requirement.tag2.through.objects.filter(requirement__organization=organization),
+        'tag2__post',
+    )
+    total_tag_count = sum(tag_counts.values())
+
+    # 数量相同的标签按名称排序，保证结果稳定
+    top_tags = sorted(tag_counts.items(), key=lambda x: (-x[1], str(x[0])))[:TOP_SKILLS]
+    skill_distribution = [
+        {'skill': tag_name, 'count': count, 'percentage': _rate(count, total_tag_count)}
+        for tag_name, count in top_tags
+    ]
+
+    other_count = total_tag_count - sum(count for _, count in top_tags)
+    if other_count > 0:
+        skill_distribution.append({
+            'skill': '其他',
+            'count': other_count,
+            'percentage': _rate(other_count, total_tag_count)
+        })
+    return skill_distribution
+
+
+def build_organization_overview(organization, now=None):
+    """
+    统计组织数据概览（不使用缓存）
+
+    包括：发布需求及增长率、发布资源及增长率、进行中学生项目及增长率、
+    项目完成率及增长率、项目进度统计、项目技能分布
+    """
+    now = now or timezone.now()
+    last_month = last_month_same_time(now)
+    periods = {'current': Q(created_at__lte=now), 'last_month': Q(created_at__lte=last_month)}
+
+    requirements = count_buckets(Requirement.objects.filter(organization=organization), periods)
+    resources = count_buckets(Resource.objects.filter(create_person__organization=organization), periods)
+    projects = count_buckets(
+        StudentProject.objects.filter(requirement__organization=organization),
+        {
+            f'{period}:{name}': condition & extra
+            for period, condition in periods.items()
+            for name, extra in [
+                ('total', Q()),
+                ('in_progress', Q(status='in_progress')),
+                ('completed', Q(status='completed')),
+            ]
+        },
+    )
+
+    current_completion_rate = _rate(projects['current:completed'], projects['current:total'])
+    last_month_completion_rate = _rate(projects['last_month:completed'], projects['last_month:total'])
+
+    return {
+        'published_requirements': {
+            'count': requirements['current'],
+            'growth_rate': f"{_growth_rate(requirements['current'], requirements['last_month'])}%"
+        },
+        'published_resources': {
+            'count': resources['current'],
+            'growth_rate': f"{_growth_rate(resources['current'], resources['last_month'])}%"
+        },
+        'in_progress_projects': {
+            'count': projects['current:in_progress'],
+            'growth_rate': f"{_growth_rate(projects['current:in_progress'], projects['last_month:in_progress'])}%"
+        },
+        'project_completion_rate': {
+            'rate': f"{current_completion_rate}%",
+            'growth_rate': f"{_growth_rate(current_completion_rate, last_month_completion_rate)}%"
+        },
+        'monthly_progress': get_monthly_progress(organization, now.year, now.month),
+        'skill_distribution': get_skill_distribution(organization),
+    }
+
+
+def get_cached_organization_overview(organization):
+    """组织数据概览（按组织缓存，相关数据表写入后失效）"""
+    versions = sorted(get_table_versions(OVERVIEW_TABLES).items())
+    version = hashlib.md5(repr(versions).encode('utf-8')).hexdigest()
+    cache_key = OVERVIEW_CACHE_KEY.format(org_id=organization.pk, version=version)
+    # 缓存键包含数据版本，无需保留过期值（stale_timeout=0）
+    data, _ = get_or_refresh_cache(
+        cache_key, lambda: build_organization_overview(organization), OVERVIEW_CACHE_TIMEOUT, stale_timeout=0
+    )
+    return data
@@ -0,0 +1,56 @@
+import logging
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from project.models import Requirement
+from .models import StudentProject
+from .overview import invalidate_monthly_progress, project_months
+
+logger = logging.getLogger(__name__)
+
+
+def _invalidate_months(months):
+    """
+    事务提交后删除 (组织ID, 月份) 对应的月度进度快照
+
+    组织ID 须在信号触发时确定：提交后关联需求可能已被删除
+    """
+    if not months:
+        return
+
+    def run():
+        try:
+            for organization_id, created_at in months:
+                invalidate_monthly_progress(organization_id, created_at)
+        except Exception as e:
+            logger.error(f"删除组织月度进度快照失败: {e}")
+    transaction.on_commit(run)
+
+
+def _project_month(project):
+    if project.requirement_id is None:
+        return []
+    try:
+        organization_id = project.requirement.organization_id
+    except Requirement.DoesNotExist:
+        return []
+    return [(organization_id, project.created_at)]
+
+
+@receiver(post_save, sender=StudentProject)
+def handle_student_project_save(sender, instance, created, update_fields=None, **kwargs):
+    """项目新增或状态变化后，其创建月份的进度快照失效"""
+    if not created and update_fields is not None and 'status' not in update_fields:
+        return
+    _invalidate_months(_project_month(instance))
+
+
+@receiver(post_delete, sender=StudentProject)
+def handle_student_project_delete(sender, instance, **kwargs):
+    _invalidate_months(_project_month(instance))
+
+
+@receiver(pre_delete, sender=Requirement)
+def handle_requirement_delete(sender, instance, **kwargs):
+    """需求删除后其项目的关联需求置空（不触发项目信号），删除前记录这些项目所在的月份"""
+    _invalidate_months(project_months(StudentProject.objects.filter(requirement_id=instance.pk)))
@@ -1,3 +1,84 @@
+from datetime import datetime
+from unittest import mock
+
+import pytz
 from django.test import TestCase
 
-# Create your tests here.
+from organization.models import Organization
+from project.models import Requirement
+from user.models import OrganizationUser, User
+
+from .models import OrganizationMonthlyProgress, StudentProject
+from .overview import get_monthly_progress, invalidate_projects_monthly_progress
+
+
+class MonthlyProgressSnapshotTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create(username='org', user_type='organization', email='org@example.com')
+        self.org = Organization.objects.create(name='Org', organization_type='enterprise', enterprise_type='private')
+        org_user = OrganizationUser.objects.create(user=user, organization=self.org, status='approved')
+        self.requirement = Requirement.objects.create(
+            title='Req', brief='Brief', description='Desc', status='in_progress',
+            organization=self.org, publish_people=org_user,
+        )
+        self.project = self.create_project(month=3, status='recruiting')
+
+    def create_project(self, month, status):
+        project = StudentProject.objects.create(
+            title=f'project-{month}', description='Desc', requirement=self.requirement, status=status
+        )
+        # 绕过 auto_now_add，把项目放到指定月份
+        StudentProject.objects.filter(pk=project.pk).update(created_at=datetime(2026, month, 10, tzinfo=pytz.UTC))
+        project.refresh_from_db()
+        return project
+
+    def progress(self, month):
+        return get_monthly_progress(self.org, 2026, 10)[month - 1]
+
+    def snapshot_exists(self, month):
+        return OrganizationMonthlyProgress.objects.filter(organization=self.org, year=2026, month=month).exists()
+
+    def test_status_change_invalidates_month_snapshot(self):
+        self.assertEqual(self.progress(3)['recruiting'], 1)
+        self.assertTrue(self.snapshot_exists(3))
+
+        self.project.status = 'completed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save(update_fields=['status', 'updated_at'])
+
+        self.assertFalse(self.snapshot_exists(3))
+        self.assertEqual(self.progress(3)['completed'], 1)
+        self.assertEqual(self.progress(3)['recruiting'], 0)
+
+    def test_save_without_status_keeps_snapshot(self):
+        self.progress(3)
+        self.project.title = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save(update_fields=['title'])
+        self.assertTrue(self.snapshot_exists(3))
+
+    def test_delete_invalidates_month_snapshot(self):
+        self.progress(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertFalse(self.snapshot_exists(3))
+        self.assertEqual(self.progress(3)['recruiting'], 0)
+
+    @mock.patch('project.signals.delete_requirement_vectors_task')
+    def test_requirement_delete_invalidates_project_months(self, mock_delete_task):
+        self.create_project(month=5, status='in_progress')
+        self.progress(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.requirement.delete()
+        self.assertFalse(self.snapshot_exists(3))
+        self.assertFalse(self.snapshot_exists(5))
+
+    def test_bulk_update_helper_invalidates_snapshot(self):
+        self.progress(3)
+        projects = StudentProject.objects.filter(pk=self.project.pk)
+        projects.update(status='in_progress')
+        invalidate_projects_monthly_progress(projects)
+
+        self.assertFalse(self.snapshot_exists(3))
+        self.assertEqual(self.progress(3)['in_progress'], 1)
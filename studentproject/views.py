@@ -1,5 +1,4 @@
 import logging
-import pytz
 from rest_framework import generics, status, permissions
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework.decorators import api_view, permission_classes, action
@@ -10,7 +9,6 @@ from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.db.models import Count, Q, Case, When, IntegerField
 from django.utils import timezone
-from datetime import datetime, timedelta
 
 from .models import (
     StudentProject,
@@ -41,8 +39,9 @@ from .serializers import (
 )
 from user.models import Student, OrganizationUser, Tag2
 from user.services import UserHistoryService
-from project.models import File, Requirement, Resource
-from common_utils import APIResponse, format_validation_errors
+from project.models import File
+from .overview import get_cached_organization_overview
+from common_utils import APIResponse, format_validation_errors, bump_model_versions
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
 logger = logging.getLogger(__name__)
@@ -334,223 +333,14 @@ def get_organization_overview(request):
     try:
         # 检查用户是否为组织用户
         try:
-            org_user = OrganizationUser.objects.get(user=request.user)
+            org_user = OrganizationUser.objects.select_related('organization').get(user=request.user)
             organization = org_user.organization
         except OrganizationUser.DoesNotExist:
             return APIResponse.forbidden(
                 message="您不是组织用户，无权访问此数据"
             )
         
-        # 获取当前时间和上个月同期时间
-        now = timezone.now()
-        current_date = now.date()
-        
-        # 计算上个月同期时间
-        if current_date.month == 1:
-            last_month_same_date = current_date.replace(year=current_date.year - 1, month=12)
-        else:
-            try:
-                last_month_same_date = current_date.replace(month=current_date.month - 1)
-            except ValueError:
-                # 处理月末日期问题（如3月31日 -> 2月28/29日）
-                last_month = current_date.month - 1
-                if last_month == 2:
-                    # 2月最多29天
-                    day = min(current_date.day, 29)
-                else:
-                    # 其他月份最多30天
-                    day = min(current_date.day, 30)
-                last_month_same_date = current_date.replace(month=last_month, day=day)
-        
-        # 1. 发布需求及增长率
-        current_requirements = Requirement.objects.filter(
-            organization=organization,
-            created_at__lte=now
-        ).count()
-        
-        # 计算上月同期的时间点
-        last_month_datetime = now.replace(
-            year=last_month_same_date.year,
-            month=last_month_same_date.month,
-            day=last_month_same_date.day
-        )
-        
-        last_month_requirements = Requirement.objects.filter(
-            organization=organization,
-            created_at__lte=last_month_datetime
-        ).count()
-        
-        requirements_growth_rate = 0
-        if last_month_requirements > 0:
-            requirements_growth_rate = round(
-                ((current_requirements - last_month_requirements) / last_month_requirements) * 100, 2
-            )
-        
-        # 2. 发布资源及增长率
-        current_resources = Resource.objects.filter(
-            create_person__organization=organization,
-            created_at__lte=now
-        ).count()
-        
-        last_month_resources = Resource.objects.filter(
-            create_person__organization=organization,
-            created_at__lte=last_month_datetime
-        ).count()
-        
-        resources_growth_rate = 0
-        if last_month_resources > 0:
-            resources_growth_rate = round(
-                ((current_resources - last_month_resources) / last_month_resources) * 100, 2
-            )
-        
-        # 3. 进行中学生项目及增长率
-        current_in_progress_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            status='in_progress',
-            created_at__lte=now
-        ).count()
-        
-        last_month_in_progress_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            status='in_progress',
-            created_at__lte=last_month_datetime
-        ).count()
-        
-        in_progress_growth_rate = 0
-        if last_month_in_progress_projects > 0:
-            in_progress_growth_rate = round(
-                ((current_in_progress_projects - last_month_in_progress_projects) / last_month_in_progress_projects) * 100, 2
-            )
-        
-        # 4. 项目完成率及增长率
-        total_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            created_at__lte=now
-        ).count()
-        
-        completed_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            status='completed',
-            created_at__lte=now
-        ).count()
-        
-        current_completion_rate = 0
-        if total_projects > 0:
-            current_completion_rate = round((completed_projects / total_projects) * 100, 2)
-        
-        # 上个月同期的完成率
-        last_month_total_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            created_at__lte=last_month_datetime
-        ).count()
-        
-        last_month_completed_projects = StudentProject.objects.filter(
-            requirement__organization=organization,
-            status='completed',
-            created_at__lte=last_month_datetime
-        ).count()
-        
-        last_month_completion_rate = 0
-        if last_month_total_projects > 0:
-            last_month_completion_rate = round((last_month_completed_projects / last_month_total_projects) * 100, 2)
-        
-        completion_rate_growth = 0
-        if last_month_completion_rate > 0:
-            completion_rate_growth = round(
-                ((current_completion_rate - last_month_completion_rate) / last_month_completion_rate) * 100, 2
-            )
-        
-        # 5. 项目进度统计（按月统计当前年份已过月份的数据）
-        current_year = current_date.year
-        current_month = current_date.month
-        
-        monthly_progress = []
-        for month in range(1, current_month):  # 只统计已过的月份
-            month_start = datetime(current_year, month, 1, tzinfo=pytz.UTC)
-            if month == 12:
-                month_end = datetime(current_year + 1, 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            else:
-                month_end = datetime(current_year, month + 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            
-            # 统计该月的项目状态
-            month_projects = StudentProject.objects.filter(
-                requirement__organization=organization,
-                created_at__gte=month_start,
-                created_at__lte=month_end
-            )
-            
-            completed_count = month_projects.filter(status='completed').count()
-            in_progress_count = month_projects.filter(status='in_progress').count()
-            recruiting_count = month_projects.filter(status='recruiting').count()
-            
-            monthly_progress.append({
-                'month': f'{month}月',
-                'completed': completed_count,
-                'in_progress': in_progress_count,
-                'recruiting': recruiting_count
-            })
-        
-        # 6. 项目技能分布（需求技能分布，前10个tag2标签及其占比）
-        # 获取该组织发布的所有需求关联的tag2
-        requirements_with_tags = Requirement.objects.filter(
-            organization=organization
-        ).prefetch_related('tag2')
-        
-        tag_counts = {}
-        total_tag_count = 0
-        
-        for requirement in requirements_with_tags:
-            for tag in requirement.tag2.all():
-                tag_name = tag.post  # 使用tag2的post字段作为标签名
-                tag_counts[tag_name] = tag_counts.get(tag_name, 0) + 1
-                total_tag_count += 1
-        
-        # 获取前10个标签并计算占比
-        top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        skill_distribution = []
-        
-        # 计算前10个标签的总数
-        top_tags_count = sum(count for _, count in top_tags)
-        
-        for tag_name, count in top_tags:
-            percentage = round((count / total_tag_count) * 100, 2) if total_tag_count > 0 else 0
-            skill_distribution.append({
-                'skill': tag_name,
-                'count': count,
-                'percentage': percentage
-            })
-        
-        # 添加"其他"类别，包含剩余的所有标签
-        other_count = total_tag_count - top_tags_count
-        if other_count > 0:
-            other_percentage = round((other_count / total_tag_count) * 100, 2)
-            skill_distribution.append({
-                'skill': '其他',
-                'count': other_count,
-                'percentage': other_percentage
-            })
-        
-        # 构建返回数据
-        data = {
-            'published_requirements': {
-                'count': current_requirements,
-                'growth_rate': f"{requirements_growth_rate}%"
-            },
-            'published_resources': {
-                'count': current_resources,
-                'growth_rate': f"{resources_growth_rate}%"
-            },
-            'in_progress_projects': {
-                'count': current_in_progress_projects,
-                'growth_rate': f"{in_progress_growth_rate}%"
-            },
-            'project_completion_rate': {
-                'rate': f"{current_completion_rate}%",
-                'growth_rate': f"{completion_rate_growth}%"
-            },
-            'monthly_progress': monthly_progress,
-            'skill_distribution': skill_distribution
-        }
+        data = get_cached_organization_overview(organization)
         
         return APIResponse.success(
             data=data,
@@ -832,6 +622,14 @@ def apply_to_join_project(request, project_id):
                     application_message=serializer.validated_data.get('application_message', '')
                 )
         
+        # 写入 apply 行为事件（仅计入需求热度榜，不影响动态标签）
+        if project.requirement_id:
+            try:
+                from project.behaviour_events import publish
+                publish(user.id, project.requirement_id, 'apply')
+            except Exception as e:
+                logger.error(f"写入申请行为事件失败: {e}")
+        
         return APIResponse.success(
             message="申请提交成功，请等待项目负责人审核"
         )
@@ -1419,6 +1217,7 @@ def send_invitation(request, project_id):
         # 更新过期邀请的状态
         if expired_pending_invitations.exists():
             expired_pending_invitations.update(status='expired')
+            bump_model_versions(ProjectInvitation)
         
         # 删除之前被拒绝或过期的邀请记录，避免唯一性约束冲突
         old_invitations = ProjectInvitation.objects.filter(
@@ -2021,7 +1820,7 @@ def get_comment_list(request, project_id):
             page_size = 10
         
         from common_utils import paginate_queryset
-        pagination_result = paginate_queryset(request, queryset, default_page_size=page_size)
+        pagination_result = paginate_queryset(request, queryset, default_page_size=page_size, allow_cursor=True)
         page_data = pagination_result['page_data']
         pagination_info = pagination_result['pagination_info']
         
@@ -2277,7 +2076,7 @@ def get_comment_replies(request, project_id, comment_id):
         
         # 分页处理
         from common_utils import paginate_queryset
-        pagination_result = paginate_queryset(request, replies, default_page_size=10)
+        pagination_result = paginate_queryset(request, replies, default_page_size=10, allow_cursor=True)
         page_data = pagination_result['page_data']
         pagination_info = pagination_result['pagination_info']
         
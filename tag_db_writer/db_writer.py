@@ -201,11 +201,21 @@
 #     finally:
 #         conn.close()
 
+from functools import partial
 from django.db import transaction
 from django.utils import timezone
 from user.models import Tag1, Tag2, Tag1StuMatch, Tag2StuMatch, Student
 from project.models import Requirement
 
+
+def _invalidate_student_match_set(student_id):
+    from read_search.services import match_set_service
+    try:
+        match_set_service.invalidate([student_id])
+    except Exception as e:
+        print(f"清除学生{student_id}匹配集合失败: {e}")
+
+
 # 模型映射配置
 MODEL_MAPPING = {
     "tag1_student": {
@@ -353,6 +363,9 @@ def insert_match_from_json(input_json: dict):
                                 print(f"插入单个记录失败: {inner_e}")
                                 continue
 
+                # bulk_create 不触发 post_save，提交后重建该学生的匹配集合
+                transaction.on_commit(partial(_invalidate_student_match_set, primary_obj.id))
+
 
 # 保持向后兼容的函数名
 def insert_general_match(match_type, data_list):
@@ -1,7 +1,7 @@
 import time
 import logging
-from django.core.cache import cache
 from django.conf import settings
+from common_utils import get_cache_redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +37,8 @@ class UserHistoryService:
             timestamp = time.time()
             
             # 使用 pipeline 保证原子性和性能
-            # 注意：Django cache backend 可能不直接支持 pipeline，这里假设使用 redis backend
-            # 如果是默认的 django-redis，可以直接通过 cache.client.get_client() 获取原始 redis 连接
-            
-            # 尝试获取原始 Redis 连接
-            redis_client = None
-            if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                redis_client = cache.client.get_client()
-            elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                # 兼容不同版本的 django-redis
-                redis_client = cache._cache.get_client()
+            # 获取原始 Redis 连接（共享 django-redis 连接池），缓存后端不是 django-redis 时为 None
+            redis_client = get_cache_redis_client()
                 
             if redis_client:
                 pipeline = redis_client.pipeline()
@@ -76,11 +68,7 @@ class UserHistoryService:
         """
         try:
             key = cls._get_history_key(user_id, item_type)
-            redis_client = None
-            if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                redis_client = cache.client.get_client()
-            elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                redis_client = cache._cache.get_client()
+            redis_client = get_cache_redis_client()
                 
             if not redis_client:
                 return [], 0
@@ -113,11 +101,7 @@ class UserHistoryService:
         """
         try:
             key = cls._get_history_key(user_id, item_type)
-            redis_client = None
-            if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                redis_client = cache.client.get_client()
-            elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                redis_client = cache._cache.get_client()
+            redis_client = get_cache_redis_client()
                 
             if not redis_client:
                 return set()
@@ -137,11 +121,7 @@ class UserHistoryService:
         """
         try:
             key = cls._get_history_key(user_id, item_type)
-            redis_client = None
-            if hasattr(cache, 'client') and hasattr(cache.client, 'get_client'):
-                redis_client = cache.client.get_client()
-            elif hasattr(cache, '_cache') and hasattr(cache._cache, 'get_client'):
-                redis_client = cache._cache.get_client()
+            redis_client = get_cache_redis_client()
                 
             if not redis_client:
                 return []
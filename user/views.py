@@ -13,7 +13,7 @@ from .serializers import (
     Tag1Serializer, Tag2Serializer, UserRecommendationProfileSerializer
 )
 from .services import UserHistoryService
-from common_utils import APIResponse, format_validation_errors, build_media_url, paginate_queryset
+from common_utils import APIResponse, format_validation_errors, build_media_url, paginate_queryset, cache_response
 from project.serializers import RequirementSerializer
 
 logger = logging.getLogger(__name__)
@@ -249,6 +249,7 @@ def upload_avatar(request):
 # 标签管理相关视图
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response([Tag1])
 def get_interest_tags(request):
     """获取所有兴趣标签（支持搜索和分页）"""
     try:
@@ -276,6 +277,7 @@ def get_interest_tags(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response([Tag2])
 def get_ability_tags(request):
     """获取所有level=2的能力标签，支持搜索"""
     try:
@@ -306,6 +308,7 @@ def get_ability_tags(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_response([Tag1, Tag2])
 def search_tags(request):
     """模糊搜索tag1和tag2标签"""
     try: